@@ -1,8 +1,29 @@
+import os
+
+# create_app est la fabrique de l'application : "flask --app app" la trouve seule,
+# et un serveur WSGI l'appelle directement (ex : gunicorn "app:create_app()").
 from app import create_app
 
-app = create_app()
+# WORKERS > 1 : plusieurs processus partagent le port et le même catalogue (fichier mmap).
+# Chaque worker crée sa propre app après le fork.
+WORKERS = int(os.environ.get("WORKERS", "1"))
 
-if __name__ == "__main__":
+
+def main() -> None:
+    if WORKERS > 1:
+        from app.tools.server import serve_multiprocess
+
+        serve_multiprocess("0.0.0.0", 5000, WORKERS)
+        return
+
+    app = create_app()
     # Exposer l'app sur 0.0.0.0 pour que Docker puisse y accéder
     app.run(host="0.0.0.0", port=5000, debug=True)
     # app.run(debug=True)
+
+
+# Rien n'est construit à l'import : les processus du pool de hachage (démarrés en "spawn")
+# réimportent ce fichier sous le nom __mp_main__ et ne doivent ni ouvrir le stockage,
+# ni lancer le thread de logs, ni enregistrer les routes.
+if __name__ == "__main__":
+    main()
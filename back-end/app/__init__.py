@@ -1,13 +1,60 @@
+import os
+
 from flask import Flask
+from app.cli import register_cli
 from app.routes import init_routes
 from flask_cors import CORS
+from app.services.hashing_service import default_workers, init_hashing
+from app.services.storage_service import init_storage
+from app.tools.middlewares.login_rate_limit import init_login_rate_limit
 from app.tools.middlewares.request_logging import register_request_logging
+from app.tools.middlewares.request_profiling import register_request_profiling
 
-def create_app() -> Flask:
+def create_app(config: dict | None = None) -> Flask:
     app = Flask(__name__)
 
+    # Stockage : "memory" (défaut), "sqlite" ou "mmap" (multi-processus).
+    # Les variables d'environnement permettent de choisir sans toucher au code (Docker).
+    app.config["STORAGE_BACKEND"] = os.environ.get("STORAGE_BACKEND", "memory")
+    app.config["SQLITE_PATH"] = os.environ.get("SQLITE_PATH")
+    app.config["MMAP_PATH"] = os.environ.get("MMAP_PATH")
+
+    # Pool de hachage des mots de passe (login / register), dimensionné à part.
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.environ.get("PASSWORD_HASH_WORKERS", default_workers()))
+    app.config["PASSWORD_HASH_QUEUE"] = int(os.environ.get("PASSWORD_HASH_QUEUE", 16))
+
+    # Limitation des tentatives de login (jetons par minute + rafale autorisée).
+    app.config["LOGIN_RATE_PER_IP"] = float(os.environ.get("LOGIN_RATE_PER_IP", 30))
+    app.config["LOGIN_BURST_PER_IP"] = int(os.environ.get("LOGIN_BURST_PER_IP", 10))
+    app.config["LOGIN_RATE_PER_EMAIL"] = float(os.environ.get("LOGIN_RATE_PER_EMAIL", 5))
+    app.config["LOGIN_BURST_PER_EMAIL"] = int(os.environ.get("LOGIN_BURST_PER_EMAIL", 5))
+
+    # Logs : file bornée (logs jetés au-delà), échantillonnage des requêtes
+    # rapides et réussies (1.0 = tout garder), seuil "requête lente" en ms.
+    # LOG_LEVEL vide : niveau laissé à la configuration de logging (WARNING par défaut,
+    # donc seules les erreurs et requêtes lentes) ; "INFO" pour voir toutes les requêtes.
+    app.config["LOG_LEVEL"] = os.environ.get("LOG_LEVEL")
+    app.config["LOG_QUEUE_SIZE"] = int(os.environ.get("LOG_QUEUE_SIZE", 10_000))
+    app.config["LOG_SAMPLE_RATE"] = float(os.environ.get("LOG_SAMPLE_RATE", 1.0))
+    app.config["LOG_SLOW_MS"] = float(os.environ.get("LOG_SLOW_MS", 500))
+
+    # Profilage cProfile à la demande (désactivé par défaut : aucun coût).
+    app.config["PROFILING_ENABLED"] = os.environ.get("PROFILING_ENABLED", "0") == "1"
+    app.config["PROFILING_DIR"] = os.environ.get("PROFILING_DIR")
+    app.config["PROFILING_MAX_FILES"] = int(os.environ.get("PROFILING_MAX_FILES", 50))
+    app.config["PROFILING_SAMPLE_EVERY"] = int(os.environ.get("PROFILING_SAMPLE_EVERY", 0))
+    app.config["PROFILING_SECRET"] = os.environ.get("PROFILING_SECRET")
+    if config:
+        app.config.update(config)
+
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+    init_storage(app)
+    init_hashing(app)
+    init_login_rate_limit(app)
+
     init_routes(app)
     register_request_logging(app)
+    register_request_profiling(app)
+    register_cli(app)
     return app
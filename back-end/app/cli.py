@@ -0,0 +1,31 @@
+# app/cli.py
+
+import click
+from flask import Flask
+
+from app.services.user_service import import_users
+
+
+def register_cli(app: Flask) -> None:
+    """
+    Commandes en ligne de commande, disponibles via "flask --app app <commande>".
+    """
+
+    @app.cli.command("import-users")
+    @click.argument("path", type=click.File("rb"))
+    @click.option("--workers", type=int, default=None, help="Processus de hachage (défaut : tous les cœurs).")
+    @click.option("--batch-size", type=int, default=1000, show_default=True, help="Utilisateurs insérés par lot.")
+    def import_users_command(path, workers, batch_size):
+        """
+        Importe des utilisateurs depuis un fichier NDJSON (ou "-" pour stdin).
+
+        Même format et mêmes règles que POST /api/auth/users/import,
+        sans limite de taille : le fichier est lu ligne par ligne.
+        À utiliser avec un stockage persistant (STORAGE_BACKEND=sqlite ou mmap).
+        """
+        imported, errors = import_users(path, workers=workers, batch_size=batch_size)
+        for error in errors:
+            click.echo(f"ligne {error.pop('line')} : {error}", err=True)
+        click.echo(f"{imported} utilisateur(s) importé(s), {len(errors)} erreur(s).")
+        if errors:
+            raise SystemExit(1)
@@ -3,12 +3,26 @@
 from flask import jsonify, request
 
 from app.dtos.auth_dto import LoginDTO, RegisterDTO
-from app.services.user_service import (
-    create_user,
-    verify_credentials,
-    get_user_by_email,
-)
+from app.services.hashing_service import HashingBusyError
+from app.services.token_service import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from app.services.user_service import create_user, import_users, verify_credentials
 from app.tools.jwt_utils import create_access_token
+from app.tools.middlewares.auth_middlware import require_role
+from app.tools.middlewares.login_rate_limit import login_rate_limit
+
+# Nombre maximal de lignes par import HTTP (au-delà : commande CLI "flask import-users").
+IMPORT_MAX_LINES = 100_000
+
+
+def _busy_response(err: HashingBusyError):
+    """
+    503 quand le pool de hachage est saturé.
+    Retry-After indique au client quand retenter, sans bloquer le serveur.
+    """
+    response = jsonify({"error": str(err)})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(err.retry_after)
+    return response
 
 
 def register():
@@ -36,17 +50,15 @@ def register():
         # Erreur de validation : on renvoie un statut 400 et un message clair.
         return jsonify(err), 400
 
-    # Avant de créer un utilisateur, on s'assure que l'email n'est pas déjà pris.
-    existing = get_user_by_email(dto.email)
-    if existing:
-        return jsonify({"error": "Un utilisateur avec cet email existe déjà."}), 409
-
-    # Tentative de création dans la couche service.
-    # En cas de souci (ex : politique mot de passe), create_user peut lever ValueError.
+    # Création dans la couche service.
+    # create_user contrôle lui-même l'unicité de l'email (avant le hachage, coûteux)
+    # et lève ValueError si l'email est déjà pris → 409.
     try:
         user = create_user(email=dto.email, password=dto.password)
     except ValueError as e:
         return jsonify({"error": str(e)}), 409
+    except HashingBusyError as e:
+        return _busy_response(e)
 
     # Succès : on renvoie un statut 201 et les infos du nouvel utilisateur.
     return jsonify(
@@ -57,6 +69,7 @@ def register():
     ), 201
 
 
+@login_rate_limit
 def login():
     """
     POST /api/auth/login
@@ -78,7 +91,10 @@ def login():
 
     # Appel au service pour vérifier les identifiants.
     # verify_credentials retourne l'objet User si OK, sinon None.
-    user = verify_credentials(dto.email, dto.password)
+    try:
+        user = verify_credentials(dto.email, dto.password)
+    except HashingBusyError as e:
+        return _busy_response(e)
     if not user:
         # Pour des raisons de sécurité, on reste vague : pas de détail sur ce qui est faux.
         return jsonify({"error": "Identifiants invalides."}), 401
@@ -96,9 +112,96 @@ def login():
     )
 
     # Réponse standardisée pour faciliter la consommation côté front.
+    # Le refresh token permet ensuite d'obtenir un nouvel access token
+    # (POST /api/auth/refresh) sans renvoyer le mot de passe.
     return jsonify(
         {
             "access_token": token,
+            "refresh_token": issue_refresh_token(user),
             "user": user.to_dict(),
         }
     ), 200
+
+
+def _refresh_token_from_body() -> str | None:
+    data = request.get_json(silent=True) or {}
+    token = data.get("refresh_token") if isinstance(data, dict) else None
+    return token if isinstance(token, str) and token else None
+
+
+def refresh():
+    """
+    POST /api/auth/refresh
+    Corps : {"refresh_token": "..."}
+
+    Échange un refresh token valide contre un nouvel access token
+    ET un nouveau refresh token (rotation : l'ancien ne sert plus).
+
+    Pourquoi ?
+    ---------------------
+    Quand l'access token (1 h) expire, le front n'a pas besoin de refaire un login :
+    pas de mot de passe à revérifier (scrypt, coûteux), juste une empreinte
+    SHA-256 à retrouver dans un index → quelques microsecondes.
+    """
+    token = _refresh_token_from_body()
+    if token is None:
+        return jsonify({"errors": {"refresh_token": "Le refresh token est requis."}}), 400
+
+    rotated = rotate_refresh_token(token)
+    if rotated is None:
+        return jsonify({"error": "Refresh token invalide ou expiré."}), 401
+
+    user, new_refresh_token = rotated
+    return jsonify(
+        {
+            "access_token": create_access_token(user_id=user.id, email=user.email, role=user.role),
+            "refresh_token": new_refresh_token,
+            "user": user.to_dict(),
+        }
+    ), 200
+
+
+def logout():
+    """
+    POST /api/auth/logout
+    Corps : {"refresh_token": "..."} → le refresh token est révoqué.
+    L'access token en cours reste valide jusqu'à son expiration (1 h max).
+    """
+    token = _refresh_token_from_body()
+    if token is None:
+        return jsonify({"errors": {"refresh_token": "Le refresh token est requis."}}), 400
+
+    revoke_refresh_token(token)
+    return "", 204
+
+
+@require_role("admin")
+def import_users_bulk():
+    """
+    POST /api/auth/users/import  (rôle admin)
+    Corps : NDJSON, un utilisateur par ligne :
+      {"email": "...", "password": "...", "confirmPassword": "...", "role": "user"}
+
+    Chaque ligne est validée (RegisterDTO), les mots de passe sont hachés
+    sur le pool partagé du login (sans le saturer), puis insérés par lots.
+    Réponse : {"imported": n, "errors": [{"line": 3, ...}]}
+      - 201 : tout est importé,
+      - 207 : import partiel (détail dans "errors"),
+      - 400 : aucune ligne importée,
+      - 503 + Retry-After : un autre import est en cours.
+    """
+    lines = request.get_data().splitlines()
+    if not lines:
+        return jsonify({"error": "Corps NDJSON vide"}), 400
+    if len(lines) > IMPORT_MAX_LINES:
+        return jsonify({"error": f"{IMPORT_MAX_LINES} lignes maximum par requête"}), 400
+
+    try:
+        imported, errors = import_users(lines, shared_pool=True)
+    except HashingBusyError as e:
+        return _busy_response(e)
+
+    status = 201
+    if errors:
+        status = 207 if imported else 400
+    return jsonify({"imported": imported, "errors": errors}), status
@@ -1,6 +1,9 @@
 # app/controllers/book_controller.py
 
-from flask import jsonify, request
+import json
+from typing import Iterator
+
+from flask import Response, jsonify, request
 from app.dtos.book_dto import (
     BookCreateDTO,
     BookUpdateDTO,
@@ -8,27 +11,273 @@ from app.dtos.book_dto import (
 )
 from app.services.book_service import (
     get_all,
+    get_books_page,
     get_book_by_id,
+    get_books_by_ids,
     add_book,
+    add_books,
     update_book,
     patch_book,
+    patch_books,
     delete_book,
+    delete_books,
     search_book_by_author,
+    search_book_by_author_page,
+    search_books,
+    book_to_json,
+    books_to_json,
+    catalog_version,
+    get_book_version,
 )
+from app.tools.pagination import encode_cursor, decode_cursor
 from app.tools.middlewares.auth_middlware import require_auth, require_role
+from app.tools.middlewares.conditional_get import conditional_get, query_etag
+
+# Nombre de résultats renvoyés par défaut / au maximum par la recherche plein texte.
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Taille de page par défaut / maximale pour la pagination par curseur.
+PAGE_DEFAULT_LIMIT = 50
+PAGE_MAX_LIMIT = 1000
+
+# Nombre de livres sérialisés par morceau envoyé en mode streaming.
+STREAM_CHUNK_SIZE = 500
+
+# Nombre maximal d'éléments acceptés par une requête /api/books/bulk.
+BULK_MAX_ITEMS = 100_000
+
+# Nombre maximal d'ids pour un multi-get (GET ?ids= / POST /api/books/lookup).
+LOOKUP_MAX_IDS = 10_000
+
+# Plus grand id accepté : limite d'un INTEGER SQLite (entier signé 64 bits).
+# Au-delà, sqlite3 lève OverflowError : on refuse ces ids dès le contrôleur,
+# quel que soit le stockage, pour que toutes les routes répondent pareil.
+MAX_BOOK_ID = 2**63 - 1
+
+
+def is_valid_book_id(value, minimum: int = 1) -> bool:
+    """Entier (pas un booléen) entre minimum et MAX_BOOK_ID."""
+    return type(value) is int and minimum <= value <= MAX_BOOK_ID
+
+
+def _parse_limit(default: int, maximum: int) -> tuple[int | None, dict | None]:
+    """
+    Lit le paramètre ?limit= de l'URL.
+    Retourne (limit, None) si la valeur est un entier entre 1 et maximum,
+    sinon (None, {"error": ...}) prêt à être renvoyé au front.
+    """
+    raw = request.args.get("limit")
+    if raw is None:
+        return default, None
+    try:
+        limit = int(raw)
+    except ValueError:
+        return None, {"error": "Le paramètre 'limit' doit être un entier"}
+    if not 1 <= limit <= maximum:
+        return None, {"error": f"Le paramètre 'limit' doit être compris entre 1 et {maximum}"}
+    return limit, None
+
+
+def _wants_page() -> bool:
+    """
+    La réponse paginée n'est utilisée que si le client la demande
+    (?limit= ou ?cursor=). Sans ces paramètres, on garde l'ancien format (liste brute).
+    """
+    return "limit" in request.args or "cursor" in request.args
+
+
+def _wants_stream() -> bool:
+    """Catalogue complet envoyé en streaming (?stream=1)."""
+    return request.args.get("stream") in ("1", "true")
+
+
+def _parse_cursor(ranked: bool = False) -> tuple[dict | None, dict | None]:
+    """
+    Décode le paramètre ?cursor= envoyé par le front.
+    Retourne ({}, None) s'il est absent, (position, None) s'il est valide,
+    (None, {"error": ...}) s'il a été altéré.
+    Pour la recherche classée, la position contient aussi le score du dernier résultat.
+    """
+    raw = request.args.get("cursor")
+    if raw is None:
+        return {}, None
+
+    position = decode_cursor(raw)
+    valid = (
+        position is not None
+        and is_valid_book_id(position.get("after"), minimum=0)
+        and (not ranked or isinstance(position.get("score"), (int, float)))
+    )
+    if not valid:
+        return None, {"error": "Curseur de pagination invalide"}
+    return position, None
+
+
+def _json_response(body: bytes, status: int = 200):
+    """
+    Réponse JSON à partir d'octets déjà encodés (fragments en cache) :
+    on évite l'aller-retour dict → jsonify pour chaque livre.
+    """
+    return Response(body, status=status, mimetype="application/json")
+
 
+def _with_score(fragment: bytes, score: float) -> bytes:
+    """Ajoute le champ "score" à un fragment JSON de livre, sans le décoder."""
+    return fragment[:-1] + b',"score":' + json.dumps(round(score, 4)).encode("ascii") + b"}"
 
+
+def _page_response(items_json: bytes, next_position: dict | None):
+    """
+    Format commun des réponses paginées :
+        {"items": [...], "next_cursor": "..."}
+    next_cursor vaut null quand il n'y a plus de page suivante.
+    items_json est le tableau JSON des éléments, déjà encodé.
+    """
+    next_cursor = encode_cursor(next_position) if next_position else None
+    return _json_response(
+        b'{"items":' + items_json + b',"next_cursor":' + json.dumps(next_cursor).encode("ascii") + b"}"
+    )
+
+
+def _catalog_etag(*args, **kwargs) -> str:
+    """ETag des listes / recherches : version du catalogue + paramètres d'URL."""
+    return query_etag("catalog", catalog_version())
+
+
+def _books_etag() -> str | None:
+    """
+    ETag de GET /api/books, sauf en streaming (None) : les pages sont lues au fil
+    de l'envoi, pendant que les écritures continuent, et le corps peut donc mêler
+    plusieurs versions du catalogue. Aucune version unique à annoncer.
+    """
+    if _wants_stream():
+        return None
+    return _catalog_etag()
+
+
+def _book_etag(id: int) -> str | None:
+    """ETag d'un livre : son id et sa version (None si le livre n'existe pas)."""
+    version = get_book_version(id)
+    return None if version is None else f"book-{id}-{version}"
+
+
+def _parse_ids(raw) -> tuple[list[int] | None, dict | None]:
+    """
+    Valide une liste d'ids pour le multi-get.
+    Accepte "1,5,9" (paramètre d'URL) ou [1, 5, 9] (corps JSON).
+    """
+    if isinstance(raw, str):
+        parts = [part for part in raw.split(",") if part]
+        # isascii() d'abord : int() accepte aussi "١٢" (chiffres arabes) et " 12 " (espaces),
+        # refusés comme pour l'en-tête X-Profile.
+        if not all(part.isascii() and part.isdigit() for part in parts):
+            return None, {"error": "Le paramètre 'ids' doit être une liste d'entiers séparés par des virgules"}
+        raw = [int(part) for part in parts]
+    if not isinstance(raw, list) or not raw or not all(is_valid_book_id(i) for i in raw):
+        return None, {"error": "Une liste non vide d'ids entiers est attendue"}
+    if len(raw) > LOOKUP_MAX_IDS:
+        return None, {"error": f"{LOOKUP_MAX_IDS} ids maximum par requête"}
+    return raw, None
+
+
+def _lookup_response(book_ids: list[int]):
+    """
+    Réponse du multi-get :
+        {"items": [livres trouvés, dans l'ordre demandé], "missing": [ids inconnus]}
+    """
+    books = get_books_by_ids(book_ids)
+    found = [b for b in books if b is not None]
+    missing = [book_id for book_id, b in zip(book_ids, books) if b is None]
+    body = b'{"items":' + books_to_json(found) + b',"missing":' + json.dumps(missing).encode("ascii") + b"}"
+    return _json_response(body)
+
+
+def _stream_books() -> Iterator[bytes]:
+    """
+    Générateur qui produit le tableau JSON du catalogue morceau par morceau :
+        "[", puis des paquets de livres séparés par des virgules, puis "]".
+    Les livres sont lus page par page via la pagination par id :
+    la mémoire utilisée reste celle d'un seul paquet, quelle que soit
+    la taille du catalogue, et un ajout/suppression pendant l'envoi ne casse rien.
+    """
+    yield b"["
+    after_id, first = 0, True
+    while True:
+        books, has_more = get_books_page(after_id, STREAM_CHUNK_SIZE)
+        if books:
+            chunk = b",".join(book_to_json(b) for b in books)
+            yield chunk if first else b"," + chunk
+            first = False
+            after_id = books[-1].id
+        if not has_more:
+            break
+    yield b"]"
+
+
+@conditional_get(_books_etag)
 def get_books():
     """
     GET /api/books
+    GET /api/books?limit=50&cursor=<next_cursor>
     Route ouverte : renvoie la liste complète des livres.
     L'objectif est pédagogique : montrer une route publique simple.
+
+    Avec ?limit= et/ou ?cursor=, la réponse est paginée par id
+    (keyset) : {"items": [...], "next_cursor": "..."}.
+
+    Avec ?stream=1, le catalogue complet est envoyé en streaming
+    (réponse "chunked") : utile pour les exports et synchronisations.
+
+    Avec ?ids=1,5,9, seuls ces livres sont renvoyés (multi-get) :
+    {"items": [...], "missing": [...]}.
+
+    Chaque réponse (sauf le streaming) porte un ETag : un client qui renvoie
+    If-None-Match alors que rien n'a changé reçoit un 304 sans corps.
     """
+    if "ids" in request.args:
+        book_ids, err = _parse_ids(request.args["ids"])
+        if err:
+            return jsonify(err), 400
+        return _lookup_response(book_ids)
+
+    if _wants_stream():
+        # Flask envoie chaque valeur produite par le générateur dès qu'elle est prête :
+        # le premier octet part avant même que le second paquet soit sérialisé.
+        return Response(_stream_books(), mimetype="application/json"), 200
+
+    if _wants_page():
+        limit, err = _parse_limit(PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT)
+        if err:
+            return jsonify(err), 400
+        position, err = _parse_cursor()
+        if err:
+            return jsonify(err), 400
+
+        books, has_more = get_books_page(position.get("after", 0), limit)
+        next_position = {"after": books[-1].id} if has_more else None
+        return _page_response(books_to_json(books), next_position)
+
     books = get_all()  # Récupération depuis la couche service
-    payload = [book.to_dict() for book in books]  # Transformation en JSON prêt pour Angular
-    return jsonify(payload), 200
+    # Transformation en JSON prêt pour Angular, à partir des fragments en cache
+    return _json_response(books_to_json(books))
 
 
+def lookup_books():
+    """
+    POST /api/books/lookup
+    Variante du multi-get pour les longues listes d'ids (trop longues pour une URL) :
+        {"ids": [1, 5, 9]}
+    Même réponse que GET /api/books?ids=... .
+    """
+    data = request.get_json(silent=True)
+    book_ids, err = _parse_ids(data.get("ids") if isinstance(data, dict) else data)
+    if err:
+        return jsonify(err), 400
+    return _lookup_response(book_ids)
+
+
+@conditional_get(_book_etag)
 def get_book(id: int):
     """
     GET /api/books/<id>
@@ -37,7 +286,7 @@ def get_book(id: int):
     """
     book = get_book_by_id(id)
     if book:
-        return jsonify(book.to_dict()), 200
+        return _json_response(book_to_json(book))
     return jsonify({"error": "Livre non trouvé"}), 404
 
 
@@ -55,7 +304,7 @@ def create_book():
 
     # On envoie les données propres à la couche service pour créer l'objet.
     new_book = add_book(dto.title, dto.author)
-    return jsonify(new_book.to_dict()), 201
+    return _json_response(book_to_json(new_book), 201)
 
 
 @require_auth
@@ -74,7 +323,7 @@ def update_book_full(id: int):
     if not updated:
         return jsonify({"error": f"Livre avec Id {id} introuvable"}), 404
 
-    return jsonify(updated.to_dict()), 200
+    return _json_response(book_to_json(updated))
 
 
 @require_auth
@@ -88,15 +337,12 @@ def update_book_partial(id: int):
     if err:
         return jsonify(err), 400
 
-    # On construit un dictionnaire dynamique contenant uniquement
-    # les champs présents dans le JSON (None = non modifié).
-    update_data = {k: v for k, v in dto.__dict__.items() if v is not None}
-
-    updated = patch_book(id, update_data)
+    # Uniquement les champs présents dans le JSON (None = non modifié).
+    updated = patch_book(id, dto.changes())
     if not updated:
         return jsonify({"error": f"Livre avec Id {id} introuvable"}), 404
 
-    return jsonify(updated.to_dict()), 200
+    return _json_response(book_to_json(updated))
 
 
 @require_role("admin")
@@ -114,15 +360,188 @@ def remove_book(id: int):
     return jsonify({"error": "Livre non trouvé"}), 404
 
 
+def _bulk_items(key: str) -> tuple[list | None, dict | None]:
+    """
+    Lit le corps d'une requête bulk : soit une liste JSON brute,
+    soit un objet {key: [...]} (ex : {"items": [...]}, {"ids": [...]}).
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list) or not data:
+        return None, {"error": f"Une liste non vide (ou {{\"{key}\": [...]}}) est attendue"}
+    if len(data) > BULK_MAX_ITEMS:
+        return None, {"error": f"{BULK_MAX_ITEMS} éléments maximum par requête"}
+    return data, None
+
+
+def _bulk_status(succeeded: int, failed: int) -> int:
+    """
+    Statut global d'une opération bulk :
+      - tout a réussi → success (200 / 201),
+      - rien n'a réussi → 400,
+      - résultat mixte → 207 (Multi-Status) : le détail est dans "errors".
+    """
+    if not failed:
+        return 0
+    return 400 if not succeeded else 207
+
+
+def _bulk_response(key: str, books_json: bytes, errors: list[dict], status: int):
+    """{"<key>": [...livres...], "errors": [{"index": i, ...}]}"""
+    body = b'{"' + key.encode("ascii") + b'":' + books_json + b',"errors":' + json.dumps(errors).encode("ascii") + b"}"
+    return _json_response(body, status)
+
+
+@require_auth
+def create_books_bulk():
+    """
+    POST /api/books/bulk
+    Crée plusieurs livres en une seule requête : [{"title": ..., "author": ...}, ...]
+
+    Tous les éléments sont validés d'abord (BookCreateDTO), puis les valides
+    sont écrits d'un bloc. Les éléments invalides sont signalés un par un
+    dans "errors" avec leur position (index) dans la liste envoyée.
+    """
+    items, err = _bulk_items("items")
+    if err:
+        return jsonify(err), 400
+
+    valid: list[tuple[str, str]] = []
+    errors = []
+    # validate_many : une seule fonction de validation pour toute la liste.
+    for index, (dto, item_err) in enumerate(BookCreateDTO.validate_many(items)):
+        if item_err:
+            errors.append({"index": index, **item_err})
+        else:
+            valid.append((dto.title, dto.author))
+
+    created = add_books(valid) if valid else []
+    status = _bulk_status(len(created), len(errors)) or 201
+    return _bulk_response("created", books_to_json(created), errors, status)
+
+
+@require_auth
+def update_books_bulk():
+    """
+    PATCH /api/books/bulk
+    Mise à jour partielle de plusieurs livres : [{"id": 1, "title": ...}, {"id": 5, "author": ...}]
+    Chaque élément est validé par BookPatchDTO ; un id inconnu donne une erreur 404
+    pour cet élément seulement.
+    """
+    items, err = _bulk_items("items")
+    if err:
+        return jsonify(err), 400
+
+    changes: list[tuple[int, dict]] = []
+    positions: list[int] = []
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not is_valid_book_id(item.get("id")):
+            errors.append({"index": index, "error": "Champ 'id' entier requis"})
+            continue
+        fields = {k: v for k, v in item.items() if k != "id"}
+        dto, item_err = BookPatchDTO.from_json(fields)
+        if item_err:
+            errors.append({"index": index, "id": item["id"], **item_err})
+            continue
+        changes.append((item["id"], dto.changes()))
+        positions.append(index)
+
+    updated = []
+    for index, (book_id, _), book in zip(positions, changes, patch_books(changes) if changes else []):
+        if book is None:
+            errors.append({"index": index, "id": book_id, "error": f"Livre avec Id {book_id} introuvable"})
+        else:
+            updated.append(book)
+
+    errors.sort(key=lambda e: e["index"])
+    status = _bulk_status(len(updated), len(errors)) or 200
+    return _bulk_response("updated", books_to_json(updated), errors, status)
+
+
+@require_role("admin")
+def remove_books_bulk():
+    """
+    DELETE /api/books/bulk
+    Suppression de plusieurs livres (rôle admin) : {"ids": [1, 5, 9]} ou [1, 5, 9]
+    Réponse : {"deleted": [ids supprimés], "errors": [...]}.
+    """
+    ids, err = _bulk_items("ids")
+    if err:
+        return jsonify(err), 400
+
+    valid_ids = []
+    errors = []
+    for index, book_id in enumerate(ids):
+        if not is_valid_book_id(book_id):
+            errors.append({"index": index, "error": "Les ids doivent être des entiers"})
+        else:
+            valid_ids.append((index, book_id))
+
+    deleted = []
+    results = delete_books([book_id for _, book_id in valid_ids]) if valid_ids else []
+    for (index, book_id), ok in zip(valid_ids, results):
+        if ok:
+            deleted.append(book_id)
+        else:
+            errors.append({"index": index, "id": book_id, "error": "Livre non trouvé"})
+
+    errors.sort(key=lambda e: e["index"])
+    status = _bulk_status(len(deleted), len(errors)) or 200
+    return jsonify({"deleted": deleted, "errors": errors}), status
+
+
+@conditional_get(_catalog_etag)
 def search_book():
     """
     GET /api/books/search?author=Nom
+    GET /api/books/search?q=mots+clés&limit=20
     Petite route de recherche : on passe un paramètre dans l’URL.
-    Si le paramètre est absent → erreur explicite pour guider le front.
+      - author : sous-chaîne de l'auteur, résultats dans l'ordre des ids,
+      - q : recherche plein texte (titre + auteur), résultats classés par pertinence,
+            chaque livre est accompagné de son score.
+    Si aucun paramètre n'est fourni → erreur explicite pour guider le front.
+
+    Comme pour GET /api/books, ?limit= et/ou ?cursor= activent la réponse paginée.
     """
+    query = request.args.get("q", "")
+    if query:
+        limit, err = _parse_limit(SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT)
+        if err:
+            return jsonify(err), 400
+        position, err = _parse_cursor(ranked=True)
+        if err:
+            return jsonify(err), 400
+
+        after = (position["score"], position["after"]) if position else None
+        results, has_more = search_books(query, limit, after)
+        items = b"[" + b",".join(_with_score(book_to_json(b), score) for b, score in results) + b"]"
+        if not _wants_page():
+            return _json_response(items)
+
+        next_position = None
+        if has_more:
+            last_book, last_score = results[-1]
+            # On garde le score exact (non arrondi) pour reprendre au bon endroit.
+            next_position = {"after": last_book.id, "score": last_score}
+        return _page_response(items, next_position)
+
     author = request.args.get("author", "")
     if not author:
-        return jsonify({"error": "Paramètre 'author' requis"}), 400
+        return jsonify({"error": "Paramètre 'author' ou 'q' requis"}), 400
+
+    if _wants_page():
+        limit, err = _parse_limit(PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT)
+        if err:
+            return jsonify(err), 400
+        position, err = _parse_cursor()
+        if err:
+            return jsonify(err), 400
+
+        books, has_more = search_book_by_author_page(author, position.get("after", 0), limit)
+        next_position = {"after": books[-1].id} if has_more else None
+        return _page_response(books_to_json(books), next_position)
 
     books = search_book_by_author(author)
-    return jsonify([b.to_dict() for b in books]), 200
+    return _json_response(books_to_json(books))
@@ -0,0 +1,19 @@
+# app/controllers/metrics_controller.py
+
+from flask import Response, current_app
+
+from app.tools.metrics import CONTENT_TYPE
+
+
+def get_metrics():
+    """
+    GET /metrics
+    Métriques de l'application au format texte Prometheus
+    (latences par route, requêtes par statut, requêtes en cours,
+    cache JWT, pool de hachage…).
+
+    À réserver au réseau interne (scraper Prometheus) : ne pas exposer
+    publiquement derrière le reverse proxy.
+    """
+    registry = current_app.extensions["metrics"]
+    return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,81 @@
+# app/controllers/profiling_controller.py
+
+from flask import current_app, jsonify, request, send_file
+
+from app.tools.middlewares.auth_middlware import require_role
+
+
+def _settings():
+    """Réglages du profilage, ou None si PROFILING_ENABLED est désactivé."""
+    return current_app.extensions.get("profiling")
+
+
+def _disabled():
+    return jsonify({"error": "Profilage désactivé (PROFILING_ENABLED)."}), 404
+
+
+@require_role("admin")
+def get_profiling():
+    """
+    GET /api/admin/profiling
+    État du profilage : {"always": false, "sample_every": 0, "signed_header": true, "max_files": 50}
+    """
+    settings = _settings()
+    if settings is None:
+        return _disabled()
+    return jsonify(settings.to_dict()), 200
+
+
+@require_role("admin")
+def set_profiling():
+    """
+    POST /api/admin/profiling
+    Corps : {"always": true} et/ou {"sample_every": 100}
+    Permet d'activer / couper le profilage sans redémarrer le serveur.
+    """
+    settings = _settings()
+    if settings is None:
+        return _disabled()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Un objet JSON est attendu"}), 400
+
+    always = data.get("always", settings.always)
+    sample_every = data.get("sample_every", settings.sample_every)
+    if not isinstance(always, bool):
+        return jsonify({"error": "Le champ 'always' doit être un booléen"}), 400
+    if type(sample_every) is not int or sample_every < 0:
+        return jsonify({"error": "Le champ 'sample_every' doit être un entier positif (0 = désactivé)"}), 400
+
+    settings.always = always
+    settings.sample_every = sample_every
+    return jsonify(settings.to_dict()), 200
+
+
+@require_role("admin")
+def list_profiles():
+    """
+    GET /api/admin/profiles
+    Profils enregistrés, du plus récent au plus ancien.
+    """
+    settings = _settings()
+    if settings is None:
+        return _disabled()
+    return jsonify(settings.store.list()), 200
+
+
+@require_role("admin")
+def download_profile(name: str):
+    """
+    GET /api/admin/profiles/<name>
+    Téléchargement d'un profil (.pstats), à ouvrir avec "python -m pstats" ou snakeviz.
+    """
+    settings = _settings()
+    if settings is None:
+        return _disabled()
+
+    path = settings.store.path(name)
+    if path is None:
+        return jsonify({"error": f"Profil {name} introuvable"}), 404
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True, download_name=name)
@@ -1,9 +1,27 @@
 from dataclasses import dataclass, field
-from typing import Optional, Tuple, Dict
-
-
-@dataclass
-class BookCreateDTO:
+from typing import Any, Dict, Optional
+
+from app.dtos.schema import Field, Schema, SchemaDTO
+
+# Règles communes à la création et à la mise à jour complète (POST / PUT).
+_TITLE = Field(
+    "title",
+    kind=(str, "Les champs title et author doivent être des chaînes de caractères"),
+    strip=True,  # on nettoie pour éviter les titres avec uniquement des espaces
+    blank="Le titre ne peut pas être vide.",
+    max_length=(100, "Le titre ne peut pas dépasser 100 caractères."),
+)
+_AUTHOR = Field(
+    "author",
+    kind=(str, "Les champs title et author doivent être des chaînes de caractères"),
+    strip=True,
+    blank="Le nom de l'auteur est obligatoire",
+    min_length=(3, "Le nom de l'auteur doit contenir au moins 3 caractères"),
+)
+
+
+@dataclass(slots=True)
+class BookCreateDTO(SchemaDTO):
     """
     Représente les données nécessaires pour créer un livre.
     La dataclass permet d’obtenir automatiquement :
@@ -11,82 +29,34 @@ class BookCreateDTO:
       - un repr lisible
       - une structuration claire des champs
     Pour cette opération, title et author sont obligatoires.
+
+    La validation est décrite par un schéma (app/dtos/schema.py), préparé une
+    seule fois : from_json renvoie (DTO, None) si tout est correct,
+    (None, {"error": "..."}) sinon. Ce pattern simplifie beaucoup le contrôleur :
+    il n’a plus qu’à tester err.
     """
     title: str
     author: str
 
-    @staticmethod
-    def from_json(data: dict) -> Tuple[Optional["BookCreateDTO"], Optional[Dict]]:
-        """
-        Convertit un JSON envoyé par le front en un BookCreateDTO valide.
-        Retourne :
-          (DTO, None) si tout est correct
-          (None, {"error": "..."} ) en cas de données incorrectes
-
-        Ce pattern simplifie beaucoup le contrôleur : il n’a plus qu’à tester err.
-        """
-
-        if not data:
-            return None, {"error": "Aucune donnée fournie"}
-
-        title = data.get("title")
-        author = data.get("author")
-
-        # Vérification du type pour éviter les erreurs (ex : un entier au lieu d'une string).
-        if not isinstance(title, str) or not isinstance(author, str):
-            return None, {"error": "Les champs title et author doivent être des chaînes de caractères"}
-
-        # On nettoie pour éviter les titres avec uniquement des espaces.
-        title = title.strip()
-        author = author.strip()
-
-        # Règles métier simples côté API.
-        if not title:
-            return None, {"error": "Le titre ne peut pas être vide."}
-        if len(title) > 100:
-            return None, {"error": "Le titre ne peut pas dépasser 100 caractères."}
-
-        # Débogage ponctuel (à retirer en production).
-        print("---------------------------------------")
-        print(author)
-        print("---------------------------------------")
+    # Les deux types sont vérifiés avant tout contenu : ils partagent le même message.
+    schema = Schema(_TITLE, _AUTHOR, empty_message="Aucune donnée fournie", types_first=True)
 
-        if not author:
-            return None, {"error": "Le nom de l'auteur est obligatoire"}
-        if len(author) < 3:
-            return None, {"error": "Le nom de l'auteur doit contenir au moins 3 caractères"}
 
-        # Toutes les validations sont OK → on construit le DTO.
-        return BookCreateDTO(title=title, author=author), None
-
-
-@dataclass
-class BookUpdateDTO:
+@dataclass(slots=True)
+class BookUpdateDTO(SchemaDTO):
     """
     DTO utilisé pour un PUT (mise à jour complète).
-    Même structure que BookCreateDTO, mais on peut lui ajouter
-    des règles spécifiques si un jour PUT ≠ POST.
+    Mêmes règles que BookCreateDTO (les Field sont partagés), mais on peut lui
+    ajouter des règles spécifiques si un jour PUT ≠ POST.
     """
     title: str
     author: str
 
-    @staticmethod
-    def from_json(data: dict) -> Tuple[Optional["BookUpdateDTO"], Optional[Dict]]:
-        if not data:
-            return None, {"error": "Données manquantes pour la mise à jour complète"}
-
-        # On réutilise la logique de validation du CreateDTO,
-        # ce qui évite la duplication de code.
-        dto, err = BookCreateDTO.from_json(data)
-        if err:
-            return None, err
+    schema = Schema(_TITLE, _AUTHOR, empty_message="Données manquantes pour la mise à jour complète", types_first=True)
 
-        # dto contient déjà les valeurs valides.
-        return BookUpdateDTO(title=dto.title, author=dto.author), None
 
-
-@dataclass
-class BookPatchDTO:
+@dataclass(slots=True)
+class BookPatchDTO(SchemaDTO):
     """
     DTO pour une mise à jour partielle (PATCH).
     Ici, aucun champ n’est obligatoire : on modifie uniquement ce qui est fourni.
@@ -95,33 +65,25 @@ class BookPatchDTO:
     title: Optional[str] = field(default=None)
     author: Optional[str] = field(default=None)
 
-    @staticmethod
-    def from_json(data: dict) -> Tuple[Optional["BookPatchDTO"], Optional[Dict]]:
-        if not data:
-            return None, {"error": "Aucune donnée fournie pour la mise à jour partielle"}
-
-        # On récupère uniquement les champs potentiels
-        title = data.get("title")
-        author = data.get("author")
-
-        # Aucun champ valide → erreur logique.
-        if title is None and author is None:
-            return None, {"error": "Aucun champ valide à mettre à jour"}
-
-        # Validation ciblée pour chaque champ présent :
-        if title is not None:
-            if not isinstance(title, str):
-                return None, {"error": "Le titre doit être une chaîne de caractères"}
-            title = title.strip()
-            if len(title) > 100:
-                return None, {"error": "Le titre ne peut pas dépasser 100 caractères"}
-
-        if author is not None:
-            if not isinstance(author, str):
-                return None, {"error": "L'auteur doit être une chaîne de caractères"}
-            author = author.strip()
-            if len(author) < 3:
-                return None, {"error": "L'auteur doit contenir au moins 3 caractères"}
-
-        # On construit le DTO avec uniquement les valeurs réellement fournies.
-        return BookPatchDTO(title=title, author=author), None
+    schema = Schema(
+        Field(
+            "title",
+            optional=True,
+            kind=(str, "Le titre doit être une chaîne de caractères"),
+            strip=True,
+            max_length=(100, "Le titre ne peut pas dépasser 100 caractères"),
+        ),
+        Field(
+            "author",
+            optional=True,
+            kind=(str, "L'auteur doit être une chaîne de caractères"),
+            strip=True,
+            min_length=(3, "L'auteur doit contenir au moins 3 caractères"),
+        ),
+        empty_message="Aucune donnée fournie pour la mise à jour partielle",
+        any_message="Aucun champ valide à mettre à jour",
+    )
+
+    def changes(self) -> Dict[str, Any]:
+        """Uniquement les champs fournis dans le JSON (None = non modifié)."""
+        return {name: value for name, value in (("title", self.title), ("author", self.author)) if value is not None}
@@ -0,0 +1,282 @@
+# app/dtos/schema.py
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Modes de validation :
+#   - FAIL_FAST : on s'arrête à la première erreur (le moins de travail possible),
+#   - COLLECT   : on parcourt tout et on renvoie toutes les erreurs d'un coup
+#                 (pratique pour un formulaire : l'utilisateur corrige tout en une fois).
+FAIL_FAST = "fail_fast"
+COLLECT = "collect"
+
+# Format des erreurs renvoyées au contrôleur :
+#   - SINGLE   : {"error": "premier message"} (+ "errors": {champ: message} en mode COLLECT),
+#   - BY_FIELD : {"errors": {champ: message, ...}}
+SINGLE = "single"
+BY_FIELD = "by_field"
+
+
+class Field:
+    """
+    Description déclarative d'un champ : où le lire, et les règles à respecter.
+    Chaque règle porte son message d'erreur (celui renvoyé tel quel au front).
+
+      - keys : clés JSON acceptées, dans l'ordre (ex : "confirmPassword" puis "confirm_password"),
+      - optional : None (champ absent) est accepté et aucune règle n'est appliquée,
+      - required : message si la valeur est absente ou vide,
+      - kind : (type attendu, message),
+      - strip : supprime les espaces autour de la valeur avant les règles suivantes,
+      - blank : message si la valeur est vide (après strip),
+      - min_length / max_length : (limite, message).
+    """
+
+    __slots__ = ("name", "keys", "error_key", "optional", "required", "kind", "strip", "blank", "min_length", "max_length")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        keys: Sequence[str] | None = None,
+        error_key: str | None = None,
+        optional: bool = False,
+        required: str | None = None,
+        kind: Tuple[type, str] | None = None,
+        strip: bool = False,
+        blank: str | None = None,
+        min_length: Tuple[int, str] | None = None,
+        max_length: Tuple[int, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.keys = tuple(keys or (name,))
+        self.error_key = error_key or name
+        self.optional = optional
+        self.required = required
+        self.kind = kind
+        self.strip = strip
+        self.blank = blank
+        self.min_length = min_length
+        self.max_length = max_length
+
+
+class Check:
+    """
+    Règle qui porte sur plusieurs champs (ex : password == confirmPassword).
+    Elle n'est évaluée que si tous les champs concernés sont valides.
+    """
+
+    __slots__ = ("error_key", "message", "fields", "test")
+
+    def __init__(self, error_key: str, message: str, fields: Sequence[str], test: Callable[..., bool]) -> None:
+        self.error_key = error_key
+        self.message = message
+        self.fields = tuple(fields)
+        self.test = test
+
+
+class Schema:
+    """
+    Schéma de validation d'un DTO, préparé UNE fois, à la définition de la classe.
+
+    Chaque champ est transformé en deux petites fonctions (closures) qui ne relisent
+    plus sa description : "présence et type", puis "nettoyage et contenu".
+    Le schéma les range dans l'ordre d'exécution et construit une fonction de
+    validation par mode (FAIL_FAST / COLLECT), obtenue via validator(mode).
+
+    Ordre de validation :
+      1. corps vide → empty_message,
+      2. aucun des champs fourni → any_message (DTO de mise à jour partielle),
+      3. chaque champ à son tour : présence et type, puis nettoyage (strip) et contenu.
+         Avec types_first=True, les types de TOUS les champs sont vérifiés avant
+         le moindre contenu (cas d'un message de type commun à plusieurs champs),
+      4. règles multi-champs (Check), sur les champs restés valides.
+
+    validate(data) renvoie (tuple des valeurs dans l'ordre des champs, None) ou (None, erreur).
+    """
+
+    def __init__(
+        self,
+        *fields: Field,
+        checks: Iterable[Check] = (),
+        empty_message: str | None = None,
+        any_message: str | None = None,
+        style: str = SINGLE,
+        mode: str = FAIL_FAST,
+        types_first: bool = False,
+    ) -> None:
+        self.fields = fields
+        self.names = tuple(f.name for f in fields)
+        self.checks = tuple(checks)
+        self.empty_message = empty_message
+        self.any_message = any_message
+        self.style = style
+        self.mode = mode
+
+        # Étapes (rang du champ, clé d'erreur, fonction) dans l'ordre d'exécution.
+        presence = [(i, f.error_key, _presence_rule(f)) for i, f in enumerate(fields)]
+        content = [(i, f.error_key, _content_rule(f)) for i, f in enumerate(fields)]
+        if types_first:
+            steps = presence + content
+        else:
+            steps = [step for pair in zip(presence, content) for step in pair]
+        self._steps = tuple(step for step in steps if step[2] is not None)
+
+        self._validators = {FAIL_FAST: self._build(fail_fast=True), COLLECT: self._build(fail_fast=False)}
+
+    def validator(self, mode: str | None = None) -> Callable[[Any], Tuple[Optional[tuple], Optional[dict]]]:
+        """Fonction de validation du mode demandé (par défaut, celui du schéma), à réutiliser en boucle."""
+        return self._validators[mode or self.mode]
+
+    def validate(self, data: Any, mode: str | None = None) -> Tuple[Optional[tuple], Optional[dict]]:
+        return self._validators[mode or self.mode](data)
+
+    # region Construction des fonctions de validation
+    def _build(self, fail_fast: bool) -> Callable[[Any], Tuple[Optional[tuple], Optional[dict]]]:
+        # Tout ce qui ne dépend pas des données est calculé ici, une seule fois.
+        readers = [_reader(f.keys) for f in self.fields]
+        optional = [f.optional for f in self.fields]
+        steps = self._steps
+        index = {name: i for i, name in enumerate(self.names)}
+        checks = [(c.error_key, c.message, [index[name] for name in c.fields], c.test) for c in self.checks]
+        empty_message, any_message, render = self.empty_message, self.any_message, self._render
+
+        def validate(data: Any) -> Tuple[Optional[tuple], Optional[dict]]:
+            if empty_message is not None:
+                if not data or not isinstance(data, dict):
+                    return None, render([(None, empty_message)], True)
+            elif not isinstance(data, dict):
+                data = {}
+
+            values = [read(data) for read in readers]
+            if any_message is not None and all(value is None for value in values):
+                return None, render([(None, any_message)], True)
+
+            # ok[i] : le champ est-il (encore) à valider ? Un champ optionnel absent ne l'est pas.
+            ok = [not (opt and value is None) for opt, value in zip(optional, values)]
+            errors: List[Tuple[Optional[str], str]] = []
+            for i, error_key, rule in steps:
+                if not ok[i]:
+                    continue
+                values[i], message = rule(values[i])
+                if message is not None:
+                    if fail_fast:
+                        return None, render([(error_key, message)], True)
+                    errors.append((error_key, message))
+                    ok[i] = False
+
+            for error_key, message, positions, test in checks:
+                if all(ok[i] for i in positions) and not test(*(values[i] for i in positions)):
+                    if fail_fast:
+                        return None, render([(error_key, message)], True)
+                    errors.append((error_key, message))
+
+            if errors:
+                return None, render(errors, False)
+            return tuple(values), None
+
+        return validate
+
+    def _render(self, errors: List[Tuple[Optional[str], str]], fail_fast: bool) -> dict:
+        """Erreur au format attendu par le contrôleur : un dict NEUF à chaque appel."""
+        if self.style == BY_FIELD:
+            return {"errors": {key: message for key, message in errors}}
+        rendered: Dict[str, Any] = {"error": errors[0][1]}
+        if not fail_fast and errors[0][0] is not None:
+            rendered["errors"] = {key: message for key, message in errors}
+        return rendered
+    # endregion
+
+
+def _reader(keys: Tuple[str, ...]) -> Callable[[dict], Any]:
+    """Lecture d'un champ : première clé renseignée (comme data.get(a) or data.get(b))."""
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data: data.get(key)
+
+    def read(data: dict) -> Any:
+        value = None
+        for key in keys:
+            value = data.get(key)
+            if value:
+                break
+        return value
+
+    return read
+
+
+def _presence_rule(field: Field) -> Callable[[Any], Tuple[Any, Optional[str]]] | None:
+    """Présence puis type : (valeur, None) si tout va bien, (valeur, message) sinon."""
+    required, kind = field.required, field.kind
+    if required is None and kind is None:
+        return None
+
+    def rule(value: Any) -> Tuple[Any, Optional[str]]:
+        if required is not None and not value:
+            return value, required
+        if kind is not None and not isinstance(value, kind[0]):
+            return value, kind[1]
+        return value, None
+
+    return rule
+
+
+def _content_rule(field: Field) -> Callable[[Any], Tuple[Any, Optional[str]]] | None:
+    """Nettoyage (strip) puis contenu ; la première règle violée donne le message du champ."""
+    strip, blank, min_length, max_length = field.strip, field.blank, field.min_length, field.max_length
+    if not strip and blank is None and min_length is None and max_length is None:
+        return None
+
+    def rule(value: Any) -> Tuple[Any, Optional[str]]:
+        if strip:
+            value = value.strip()
+        if blank is not None and not value:
+            return value, blank
+        if min_length is not None and len(value) < min_length[0]:
+            return value, min_length[1]
+        if max_length is not None and len(value) > max_length[0]:
+            return value, max_length[1]
+        return value, None
+
+    return rule
+
+
+class SchemaDTO:
+    """
+    Base des DTO validés par un Schema (attribut de classe 'schema').
+    Les DTO sont des dataclasses à __slots__ : pas de __dict__ par instance,
+    moins de mémoire et un accès aux attributs plus rapide.
+    """
+
+    __slots__ = ()
+    schema: Schema
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Le schéma renvoie les valeurs dans l'ordre de SES champs, passées telles quelles
+        # au constructeur : on vérifie une fois pour toutes qu'il suit l'ordre de la dataclass.
+        fields = tuple(name for name in cls.__dict__.get("__annotations__", {}))
+        if "schema" in cls.__dict__ and cls.schema.names != fields:
+            raise TypeError(f"{cls.__name__} : schéma {cls.schema.names} ≠ champs {fields}")
+
+    @classmethod
+    def from_json(cls, data: Any, mode: str | None = None):
+        """
+        JSON → (DTO, None) si tout est correct, (None, erreur) sinon.
+        mode : FAIL_FAST ou COLLECT (par défaut, celui du schéma).
+        """
+        values, err = cls.schema.validate(data, mode)
+        if err:
+            return None, err
+        return cls(*values), None
+
+    @classmethod
+    def validate_many(cls, items: Iterable[Any], mode: str | None = None) -> List[Tuple[Any, Optional[dict]]]:
+        """
+        Validation d'une liste d'éléments (requêtes bulk, imports) avec la même fonction de validation :
+        un couple (DTO, erreur) par élément, dans l'ordre de la liste.
+        """
+        validate = cls.schema.validator(mode)
+        results = []
+        for item in items:
+            values, err = validate(item)
+            results.append((None, err) if err else (cls(*values), None))
+        return results
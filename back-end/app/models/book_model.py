@@ -1,4 +1,8 @@
 class Book:
+	# __slots__ : pas de __dict__ par livre (environ 100 octets de moins chacun).
+	# Un livre n'a que ces trois attributs, on ne peut pas en ajouter d'autres.
+	__slots__ = ("id", "title", "author")
+
 	def __init__(self, id : int, title: str, author : str) -> None :
 		self.id = id
 		self.title = title
@@ -2,6 +2,17 @@
 
 from dataclasses import dataclass
 
+
+def normalize_email(email: str) -> str:
+    """
+    Clé d'unicité / de recherche d'un email : sans espaces autour, "casefoldé"
+    (insensible à la casse, y compris ß/ss…).
+    Seule règle utilisée partout (dépôts mémoire et SQLite, import, login),
+    pour qu'un même compte soit retrouvé quel que soit le stockage.
+    """
+    return email.strip().casefold()
+
+
 @dataclass
 class User:
     """
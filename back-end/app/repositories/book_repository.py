@@ -0,0 +1,265 @@
+# app/repositories/book_repository.py
+
+import bisect
+import itertools
+import json
+import threading
+from typing import Iterable, Iterator, NamedTuple
+
+from app.models.book_model import Book
+from app.repositories.cow import CowDict, SortedBooks
+from app.repositories.indexes import AttributeIndex, FullTextIndex, TrigramIndex
+
+
+class CatalogSnapshot(NamedTuple):
+    """
+    Photo immuable du catalogue à une version donnée, publiée par les écrivains.
+    Tout ce qu'il faut pour répondre aux lectures : livres par id, versions,
+    livres triés (pagination) et index de recherche, tous figés.
+    Un lecteur la récupère en lisant UN attribut, puis ne prend aucun verrou.
+    """
+    version: int
+    books: CowDict          # id → Book
+    versions: CowDict       # id → version du livre
+    ordered: SortedBooks    # livres triés par id
+    by_author: TrigramIndex
+    fulltext: FullTextIndex
+
+
+class BookRepository:
+    """
+    Dépôt en mémoire des livres.
+    Remplace la simple liste BOOKS par :
+      - un index primaire id → Book (accès en O(1)),
+      - un compteur d'id atomique (plus de max(id) + 1 à chaque insertion),
+      - des index secondaires mis à jour à chaque mutation.
+
+    Les livres triés par id servent à la pagination par curseur (keyset) :
+    on retrouve la position "après l'id X" par dichotomie (bisect),
+    sans jamais compter ni sauter les N premiers éléments.
+
+    Concurrence (serveur multi-threadé) : copie sur écriture.
+      - les écrivains passent tous par un seul verrou (_lock) et modifient
+        leurs propres structures (CowDict, SortedBooks, index),
+      - un livre n'est jamais modifié sur place : une mise à jour crée un NOUVEL objet Book,
+      - à la fin de chaque écriture (ou lot), l'écrivain fige ces structures et publie
+        un nouveau CatalogSnapshot en UNE affectation de self._snapshot,
+      - les lecteurs (get, page, recherches, liste complète) lisent uniquement
+        self._snapshot : jamais de verrou, jamais d'état intermédiaire.
+    Figer ne recopie pas tout le catalogue : les structures sont découpées en morceaux
+    partagés entre versions, et une écriture ne recopie que les morceaux qu'elle touche
+    (voir app/repositories/cow.py).
+
+    Chaque livre a enfin un "fragment" JSON pré-encodé (bytes), calculé à la
+    première lecture et invalidé uniquement quand CE livre est modifié ou supprimé.
+
+    Pour les GET conditionnels (ETag), le dépôt tient aussi :
+      - une version du catalogue, incrémentée à chaque mutation,
+      - la version de chaque livre (version du catalogue lors de sa dernière écriture).
+    """
+
+    def __init__(self, books: Iterable[Book] = ()) -> None:
+        self._fragments: dict[int, tuple[Book, bytes]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._reset_storage()
+
+        last_id = 0
+        for book in books:
+            self._put(book, 0)
+            last_id = max(last_id, book.id)
+        self._publish(self._version)
+
+        # Le compteur n'est avancé que sous le verrou d'écriture :
+        # deux requêtes concurrentes ne peuvent donc pas obtenir le même id.
+        self._id_counter = itertools.count(last_id + 1)
+
+    def _reset_storage(self) -> None:
+        """Structures de l'écrivain, vides (création ou réplique à reconstruire)."""
+        self._books = CowDict()
+        self._versions = CowDict()
+        self._ordered = SortedBooks()
+        self._fragments.clear()
+        self._create_indexes()
+
+    def _create_indexes(self) -> None:
+        self.by_author = TrigramIndex("author")
+        self.by_title = AttributeIndex("title")
+        self.fulltext = FullTextIndex(("title", "author"))
+        self._indexes = [self.by_author, self.by_title, self.fulltext]
+
+    # region Écrivain : modification puis publication (verrou tenu)
+    def _put(self, book: Book, version: int) -> None:
+        """Ajoute ou remplace un livre dans les structures de l'écrivain."""
+        old = self._books.get(book.id)
+        if old is not None:
+            # Les index sont d'abord "désindexés" avec les anciennes valeurs.
+            for index in self._indexes:
+                index.remove(old)
+            self._fragments.pop(book.id, None)
+        self._books[book.id] = book
+        self._versions[book.id] = version
+        self._ordered.put(book)
+        for index in self._indexes:
+            index.add(book)
+
+    def _remove(self, book_id: int) -> Book | None:
+        book = self._books.pop(book_id)
+        if book is None:
+            return None
+        self._versions.pop(book_id)
+        self._ordered.remove(book_id)
+        self._fragments.pop(book_id, None)
+        for index in self._indexes:
+            index.remove(book)
+        return book
+
+    def _publish(self, version: int) -> None:
+        """
+        Fige l'état de l'écrivain et le publie. Une seule affectation :
+        les lecteurs voient l'ancienne photo ou la nouvelle, jamais un mélange.
+        """
+        self._snapshot = CatalogSnapshot(
+            version,
+            self._books.freeze(),
+            self._versions.freeze(),
+            self._ordered.freeze(),
+            self.by_author.freeze(),
+            self.fulltext.freeze(),
+        )
+    # endregion
+
+    # region Lectures : uniquement la photo publiée, sans verrou
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Photo immuable du catalogue courant (simple lecture d'attribut)."""
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshot.books)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self._snapshot.ordered)
+
+    def all(self) -> list[Book]:
+        return list(self._snapshot.ordered)
+
+    def get(self, book_id: int) -> Book | None:
+        return self._snapshot.books.get(book_id)
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book | None]:
+        """Un livre (ou None) par id demandé, dans le même ordre, en un seul passage."""
+        get = self._snapshot.books.get
+        return [get(book_id) for book_id in book_ids]
+
+    def book_version(self, book_id: int) -> int | None:
+        return self._snapshot.versions.get(book_id)
+
+    def fragment(self, book: Book) -> bytes:
+        """
+        JSON encodé du livre (équivalent de json.dumps(book.to_dict())).
+        Les lectures suivantes réutilisent les mêmes octets sans resérialiser.
+        """
+        cached = self._fragments.get(book.id)
+        # Le fragment n'est valable que pour CET objet Book : une mise à jour
+        # publie un nouvel objet, l'ancien fragment est donc ignoré même s'il
+        # a été rangé par un lecteur retardataire.
+        if cached is not None and cached[0] is book:
+            return cached[1]
+        fragment = json.dumps(book.to_dict()).encode("utf-8")
+        self._fragments[book.id] = (book, fragment)
+        return fragment
+
+    def page(self, after_id: int, limit: int) -> tuple[list[Book], bool]:
+        """
+        Renvoie au plus 'limit' livres d'id strictement supérieur à after_id,
+        dans l'ordre des ids, ainsi qu'un booléen "il reste des livres après".
+        O(log n + limit), même pendant des écritures.
+        """
+        return self._snapshot.ordered.page(after_id, limit)
+
+    def search_author(self, text: str, after_id: int = 0, limit: int | None = None) -> tuple[list[Book], bool]:
+        """
+        Recherche par sous-chaîne d'auteur via l'index de trigrammes.
+        Les résultats sont renvoyés dans l'ordre des ids, comme un parcours du catalogue,
+        en partant après after_id et limités à 'limit' (None = pas de limite).
+        """
+        snap = self._snapshot
+        ids = sorted(snap.by_author.search(text))
+        start = bisect.bisect_right(ids, after_id)
+        end = len(ids) if limit is None else start + limit
+        books = [snap.books[book_id] for book_id in ids[start:end]]
+        return books, end < len(ids)
+
+    def search_text(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> tuple[list[tuple[Book, float]], bool]:
+        """
+        Recherche plein texte classée (BM25) sur le titre et l'auteur.
+        'after' = (score, id) du dernier résultat de la page précédente.
+        """
+        snap = self._snapshot
+        hits = snap.fulltext.search(query, limit + 1, after)
+        results = [(snap.books[book_id], score) for score, book_id in hits[:limit]]
+        return results, len(hits) > limit
+    # endregion
+
+    # region Écritures : un lot = une prise du verrou = une photo publiée
+    def add(self, title: str, author: str) -> Book:
+        return self.add_many([(title, author)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[Book]:
+        """
+        Ajoute un lot de livres (title, author) ; même interface que le dépôt SQLite.
+        Tout le lot est écrit sous une seule prise du verrou.
+        """
+        books = []
+        with self._lock:
+            for title, author in items:
+                book = Book(next(self._id_counter), title, author)
+                self._version += 1
+                self._put(book, self._version)
+                books.append(book)
+            self._publish(self._version)
+        return books
+
+    def update(self, book_id: int, **fields: str) -> Book | None:
+        return self.update_many([(book_id, fields)])[0]
+
+    def update_many(self, changes: Iterable[tuple[int, dict]]) -> list[Book | None]:
+        """
+        Modifie plusieurs livres sous une seule prise du verrou.
+        Renvoie, dans le même ordre, le livre modifié ou None s'il n'existe pas.
+        Copie-sur-écriture : chaque modification crée un nouveau Book, l'ancien objet
+        (peut-être en cours de lecture ailleurs) n'est jamais touché.
+        """
+        results: list[Book | None] = []
+        with self._lock:
+            for book_id, fields in changes:
+                old = self._books.get(book_id)
+                if old is None:
+                    results.append(None)
+                    continue
+                book = Book(book_id, fields.get("title", old.title), fields.get("author", old.author))
+                self._version += 1
+                self._put(book, self._version)
+                results.append(book)
+            if any(results):
+                self._publish(self._version)
+        return results
+
+    def delete(self, book_id: int) -> bool:
+        return self.delete_many([book_id])[0]
+
+    def delete_many(self, book_ids: Iterable[int]) -> list[bool]:
+        """Supprime plusieurs livres sous une seule prise du verrou (True = supprimé)."""
+        with self._lock:
+            results = [self._remove(book_id) is not None for book_id in book_ids]
+            if any(results):
+                self._version += sum(results)
+                self._publish(self._version)
+        return results
+    # endregion
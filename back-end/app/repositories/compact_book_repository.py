@@ -0,0 +1,329 @@
+# app/repositories/compact_book_repository.py
+
+import bisect
+import functools
+import json
+import threading
+from array import array
+from typing import Iterable, Iterator
+
+from app.models.book_model import Book
+from app.repositories.indexes import FullTextIndex, TrigramIndex
+
+# Compactage quand plus de la moitié des lignes / des octets de titres sont morts
+# (suppressions, anciennes valeurs) ; pas en dessous de ces seuils.
+COMPACT_MIN_ROWS = 1024
+COMPACT_MIN_BYTES = 64 << 10
+
+
+@functools.lru_cache(maxsize=10_000)
+def _encode(book_id: int, title: str, author: str) -> bytes:
+    """
+    Fragment JSON d'un livre, mis en cache selon son CONTENU (comme le dépôt SQLite) :
+    les vues Book sont recréées à chaque lecture, le cache reste donc borné
+    au lieu de garder un fragment par livre du catalogue.
+    """
+    return json.dumps(Book(book_id, title, author).to_dict()).encode("utf-8")
+
+
+class BookColumns:
+    """
+    Stockage "en colonnes" des livres : une ligne = une position dans des tableaux
+    de nombres (array), aucun objet Python par livre.
+
+      ids, versions   : array('q'), ids triés (les nouveaux ids sont toujours les plus grands)
+      title_start/len : position et longueur du titre (UTF-8) dans un seul bytearray
+      author_ref      : numéro de l'auteur dans une table d'auteurs "internés"
+                        (un auteur qui a écrit 10 livres n'est stocké qu'une fois)
+      alive           : 1 = ligne vivante, 0 = livre supprimé (en attente de compactage)
+
+    Soit 8 + 8 + 8 + 4 + 4 + 1 = 33 octets fixes par livre + les octets du titre,
+    contre plusieurs centaines pour un objet Book et ses deux chaînes.
+    Un Book n'est construit (row → Book) que pour les lignes réellement lues.
+
+    Pas de verrou ici : c'est le dépôt qui sérialise les accès.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.versions = array("q")
+        self.title_start = array("Q")
+        self.title_len = array("I")
+        self.author_ref = array("I")
+        self.alive = bytearray()
+        self.titles = bytearray()
+        self.authors: list[str] = []
+        self._author_refs: dict[str, int] = {}
+        self._author_counts = array("I")
+        self.live = 0
+        self._dead_bytes = 0
+
+    def __len__(self) -> int:
+        return self.live
+
+    # region Lecture
+    def row_of(self, book_id: int) -> int | None:
+        """Position de la ligne d'un id (dichotomie sur ids triés), None si absent ou supprimé."""
+        row = bisect.bisect_left(self.ids, book_id)
+        if row < len(self.ids) and self.ids[row] == book_id and self.alive[row]:
+            return row
+        return None
+
+    def book(self, row: int) -> Book:
+        """Vue Book d'une ligne, matérialisée à la demande."""
+        start = self.title_start[row]
+        return Book(
+            self.ids[row],
+            self.titles[start:start + self.title_len[row]].decode("utf-8"),
+            self.authors[self.author_ref[row]],
+        )
+
+    def rows_after(self, after_id: int) -> Iterator[int]:
+        """Lignes vivantes d'id strictement supérieur à after_id, dans l'ordre des ids."""
+        alive = self.alive
+        for row in range(bisect.bisect_right(self.ids, after_id), len(self.ids)):
+            if alive[row]:
+                yield row
+    # endregion
+
+    # region Écriture
+    def append(self, book_id: int, title: str, author: str, version: int) -> int:
+        if self.ids and book_id <= self.ids[-1]:
+            raise ValueError("Les ids doivent être ajoutés dans l'ordre croissant.")
+        self.ids.append(book_id)
+        self.versions.append(version)
+        self.title_start.append(0)
+        self.title_len.append(0)
+        self.author_ref.append(0)
+        self.alive.append(1)
+        self.live += 1
+        row = len(self.ids) - 1
+        self._write(row, title, author)
+        return row
+
+    def replace(self, row: int, title: str, author: str, version: int) -> None:
+        """Nouvelles valeurs : le titre est ajouté en fin de buffer, l'ancien devient mort."""
+        self._release(row)
+        self._write(row, title, author)
+        self.versions[row] = version
+
+    def delete(self, row: int) -> None:
+        self._release(row)
+        self.alive[row] = 0
+        self.live -= 1
+
+    def needs_compaction(self) -> bool:
+        dead_rows = len(self.ids) - self.live
+        return (dead_rows >= COMPACT_MIN_ROWS and dead_rows * 2 > len(self.ids)) or (
+            self._dead_bytes >= COMPACT_MIN_BYTES and self._dead_bytes * 2 > len(self.titles)
+        )
+
+    def compacted(self) -> "BookColumns":
+        """Copie sans les lignes supprimées, les titres morts ni les auteurs orphelins."""
+        fresh = BookColumns()
+        for row in range(len(self.ids)):
+            if self.alive[row]:
+                start = self.title_start[row]
+                fresh._append_raw(
+                    self.ids[row],
+                    self.versions[row],
+                    self.titles[start:start + self.title_len[row]],
+                    self.authors[self.author_ref[row]],
+                )
+        return fresh
+
+    def _append_raw(self, book_id: int, version: int, title: bytes, author: str) -> None:
+        self.ids.append(book_id)
+        self.versions.append(version)
+        self.title_start.append(len(self.titles))
+        self.title_len.append(len(title))
+        self.titles += title
+        self.author_ref.append(self._intern(author))
+        self.alive.append(1)
+        self.live += 1
+
+    def _write(self, row: int, title: str, author: str) -> None:
+        encoded = title.encode("utf-8")
+        self.title_start[row] = len(self.titles)
+        self.title_len[row] = len(encoded)
+        self.titles += encoded
+        self.author_ref[row] = self._intern(author)
+
+    def _release(self, row: int) -> None:
+        self._dead_bytes += self.title_len[row]
+        self._author_counts[self.author_ref[row]] -= 1
+
+    def _intern(self, author: str) -> int:
+        ref = self._author_refs.get(author)
+        if ref is None:
+            ref = len(self.authors)
+            self.authors.append(author)
+            self._author_refs[author] = ref
+            self._author_counts.append(0)
+        self._author_counts[ref] += 1
+        return ref
+    # endregion
+
+
+class CompactBookRepository:
+    """
+    Dépôt en mémoire "compact" pour les très gros catalogues (STORAGE_BACKEND = "compact").
+    Même interface que BookRepository, mais les livres sont rangés dans des
+    colonnes (BookColumns) au lieu d'un dict id → Book :
+      - pas d'objet Book permanent : get / page / all renvoient des vues
+        construites pour la réponse en cours, libérées ensuite,
+      - pas de cache de fragments par livre (cache borné, par contenu),
+      - seuls les index utilisés par l'API sont gardés (auteur, plein texte).
+
+    En contrepartie :
+      - get(id) est une dichotomie (O(log n)) au lieu d'un accès de dict,
+      - les lectures prennent brièvement le verrou (pas de photo immuable partagée),
+      - la liste complète reconstruit un Book par livre à chaque appel.
+    Voir benchmarks/bench_memory.py pour la mémoire par livre des deux dépôts.
+    """
+
+    def __init__(self, books: Iterable[Book] = ()) -> None:
+        self._columns = BookColumns()
+        self._lock = threading.Lock()
+        self.version = 0
+        self.by_author = TrigramIndex("author")
+        self.fulltext = FullTextIndex(("title", "author"))
+        self._indexes = [self.by_author, self.fulltext]
+
+        last_id = 0
+        for book in sorted(books, key=lambda b: b.id):
+            self._columns.append(book.id, book.title, book.author, self.version)
+            for index in self._indexes:
+                index.add(book)
+            last_id = book.id
+        self._next_id = last_id + 1
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self.all())
+
+    # region Lectures
+    def all(self) -> list[Book]:
+        with self._lock:
+            columns = self._columns
+            return [columns.book(row) for row in columns.rows_after(0)]
+
+    def get(self, book_id: int) -> Book | None:
+        with self._lock:
+            row = self._columns.row_of(book_id)
+            return self._columns.book(row) if row is not None else None
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book | None]:
+        with self._lock:
+            columns = self._columns
+            rows = [columns.row_of(book_id) for book_id in book_ids]
+            return [columns.book(row) if row is not None else None for row in rows]
+
+    def book_version(self, book_id: int) -> int | None:
+        with self._lock:
+            row = self._columns.row_of(book_id)
+            return self._columns.versions[row] if row is not None else None
+
+    def fragment(self, book: Book) -> bytes:
+        return _encode(book.id, book.title, book.author)
+
+    def page(self, after_id: int, limit: int) -> tuple[list[Book], bool]:
+        with self._lock:
+            columns = self._columns
+            books = []
+            rows = columns.rows_after(after_id)
+            for row in rows:
+                if len(books) == limit:
+                    return books, True
+                books.append(columns.book(row))
+            return books, False
+
+    def search_author(self, text: str, after_id: int = 0, limit: int | None = None) -> tuple[list[Book], bool]:
+        with self._lock:
+            ids = sorted(self.by_author.search(text))
+            start = bisect.bisect_right(ids, after_id)
+            end = len(ids) if limit is None else start + limit
+            columns = self._columns
+            books = [columns.book(columns.row_of(book_id)) for book_id in ids[start:end]]
+        return books, end < len(ids)
+
+    def search_text(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> tuple[list[tuple[Book, float]], bool]:
+        with self._lock:
+            hits = self.fulltext.search(query, limit + 1, after)
+            columns = self._columns
+            results = [(columns.book(columns.row_of(book_id)), score) for score, book_id in hits[:limit]]
+        return results, len(hits) > limit
+    # endregion
+
+    # region Écritures
+    def add(self, title: str, author: str) -> Book:
+        return self.add_many([(title, author)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[Book]:
+        books = []
+        with self._lock:
+            for title, author in items:
+                self.version += 1
+                book = Book(self._next_id, title, author)
+                self._next_id += 1
+                self._columns.append(book.id, title, author, self.version)
+                for index in self._indexes:
+                    index.add(book)
+                books.append(book)
+        return books
+
+    def update(self, book_id: int, **fields: str) -> Book | None:
+        return self.update_many([(book_id, fields)])[0]
+
+    def update_many(self, changes: Iterable[tuple[int, dict]]) -> list[Book | None]:
+        with self._lock:
+            results = [self._update_locked(book_id, fields) for book_id, fields in changes]
+            self._maybe_compact()
+            return results
+
+    def _update_locked(self, book_id: int, fields: dict) -> Book | None:
+        columns = self._columns
+        row = columns.row_of(book_id)
+        if row is None:
+            return None
+        old = columns.book(row)
+        book = Book(book_id, fields.get("title", old.title), fields.get("author", old.author))
+        for index in self._indexes:
+            index.remove(old)
+        # Version attribuée APRÈS les nouvelles valeurs, comme BookRepository._bump.
+        columns.replace(row, book.title, book.author, self.version + 1)
+        for index in self._indexes:
+            index.add(book)
+        self.version += 1
+        return book
+
+    def delete(self, book_id: int) -> bool:
+        return self.delete_many([book_id])[0]
+
+    def delete_many(self, book_ids: Iterable[int]) -> list[bool]:
+        with self._lock:
+            results = [self._delete_locked(book_id) for book_id in book_ids]
+            self._maybe_compact()
+            return results
+
+    def _delete_locked(self, book_id: int) -> bool:
+        columns = self._columns
+        row = columns.row_of(book_id)
+        if row is None:
+            return False
+        book = columns.book(row)
+        columns.delete(row)
+        for index in self._indexes:
+            index.remove(book)
+        self.version += 1
+        return True
+
+    def _maybe_compact(self) -> None:
+        """Verrou tenu : les lecteurs ne voient jamais des colonnes en cours de reconstruction."""
+        if self._columns.needs_compaction():
+            self._columns = self._columns.compacted()
+    # endregion
@@ -0,0 +1,259 @@
+# app/repositories/cow.py
+# Structures "copie sur écriture" (copy-on-write) des photos du catalogue.
+#
+# Un écrivain (sous le verrou du dépôt) les modifie, puis appelle freeze() :
+# il obtient une version figée, publiée aux lecteurs, qui ne changera plus jamais.
+# Les lecteurs la parcourent donc sans aucun verrou.
+#
+# Pour ne pas recopier tout le catalogue à chaque écriture, les données sont
+# découpées en petits morceaux partagés entre versions : après freeze(), seul
+# un morceau modifié est recopié (une fois par version), les autres restent communs.
+
+import bisect
+import itertools
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator
+
+from app.models.book_model import Book
+
+# Taille visée d'un fragment de CowDict et d'une tranche de SortedBooks.
+SHARD_SIZE = 256
+CHUNK_SIZE = 512
+
+_book_id = attrgetter("id")
+
+
+class CowDict:
+    """
+    Dictionnaire découpé en fragments (shards) selon hash(clé).
+
+    Lecture : comme un dict (get, [], in, len, items…).
+    Écriture (écrivain seulement) : un fragment encore partagé avec une version
+    figée est recopié avant d'être modifié, puis modifié sur place jusqu'au
+    prochain freeze(). Une écriture coûte donc la copie d'UN fragment
+    (~SHARD_SIZE entrées), pas celle de tout le dictionnaire.
+
+    Les valeurs modifiables (sets, CowDict imbriqués) suivent la même règle
+    via mutable() : recopiées une fois par version avant d'être modifiées.
+    Tant que freeze() n'a jamais été appelé, tout est modifié sur place.
+    """
+
+    __slots__ = ("_shards", "_mask", "_len", "_owned", "_owned_values")
+
+    def __init__(self, items: Iterable[tuple[Any, Any]] = ()) -> None:
+        self._shards: list[dict] = [{}]
+        self._mask = 0
+        self._len = 0
+        self._owned: set[int] | None = None          # None : aucun fragment partagé
+        self._owned_values: set | None = None        # None : aucune valeur partagée
+        for key, value in items:
+            self[key] = value
+
+    # region Lecture
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._shards[hash(key) & self._mask].get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._shards[hash(key) & self._mask][key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._shards[hash(key) & self._mask]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.chain.from_iterable(self._shards)
+
+    def keys(self) -> Iterator[Any]:
+        return iter(self)
+
+    def values(self) -> Iterator[Any]:
+        return itertools.chain.from_iterable(shard.values() for shard in self._shards)
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        return itertools.chain.from_iterable(shard.items() for shard in self._shards)
+    # endregion
+
+    # region Écriture
+    def _writable(self, index: int) -> dict:
+        owned = self._owned
+        if owned is not None and index not in owned:
+            self._shards[index] = dict(self._shards[index])
+            owned.add(index)
+        return self._shards[index]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        shard = self._writable(hash(key) & self._mask)
+        if key not in shard:
+            self._len += 1
+        shard[key] = value
+        if self._len > 2 * SHARD_SIZE * len(self._shards):
+            self._grow()
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        index = hash(key) & self._mask
+        if key not in self._shards[index]:
+            return default
+        self._len -= 1
+        if self._owned_values is not None:
+            self._owned_values.discard(key)
+        return self._writable(index).pop(key)
+
+    def mutable(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """
+        Valeur de 'key' modifiable sur place (créée par factory() si absente).
+        Une valeur partagée avec une version figée est d'abord recopiée.
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+        elif self._owned_values is not None and key not in self._owned_values:
+            value = value.thaw() if isinstance(value, CowDict) else value.copy()
+        else:
+            return value
+        self[key] = value
+        if self._owned_values is not None:
+            self._owned_values.add(key)
+        return value
+
+    def clear(self) -> None:
+        self._shards, self._mask, self._len = [{}], 0, 0
+        self._owned = None if self._owned is None else {0}
+        self._owned_values = None if self._owned_values is None else set()
+
+    def _grow(self) -> None:
+        """4 fois plus de fragments : rare (croissance géométrique), tout est recopié."""
+        count = len(self._shards) * 4
+        shards: list[dict] = [{} for _ in range(count)]
+        for key, value in self.items():
+            shards[hash(key) & (count - 1)][key] = value
+        self._shards, self._mask = shards, count - 1
+        if self._owned is not None:
+            self._owned = set(range(count))
+    # endregion
+
+    # region Versions
+    def freeze(self) -> "CowDict":
+        """
+        Version figée du contenu actuel (pour les lecteurs).
+        Tout est désormais partagé avec elle : l'écrivain recopiera
+        chaque fragment / valeur avant de le modifier à nouveau.
+        """
+        frozen = CowDict.__new__(CowDict)
+        frozen._shards = tuple(self._shards)
+        frozen._mask, frozen._len = self._mask, self._len
+        frozen._owned, frozen._owned_values = set(), set()
+        self._owned, self._owned_values = set(), set()
+        return frozen
+
+    def thaw(self) -> "CowDict":
+        """Copie modifiable qui partage tous les fragments (recopiés à la première écriture)."""
+        copy = CowDict.__new__(CowDict)
+        copy._shards = list(self._shards)
+        copy._mask, copy._len = self._mask, self._len
+        copy._owned, copy._owned_values = set(), set()
+        return copy
+    # endregion
+
+
+class SortedBooks:
+    """
+    Livres triés par id, rangés en tranches d'au plus 2 × CHUNK_SIZE.
+
+    Une page "après l'id X" = deux dichotomies (tranche, puis position dans la tranche)
+    puis un parcours de 'limit' livres : O(log n + limit).
+    Une écriture ne recopie que la tranche touchée (les tranches partagées avec
+    une version figée sont des tuples, celles de l'écrivain des listes) et,
+    au freeze(), la liste des tranches (n / CHUNK_SIZE pointeurs).
+    """
+
+    __slots__ = ("_chunks", "_firsts", "_len")
+
+    def __init__(self) -> None:
+        self._chunks: list = []          # tranches : list (modifiable) ou tuple (partagée)
+        self._firsts: list[int] = []     # premier id de chaque tranche (dichotomie)
+        self._len = 0
+
+    # region Lecture
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Book]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def page(self, after_id: int, limit: int) -> tuple[list[Book], bool]:
+        """Au plus 'limit' livres d'id > after_id, et "il en reste après"."""
+        chunks = self._chunks
+        index = max(0, bisect.bisect_right(self._firsts, after_id) - 1)
+        start = bisect.bisect_right(chunks[index], after_id, key=_book_id) if chunks else 0
+        books: list[Book] = []
+        while index < len(chunks):
+            chunk = chunks[index]
+            end = start + limit - len(books)
+            books.extend(chunk[start:end])
+            if len(books) == limit:
+                return books, end < len(chunk) or index + 1 < len(chunks)
+            index, start = index + 1, 0
+        return books, False
+    # endregion
+
+    # region Écriture
+    def _own(self, index: int) -> list:
+        chunk = self._chunks[index]
+        if type(chunk) is tuple:
+            chunk = self._chunks[index] = list(chunk)
+        return chunk
+
+    def _locate(self, book_id: int) -> int:
+        return max(0, bisect.bisect_right(self._firsts, book_id) - 1)
+
+    def put(self, book: Book) -> None:
+        """Ajoute le livre, ou remplace celui de même id."""
+        if not self._chunks:
+            self._chunks.append([book])
+            self._firsts.append(book.id)
+            self._len = 1
+            return
+        index = self._locate(book.id)
+        chunk = self._own(index)
+        position = bisect.bisect_left(chunk, book.id, key=_book_id)
+        if position < len(chunk) and chunk[position].id == book.id:
+            chunk[position] = book
+            return
+        chunk.insert(position, book)
+        self._len += 1
+        self._firsts[index] = chunk[0].id
+        if len(chunk) >= 2 * CHUNK_SIZE:
+            # Cas courant (ids croissants) : la dernière tranche se remplit puis se coupe en deux.
+            self._chunks[index:index + 1] = [chunk[:CHUNK_SIZE], chunk[CHUNK_SIZE:]]
+            self._firsts[index:index + 1] = [chunk[0].id, chunk[CHUNK_SIZE].id]
+
+    def remove(self, book_id: int) -> None:
+        if not self._chunks:
+            return
+        index = self._locate(book_id)
+        position = bisect.bisect_left(self._chunks[index], book_id, key=_book_id)
+        if position == len(self._chunks[index]) or self._chunks[index][position].id != book_id:
+            return
+        chunk = self._own(index)
+        del chunk[position]
+        self._len -= 1
+        if chunk:
+            self._firsts[index] = chunk[0].id
+        else:
+            del self._chunks[index], self._firsts[index]
+
+    def clear(self) -> None:
+        self._chunks, self._firsts, self._len = [], [], 0
+
+    def freeze(self) -> "SortedBooks":
+        """Version figée : les tranches de l'écrivain deviennent des tuples partagés."""
+        chunks = self._chunks
+        for index, chunk in enumerate(chunks):
+            if type(chunk) is list:
+                chunks[index] = tuple(chunk)
+        frozen = SortedBooks.__new__(SortedBooks)
+        frozen._chunks, frozen._firsts, frozen._len = tuple(chunks), tuple(self._firsts), self._len
+        return frozen
+    # endregion
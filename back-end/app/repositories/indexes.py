@@ -0,0 +1,242 @@
+# app/repositories/indexes.py
+
+import copy
+import heapq
+import math
+import re
+import unicodedata
+from typing import Iterable
+
+from app.models.book_model import Book
+from app.repositories.cow import CowDict
+
+GRAM_SIZE = 3
+
+# Paramètres classiques de BM25 :
+#   - k1 contrôle la saturation de la fréquence d'un terme,
+#   - b contrôle la normalisation par la longueur du document.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class AttributeIndex:
+    """
+    Index secondaire : valeur d'un attribut (en minuscules) → ensemble d'ids.
+    Exemple avec "author" :
+        {"stephen king": {2, 7}, "jk rowling": {1}}
+    Le dépôt le tient à jour à chaque ajout / modification / suppression,
+    ce qui évite de reparcourir tout le catalogue pour une recherche exacte.
+
+    Les tables sont des CowDict : freeze() renvoie une copie figée de l'index,
+    lisible sans verrou pendant que l'écrivain continue de le modifier.
+    """
+
+    def __init__(self, attribute: str) -> None:
+        self.attribute = attribute
+        self._entries: CowDict = CowDict()
+
+    def _key(self, book: Book) -> str:
+        return getattr(book, self.attribute).lower()
+
+    def freeze(self) -> "AttributeIndex":
+        frozen = copy.copy(self)
+        frozen._entries = self._entries.freeze()
+        return frozen
+
+    def add(self, book: Book) -> None:
+        self._entries.mutable(self._key(book), set).add(book.id)
+
+    def remove(self, book: Book) -> None:
+        key = self._key(book)
+        if key not in self._entries:
+            return
+        ids = self._entries.mutable(key, set)
+        ids.discard(book.id)
+        # On supprime la clé quand plus aucun livre ne la référence,
+        # sinon l'index grossirait indéfiniment.
+        if not ids:
+            self._entries.pop(key)
+
+    def get(self, value: str) -> set[int]:
+        """Ids des livres dont l'attribut vaut exactement 'value' (insensible à la casse)."""
+        return self._entries.get(value.lower(), set())
+
+    def keys(self) -> Iterable[str]:
+        """Valeurs distinctes présentes dans l'index (déjà en minuscules)."""
+        return self._entries.keys()
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Découpe une chaîne en trigrammes (fenêtres glissantes de 3 caractères).
+    Exemple : "king" → {"kin", "ing"}
+    """
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex(AttributeIndex):
+    """
+    Index secondaire enrichi d'un index inversé de trigrammes.
+
+    En plus de "valeur → ids" (hérité d'AttributeIndex), on garde
+    "trigramme → valeurs distinctes qui le contiennent".
+    Pour une recherche de sous-chaîne, on intersecte les listes des trigrammes
+    de la requête : il ne reste que quelques candidats, sur lesquels on fait
+    le test "in" final. Le résultat est donc exactement le même qu'un scan complet.
+    """
+
+    def __init__(self, attribute: str) -> None:
+        super().__init__(attribute)
+        self._grams: CowDict = CowDict()
+
+    def freeze(self) -> "TrigramIndex":
+        frozen = super().freeze()
+        frozen._grams = self._grams.freeze()
+        return frozen
+
+    def add(self, book: Book) -> None:
+        key = self._key(book)
+        # Une valeur n'est découpée qu'à sa première apparition :
+        # dix livres du même auteur ne coûtent qu'un seul découpage.
+        if key not in self._entries:
+            for gram in trigrams(key):
+                self._grams.mutable(gram, set).add(key)
+        super().add(book)
+
+    def remove(self, book: Book) -> None:
+        key = self._key(book)
+        super().remove(book)
+        if key in self._entries:
+            return
+        for gram in trigrams(key):
+            if gram not in self._grams:
+                continue
+            keys = self._grams.mutable(gram, set)
+            keys.discard(key)
+            if not keys:
+                self._grams.pop(gram)
+
+    def search(self, text: str) -> set[int]:
+        """
+        Ids des livres dont l'attribut contient 'text' (insensible à la casse).
+        Même sémantique que : text.lower() in getattr(book, attribute).lower()
+        """
+        needle = text.lower()
+
+        if len(needle) < GRAM_SIZE:
+            # Requête trop courte pour former un trigramme :
+            # on parcourt les valeurs distinctes (bien moins nombreuses que les livres).
+            candidates = self._entries.keys()
+        else:
+            # On commence par la liste la plus courte pour que l'intersection
+            # reste petite dès le départ.
+            postings = sorted(
+                (self._grams.get(gram, set()) for gram in trigrams(needle)),
+                key=len,
+            )
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+        ids: set[int] = set()
+        for key in candidates:
+            if needle in key:
+                ids.update(self._entries[key])
+        return ids
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Normalise puis découpe un texte en termes :
+      - décomposition Unicode + suppression des accents ("ça" → "ca"),
+      - passage en minuscules (casefold),
+      - découpage sur tout ce qui n'est pas une lettre / un chiffre.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(stripped.casefold())
+
+
+class FullTextIndex:
+    """
+    Index inversé plein texte sur plusieurs attributs (ex : titre + auteur).
+
+    Structure (CowDict, figeables comme ceux d'AttributeIndex) :
+      - terme → {id: (nombre d'occurrences dans le livre, longueur du livre)}
+      - id → longueur du document (nombre de termes)
+    La longueur est recopiée dans chaque entrée : le calcul du score
+    n'a qu'une table à lire par livre candidat.
+
+    La recherche ne parcourt que les listes des termes de la requête,
+    calcule un score BM25 puis garde les k meilleurs avec un tas (heapq).
+    """
+
+    def __init__(self, attributes: Iterable[str]) -> None:
+        self.attributes = tuple(attributes)
+        self._postings: CowDict = CowDict()
+        self._lengths: CowDict = CowDict()
+        self._total_length = 0
+
+    def freeze(self) -> "FullTextIndex":
+        frozen = copy.copy(self)
+        frozen._postings = self._postings.freeze()
+        frozen._lengths = self._lengths.freeze()
+        return frozen
+
+    def _terms(self, book: Book) -> list[str]:
+        return tokenize(" ".join(getattr(book, a) for a in self.attributes))
+
+    def add(self, book: Book) -> None:
+        terms = self._terms(book)
+        counts: dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            self._postings.mutable(term, CowDict)[book.id] = (tf, len(terms))
+        self._lengths[book.id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, book: Book) -> None:
+        length = self._lengths.pop(book.id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in set(self._terms(book)):
+            if term not in self._postings:
+                continue
+            postings = self._postings.mutable(term, CowDict)
+            postings.pop(book.id, None)
+            if not postings:
+                self._postings.pop(term)
+
+    def search(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[float, int]]:
+        """
+        Renvoie au plus 'limit' couples (score, id), du plus pertinent au moins pertinent.
+        À score égal, le plus petit id passe en premier (résultats stables).
+        'after' = (score, id) du dernier résultat déjà servi : seuls les résultats
+        classés strictement après lui sont renvoyés (pagination par curseur).
+        """
+        doc_count = len(self._lengths)
+        if not doc_count or limit <= 0:
+            return []
+        avg_length = self._total_length / doc_count
+
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for book_id, (tf, length) in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[book_id] = scores.get(book_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = ((-score, book_id) for book_id, score in scores.items())
+        if after is not None:
+            boundary = (-after[0], after[1])
+            ranked = (key for key in ranked if key > boundary)
+        best = heapq.nsmallest(limit, ranked)
+        return [(-neg_score, book_id) for neg_score, book_id in best]
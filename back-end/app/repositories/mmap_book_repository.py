@@ -0,0 +1,406 @@
+# app/repositories/mmap_book_repository.py
+
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de flock, ce mode n'est pas disponible
+    fcntl = None
+
+from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
+
+# Format du fichier partagé
+# ---------------------------------------------------------------------------
+# [en-tête 64 octets][enregistrement][enregistrement]...
+#
+# En-tête : magic, génération, fin des données, prochain id, version du catalogue.
+# La "génération" change quand le fichier est compacté (réécrit sans les
+# enregistrements morts) : les autres processus savent alors qu'ils doivent le rouvrir.
+MAGIC = b"BOOKLOG2"
+HEADER = struct.Struct("<8sQQQQ")
+HEADER_SIZE = 64
+DATA_END_OFFSET = 16  # position de "fin des données" dans l'en-tête
+
+# Enregistrement : type (1 = écriture, 2 = suppression), id, version,
+# longueur du titre, longueur de l'auteur, puis les deux textes en UTF-8.
+# Soit 25 octets fixes + le texte, sans aucun objet Python.
+# Longueurs sur 32 bits : le format accepte tout livre que les DTO acceptent
+# (avec 16 bits, un auteur de plus de 64 Kio d'UTF-8 ne pouvait pas être écrit).
+RECORD = struct.Struct("<BQQII")
+PUT = 1
+DELETE = 2
+
+INITIAL_SIZE = 1 << 20       # 1 Mio, doublé à chaque fois que c'est nécessaire
+COMPACT_MIN_SIZE = 4 << 20   # on ne compacte pas les petits fichiers
+
+
+class MmapBookRepository(BookRepository):
+    """
+    Catalogue partagé entre plusieurs processus (workers) via un fichier mappé en mémoire.
+
+    Principe :
+    ---------------------
+    Le fichier est un journal en ajout seul : chaque création / modification
+    ajoute un enregistrement "PUT", chaque suppression un enregistrement "DELETE".
+    Les écrivains (tous processus confondus) se sérialisent avec un verrou de fichier
+    (flock) ; l'en-tête indique jusqu'où le journal est écrit.
+
+    Chaque worker garde une réplique locale (celle de BookRepository : dict, index,
+    photos immuables, fragments JSON). Avant chaque lecture, il compare la fin du
+    journal à sa propre position : si d'autres workers ont écrit, il rejoue seulement
+    les nouveaux enregistrements. Les lectures restent donc locales (aucun échange
+    entre processus) et montent en charge avec le nombre de cœurs,
+    tout en voyant les écritures de tous les workers.
+
+    Ce qui est partagé, c'est le JOURNAL (un seul fichier, une seule écriture par
+    modification, pages mappées communes), pas les objets Python : les lectures ne
+    décodent pas le fichier à la demande, car la recherche par auteur et plein texte
+    a besoin de ses index, reconstruits dans chaque processus de toute façon.
+    Coût mémoire : une réplique complète PAR worker, soit environ
+    N workers × (taille du catalogue × ~1,5 Ko par livre, index compris).
+
+    _offsets (id → position de l'enregistrement vivant dans le fichier) sert
+    uniquement à mesurer la place perdue et à réécrire le fichier lors du compactage.
+    """
+
+    def __init__(self, path: str, seed: Iterable[Book] = ()) -> None:
+        if fcntl is None:
+            raise RuntimeError("Le stockage 'mmap' nécessite un système POSIX (fcntl.flock).")
+
+        self.path = path
+        self._local_version = 0
+        self._applying = False
+        super().__init__()
+        # RLock : une lecture (version, len…) faite en tenant déjà le verrou resynchronise sans se bloquer.
+        self._lock = threading.RLock()
+
+        self._offsets: dict[int, int] = {}
+        self._live_bytes = 0
+        self._generation = -1
+        self._position = HEADER_SIZE
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        self._fd = -1
+        self._mm: mmap.mmap | None = None
+
+        with self._lock, self._file_lock():
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            if os.fstat(fd).st_size < HEADER_SIZE:
+                # Premier worker à démarrer : on crée le fichier et on y écrit le jeu de démo.
+                self._format(fd, seed)
+            os.close(fd)
+            self._open()
+            self._catch_up()
+
+    # region Version du catalogue (toujours synchronisée avec le fichier)
+    @property
+    def version(self) -> int:
+        if not self._applying:
+            self._sync()
+        return self._local_version
+
+    @version.setter
+    def version(self, value: int) -> None:
+        self._local_version = value
+    # endregion
+
+    # region Fichier : ouverture, verrou, écriture
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Verrou exclusif entre PROCESSUS (les threads passent déjà par self._lock)."""
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _format(self, fd: int, seed: Iterable[Book]) -> None:
+        books = sorted(seed, key=lambda b: b.id)
+        records = b"".join(self._encode(PUT, b.id, 0, b.title, b.author) for b in books)
+        size = max(INITIAL_SIZE, HEADER_SIZE + len(records))
+        next_id = books[-1].id + 1 if books else 1
+        os.ftruncate(fd, size)
+        os.pwrite(fd, records, HEADER_SIZE)
+        header = HEADER.pack(MAGIC, 0, HEADER_SIZE + len(records), next_id, 0)
+        os.pwrite(fd, header.ljust(HEADER_SIZE, b"\0"), 0)
+
+    def _open(self) -> None:
+        """
+        (Ré)ouvre le fichier et le mappe en entier.
+        L'ancien mapping n'est pas fermé explicitement : un thread qui lit encore
+        l'en-tête ne tombe pas sur un mapping fermé, le GC le libérera ensuite.
+        """
+        if self._mm is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._mm = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+        magic = HEADER.unpack_from(self._mm, 0)[0]
+        if magic != MAGIC:
+            raise RuntimeError(f"{self.path} n'est pas un catalogue mmap valide.")
+
+    def _header(self) -> tuple[int, int, int, int]:
+        """(génération, fin des données, prochain id, version)"""
+        return HEADER.unpack_from(self._mm, 0)[1:]
+
+    @staticmethod
+    def _encode(kind: int, book_id: int, version: int, title: str = "", author: str = "") -> bytes:
+        title_bytes = title.encode("utf-8")
+        author_bytes = author.encode("utf-8")
+        return RECORD.pack(kind, book_id, version, len(title_bytes), len(author_bytes)) + title_bytes + author_bytes
+
+    def _append(self, data: bytes, next_id: int, version: int) -> None:
+        """
+        Ajoute des enregistrements en fin de journal (verrou de fichier tenu).
+        La fin des données est écrite EN DERNIER : un lecteur ne voit jamais
+        un enregistrement à moitié écrit.
+        """
+        _, data_end, _, _ = self._header()
+        needed = data_end + len(data)
+        if needed > len(self._mm):
+            new_size = len(self._mm)
+            while new_size < needed:
+                new_size *= 2
+            os.ftruncate(self._fd, new_size)
+            self._open()
+
+        self._mm[data_end:needed] = data
+        generation = self._header()[0]
+        self._mm[:HEADER.size] = HEADER.pack(MAGIC, generation, data_end, next_id, version)
+        struct.pack_into("<Q", self._mm, DATA_END_OFFSET, needed)
+    # endregion
+
+    # region Relecture du journal
+    def _sync(self) -> None:
+        """
+        Chemin rapide des lectures : une seule lecture de l'en-tête.
+        On ne prend le verrou que si d'autres workers ont écrit depuis.
+        """
+        generation, data_end, _, _ = self._header()
+        if generation == self._generation and data_end == self._position:
+            return
+        with self._lock:
+            self._catch_up()
+
+    def _reset_local(self) -> None:
+        """Vide la réplique locale (le fichier a été compacté par un autre worker)."""
+        self._reset_storage()
+        self._offsets.clear()
+        self._live_bytes = 0
+        self._position = HEADER_SIZE
+
+    def _catch_up(self) -> None:
+        """Rejoue les enregistrements écrits depuis notre dernière position (self._lock tenu)."""
+        generation, data_end, _, _ = self._header()
+        reset = False
+        if generation != self._generation:
+            if self._generation != -1:
+                self._open()
+                generation, data_end, _, _ = self._header()
+                self._reset_local()
+                reset = True
+            self._generation = generation
+        if data_end > len(self._mm):
+            self._open()
+        if data_end == self._position and not reset:
+            return
+
+        self._applying = True
+        try:
+            mm, position = self._mm, self._position
+            while position < data_end:
+                kind, book_id, version, title_len, author_len = RECORD.unpack_from(mm, position)
+                start = position + RECORD.size
+                end = start + title_len + author_len
+                if kind == PUT:
+                    title = mm[start:start + title_len].decode("utf-8")
+                    author = mm[start + title_len:end].decode("utf-8")
+                    self._apply_put(Book(book_id, title, author), version, position, end - position)
+                else:
+                    self._apply_delete(book_id)
+                self._local_version = max(self._local_version, version)
+                position = end
+            self._position = position
+            # Une photo publiée par rattrapage, comme après une écriture locale.
+            self._publish(self._local_version)
+        finally:
+            self._applying = False
+
+    def _record_size(self, offset: int) -> int:
+        _, _, _, title_len, author_len = RECORD.unpack_from(self._mm, offset)
+        return RECORD.size + title_len + author_len
+
+    def _apply_put(self, book: Book, version: int, offset: int, size: int) -> None:
+        if book.id in self._offsets:
+            self._live_bytes -= self._record_size(self._offsets[book.id])
+        self._put(book, version)
+        self._offsets[book.id] = offset
+        self._live_bytes += size
+
+    def _apply_delete(self, book_id: int) -> None:
+        if self._remove(book_id) is None:
+            return
+        self._live_bytes -= self._record_size(self._offsets.pop(book_id))
+    # endregion
+
+    # region Compactage
+    def _maybe_compact(self) -> None:
+        """
+        Quand plus de la moitié du fichier est occupée par des enregistrements morts
+        (anciennes versions, suppressions), on le réécrit avec les seuls vivants.
+        """
+        _, data_end, _, _ = self._header()
+        if data_end < COMPACT_MIN_SIZE or self._live_bytes * 2 > data_end - HEADER_SIZE:
+            return
+
+        generation, data_end, next_id, version = self._header()
+        records = b"".join(
+            self._mm[offset:offset + self._record_size(offset)] for offset in self._offsets.values()
+        )
+        size = INITIAL_SIZE
+        while size < HEADER_SIZE + len(records) * 2:
+            size *= 2
+
+        tmp_path = self.path + ".tmp"
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, records, HEADER_SIZE)
+            header = HEADER.pack(MAGIC, generation + 1, HEADER_SIZE + len(records), next_id, version)
+            os.pwrite(fd, header.ljust(HEADER_SIZE, b"\0"), 0)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.path)
+
+        # Les autres workers ont encore l'ancien fichier mappé : on y inscrit
+        # la nouvelle génération pour qu'ils rouvrent le fichier compacté.
+        self._mm[:HEADER.size] = HEADER.pack(MAGIC, generation + 1, data_end, next_id, version)
+        self._catch_up()
+    # endregion
+
+    # region Lectures : synchronisation puis réplique locale
+    def snapshot(self):
+        self._sync()
+        return super().snapshot()
+
+    def all(self) -> list[Book]:
+        self._sync()
+        return super().all()
+
+    def __iter__(self) -> Iterator[Book]:
+        self._sync()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._sync()
+        return super().__len__()
+
+    def get(self, book_id: int) -> Book | None:
+        self._sync()
+        return super().get(book_id)
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book | None]:
+        self._sync()
+        return super().get_many(book_ids)
+
+    def book_version(self, book_id: int) -> int | None:
+        self._sync()
+        return super().book_version(book_id)
+
+    def page(self, after_id: int, limit: int) -> tuple[list[Book], bool]:
+        self._sync()
+        return super().page(after_id, limit)
+
+    def search_author(self, text: str, after_id: int = 0, limit: int | None = None) -> tuple[list[Book], bool]:
+        self._sync()
+        return super().search_author(text, after_id, limit)
+
+    def search_text(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> tuple[list[tuple[Book, float]], bool]:
+        self._sync()
+        return super().search_text(query, limit, after)
+    # endregion
+
+    # region Écritures : verrou de fichier, ajout au journal, relecture
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[Book]:
+        items = list(items)
+        with self._lock, self._file_lock():
+            self._catch_up()
+            _, _, next_id, version = self._header()
+            version += 1
+            ids = list(range(next_id, next_id + len(items)))
+            data = b"".join(
+                self._encode(PUT, book_id, version, title, author)
+                for book_id, (title, author) in zip(ids, items)
+            )
+            self._append(data, next_id + len(items), version)
+            self._catch_up()
+            return [self._books[book_id] for book_id in ids]
+
+    def update(self, book_id: int, **fields: str) -> Book | None:
+        return self.update_many([(book_id, fields)])[0]
+
+    def update_many(self, changes: Iterable[tuple[int, dict]]) -> list[Book | None]:
+        changes = list(changes)
+        with self._lock, self._file_lock():
+            self._catch_up()
+            _, _, next_id, version = self._header()
+            version += 1
+            # Livres simulés localement pour que deux modifications du même id
+            # dans le lot se cumulent, comme avec les autres dépôts.
+            pending: dict[int, tuple[str, str]] = {}
+            found: list[bool] = []
+            records = []
+            for book_id, fields in changes:
+                current = pending.get(book_id)
+                if current is None and book_id in self._books:
+                    current = (self._books[book_id].title, self._books[book_id].author)
+                found.append(current is not None)
+                if current is None:
+                    continue
+                title, author = fields.get("title", current[0]), fields.get("author", current[1])
+                pending[book_id] = (title, author)
+                records.append(self._encode(PUT, book_id, version, title, author))
+            if records:
+                self._append(b"".join(records), next_id, version)
+                self._catch_up()
+                self._maybe_compact()
+            return [self._books[book_id] if ok else None for (book_id, _), ok in zip(changes, found)]
+
+    def delete(self, book_id: int) -> bool:
+        return self.delete_many([book_id])[0]
+
+    def delete_many(self, book_ids: Iterable[int]) -> list[bool]:
+        with self._lock, self._file_lock():
+            self._catch_up()
+            _, _, next_id, version = self._header()
+            version += 1
+            deleted: set[int] = set()
+            results = []
+            for book_id in book_ids:
+                ok = book_id in self._books and book_id not in deleted
+                results.append(ok)
+                if ok:
+                    deleted.add(book_id)
+            if deleted:
+                data = b"".join(self._encode(DELETE, book_id, version) for book_id in deleted)
+                self._append(data, next_id, version)
+                self._catch_up()
+                self._maybe_compact()
+            return results
+    # endregion
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+        os.close(self._lock_fd)
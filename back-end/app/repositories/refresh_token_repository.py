@@ -0,0 +1,101 @@
+# app/repositories/refresh_token_repository.py
+
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from app.repositories.sqlite_database import SQLiteDatabase
+
+
+class InMemoryRefreshTokenRepository:
+    """
+    Refresh tokens en mémoire, indexés par empreinte (SHA-256 du token).
+
+    Deux index :
+      - empreinte → (user_id, expiration) : vérification en O(1),
+      - user_id → empreintes : révocation de toutes les sessions d'un utilisateur.
+
+    pop() retire le token en une seule opération sous verrou :
+    deux rafraîchissements simultanés avec le même token → un seul réussit.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, Tuple[int, float]] = {}
+        self._by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, token_hash: str, user_id: int, expires_at: float) -> None:
+        with self._lock:
+            self._tokens[token_hash] = (user_id, expires_at)
+            self._by_user.setdefault(user_id, set()).add(token_hash)
+
+    def pop(self, token_hash: str) -> Optional[Tuple[int, float]]:
+        with self._lock:
+            record = self._tokens.pop(token_hash, None)
+            if record is not None:
+                self._forget(record[0], token_hash)
+            return record
+
+    def revoke_user(self, user_id: int) -> int:
+        with self._lock:
+            hashes = self._by_user.pop(user_id, set())
+            for token_hash in hashes:
+                del self._tokens[token_hash]
+            return len(hashes)
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [(h, uid) for h, (uid, expires_at) in self._tokens.items() if expires_at <= now]
+            for token_hash, user_id in expired:
+                del self._tokens[token_hash]
+                self._forget(user_id, token_hash)
+            return len(expired)
+
+    def _forget(self, user_id: int, token_hash: str) -> None:
+        hashes = self._by_user.get(user_id)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._by_user[user_id]
+
+
+class SQLiteRefreshTokenRepository:
+    """
+    Refresh tokens dans SQLite (table refresh_tokens, clé primaire = empreinte).
+    Partagé entre les workers : un token émis par un processus
+    peut être rafraîchi par n'importe quel autre.
+    """
+
+    def __init__(self, db: SQLiteDatabase) -> None:
+        self.db = db
+
+    def __len__(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM refresh_tokens").fetchone()[0]
+
+    def add(self, token_hash: str, user_id: int, expires_at: float) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO refresh_tokens (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+                (token_hash, user_id, expires_at),
+            )
+
+    def pop(self, token_hash: str) -> Optional[Tuple[int, float]]:
+        # BEGIN IMMEDIATE (transaction()) : lecture + suppression sous le verrou d'écriture,
+        # aucun autre processus ne peut consommer le même token entre les deux.
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT user_id, expires_at FROM refresh_tokens WHERE token_hash = ?", (token_hash,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM refresh_tokens WHERE token_hash = ?", (token_hash,))
+        return (row[0], row[1]) if row else None
+
+    def revoke_user(self, user_id: int) -> int:
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM refresh_tokens WHERE user_id = ?", (user_id,)).rowcount
+
+    def purge_expired(self, now: float) -> int:
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM refresh_tokens WHERE expires_at <= ?", (now,)).rowcount
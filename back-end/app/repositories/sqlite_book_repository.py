@@ -0,0 +1,248 @@
+# app/repositories/sqlite_book_repository.py
+
+import functools
+import json
+from typing import Iterable, Iterator
+
+from app.models.book_model import Book
+from app.repositories.indexes import tokenize
+from app.repositories.sqlite_database import SQLiteDatabase
+
+# SQLite limite le nombre de paramètres "?" par requête : on découpe les listes d'ids.
+_MAX_PARAMS = 500
+
+# Requêtes préparées : des chaînes constantes avec paramètres "?",
+# compilées une seule fois par connexion grâce au cache de sqlite3.
+_SELECT_ONE = "SELECT id, title, author FROM books WHERE id = ?"
+_SELECT_ALL = "SELECT id, title, author FROM books ORDER BY id"
+_SELECT_PAGE = "SELECT id, title, author FROM books WHERE id > ? ORDER BY id LIMIT ?"
+_SELECT_MANY = "SELECT id, title, author FROM books WHERE id IN ({})"
+_SELECT_VERSION = "SELECT version FROM books WHERE id = ?"
+_SELECT_COUNT = "SELECT COUNT(*) FROM books"
+_SELECT_ANY = "SELECT 1 FROM books LIMIT 1"
+# Sous-chaîne d'auteur : par l'index de trigrammes (parcouru dans l'ordre des rowid),
+# ou en parcourant la table pour une requête de moins de 3 caractères.
+_SELECT_AUTHOR = """
+    SELECT b.id, b.title, b.author
+    FROM books_author_trigram t JOIN books b ON b.id = t.rowid
+    WHERE books_author_trigram MATCH ? AND t.rowid > ?
+    ORDER BY t.rowid LIMIT ?
+"""
+_SCAN_AUTHOR = (
+    "SELECT id, title, author FROM books "
+    "WHERE id > ? AND instr(author_lower, ?) > 0 ORDER BY id LIMIT ?"
+)
+# Taille d'un trigramme : en dessous, l'index ne peut pas servir.
+_GRAM_SIZE = 3
+_MARK_SEEDED = "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('seeded', 1)"
+_SELECT_CATALOG_VERSION = "SELECT value FROM catalog_meta WHERE key = 'version'"
+_BUMP_CATALOG_VERSION = "UPDATE catalog_meta SET value = value + 1 WHERE key = 'version'"
+_INSERT = "INSERT INTO books (title, author, author_lower, version) VALUES (?, ?, ?, ?)"
+_INSERT_WITH_ID = "INSERT INTO books (id, title, author, author_lower, version) VALUES (?, ?, ?, ?, ?)"
+_UPDATE = "UPDATE books SET title = ?, author = ?, author_lower = ?, version = ? WHERE id = ?"
+_DELETE = "DELETE FROM books WHERE id = ?"
+_SEARCH_TEXT = """
+    SELECT id, title, author, score FROM (
+        SELECT b.id AS id, b.title AS title, b.author AS author, -bm25(books_fts) AS score
+        FROM books_fts JOIN books b ON b.id = books_fts.rowid
+        WHERE books_fts MATCH ?
+    )
+    WHERE score < ? OR (score = ? AND id > ?)
+    ORDER BY score DESC, id
+    LIMIT ?
+"""
+
+
+@functools.lru_cache(maxsize=100_000)
+def _encode(book_id: int, title: str, author: str) -> bytes:
+    """
+    Fragment JSON d'un livre, mis en cache selon son CONTENU.
+    Un livre modifié (par ce processus ou un autre) donne une autre clé :
+    le cache ne peut donc jamais renvoyer une version périmée.
+    """
+    return json.dumps(Book(book_id, title, author).to_dict()).encode("utf-8")
+
+
+class SQLiteBookRepository:
+    """
+    Dépôt des livres persistant dans SQLite.
+    Même interface que BookRepository (le dépôt en mémoire) :
+    book_service peut utiliser l'un ou l'autre sans changer de code.
+    """
+
+    def __init__(self, db: SQLiteDatabase, seed: Iterable[Book] = ()) -> None:
+        self.db = db
+        # Le jeu de démo n'est inséré qu'à la création de la base : la ligne 'seeded'
+        # de catalog_meta le mémorise, un catalogue vidé exprès reste donc vide
+        # au redémarrage. Bases créées avant ce drapeau : on ne sème que si aucune
+        # écriture n'a jamais eu lieu (table vide ET version du catalogue à 0).
+        with self.db.transaction() as conn:
+            first_start = conn.execute(_MARK_SEEDED).rowcount == 1
+            never_written = conn.execute(_SELECT_CATALOG_VERSION).fetchone()[0] == 0
+            if first_start and never_written and conn.execute(_SELECT_ANY).fetchone() is None:
+                conn.executemany(
+                    _INSERT_WITH_ID,
+                    [(b.id, b.title, b.author, b.author.lower(), 0) for b in seed],
+                )
+
+    @staticmethod
+    def _book(row: tuple) -> Book:
+        return Book(row[0], row[1], row[2])
+
+    def _next_version(self, conn) -> int:
+        conn.execute(_BUMP_CATALOG_VERSION)
+        return conn.execute(_SELECT_CATALOG_VERSION).fetchone()[0]
+
+    @staticmethod
+    def _pending_version(conn) -> int:
+        """Version qu'aura le catalogue si le lot modifie quelque chose (verrou d'écriture tenu)."""
+        return conn.execute(_SELECT_CATALOG_VERSION).fetchone()[0] + 1
+
+    def __len__(self) -> int:
+        return self.db.connection().execute(_SELECT_COUNT).fetchone()[0]
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self.all())
+
+    @property
+    def version(self) -> int:
+        return self.db.connection().execute(_SELECT_CATALOG_VERSION).fetchone()[0]
+
+    def all(self) -> list[Book]:
+        return [self._book(row) for row in self.db.connection().execute(_SELECT_ALL)]
+
+    def get(self, book_id: int) -> Book | None:
+        row = self.db.connection().execute(_SELECT_ONE, (book_id,)).fetchone()
+        return self._book(row) if row else None
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book | None]:
+        """
+        Multi-get : une requête IN (...) par paquet de 500 ids au lieu d'une requête par id,
+        puis remise dans l'ordre demandé.
+        """
+        book_ids = list(book_ids)
+        unique = list(dict.fromkeys(book_ids))
+        found: dict[int, Book] = {}
+        conn = self.db.connection()
+        for start in range(0, len(unique), _MAX_PARAMS):
+            chunk = unique[start:start + _MAX_PARAMS]
+            sql = _SELECT_MANY.format(",".join("?" * len(chunk)))
+            for row in conn.execute(sql, chunk):
+                found[row[0]] = self._book(row)
+        return [found.get(book_id) for book_id in book_ids]
+
+    def book_version(self, book_id: int) -> int | None:
+        row = self.db.connection().execute(_SELECT_VERSION, (book_id,)).fetchone()
+        return row[0] if row else None
+
+    def fragment(self, book: Book) -> bytes:
+        return _encode(book.id, book.title, book.author)
+
+    def page(self, after_id: int, limit: int) -> tuple[list[Book], bool]:
+        rows = self.db.connection().execute(_SELECT_PAGE, (after_id, limit + 1)).fetchall()
+        return [self._book(row) for row in rows[:limit]], len(rows) > limit
+
+    def add(self, title: str, author: str) -> Book:
+        return self.add_many([(title, author)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[Book]:
+        """
+        Insertion par lot : une seule transaction (un seul fsync) pour tout le lot,
+        au lieu d'une par livre.
+        """
+        items = list(items)
+        if not items:
+            return []
+        books = []
+        with self.db.transaction() as conn:
+            version = self._next_version(conn)
+            for title, author in items:
+                cursor = conn.execute(_INSERT, (title, author, author.lower(), version))
+                books.append(Book(cursor.lastrowid, title, author))
+        return books
+
+    def update(self, book_id: int, **fields: str) -> Book | None:
+        return self.update_many([(book_id, fields)])[0]
+
+    def update_many(self, changes: Iterable[tuple[int, dict]]) -> list[Book | None]:
+        """
+        Mises à jour par lot, dans une seule transaction.
+        La version du catalogue (et donc les ETag) ne change que si une ligne a été modifiée.
+        """
+        results: list[Book | None] = []
+        changed = 0
+        with self.db.transaction() as conn:
+            version = self._pending_version(conn)
+            for book_id, fields in changes:
+                row = conn.execute(_SELECT_ONE, (book_id,)).fetchone()
+                if row is None:
+                    results.append(None)
+                    continue
+                book = self._book(row)
+                for name, value in fields.items():
+                    setattr(book, name, value)
+                changed += conn.execute(
+                    _UPDATE, (book.title, book.author, book.author.lower(), version, book_id)
+                ).rowcount
+                results.append(book)
+            if changed > 0:
+                conn.execute(_BUMP_CATALOG_VERSION)
+        return results
+
+    def delete(self, book_id: int) -> bool:
+        return self.delete_many([book_id])[0]
+
+    def delete_many(self, book_ids: Iterable[int]) -> list[bool]:
+        """Suppressions par lot, dans une seule transaction."""
+        with self.db.transaction() as conn:
+            results = [conn.execute(_DELETE, (book_id,)).rowcount > 0 for book_id in book_ids]
+            if any(results):
+                self._next_version(conn)
+        return results
+
+    def search_author(self, text: str, after_id: int = 0, limit: int | None = None) -> tuple[list[Book], bool]:
+        """
+        Même sémantique que le dépôt en mémoire : text.lower() in author.lower().
+        La mise en minuscules est faite par Python des deux côtés (colonne author_lower),
+        pour ne pas dépendre du lower() de SQLite, limité à l'ASCII.
+
+        À partir de 3 caractères, la recherche passe par l'index de trigrammes
+        (books_author_trigram) : seuls les livres candidats sont lus, pas toute la table.
+        """
+        needle = text.lower()
+        fetch = -1 if limit is None else limit + 1
+        conn = self.db.connection()
+        if self.db.has_author_trigram and len(needle) >= _GRAM_SIZE:
+            # Expression entre guillemets : une "phrase" de trigrammes consécutifs = la sous-chaîne.
+            phrase = '"' + needle.replace('"', '""') + '"'
+            rows = conn.execute(_SELECT_AUTHOR, (phrase, after_id, fetch)).fetchall()
+        else:
+            rows = conn.execute(_SCAN_AUTHOR, (after_id, needle, fetch)).fetchall()
+        if limit is None:
+            return [self._book(row) for row in rows], False
+        return [self._book(row) for row in rows[:limit]], len(rows) > limit
+
+    def search_text(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> tuple[list[tuple[Book, float]], bool]:
+        """
+        Recherche plein texte classée : index FTS5 et sa fonction bm25().
+        Sans FTS5, on se rabat sur la recherche par auteur (sans score réel).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return [], False
+
+        if not self.db.has_fts:
+            books, has_more = self.search_author(query, after[1] if after else 0, limit)
+            return [(b, 0.0) for b in books], has_more
+
+        # Chaque terme est mis entre guillemets : la syntaxe FTS5 (AND, NEAR, *…)
+        # ne peut pas être injectée depuis le paramètre q.
+        match = " OR ".join(f'"{term}"' for term in terms)
+        score, after_id = after if after else (float("inf"), 0)
+        rows = self.db.connection().execute(
+            _SEARCH_TEXT, (match, score, score, after_id, limit + 1)
+        ).fetchall()
+        hits = [(self._book(row), row[3]) for row in rows[:limit]]
+        return hits, len(rows) > limit
@@ -0,0 +1,186 @@
+# app/repositories/sqlite_database.py
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# Schéma créé au premier démarrage (CREATE ... IF NOT EXISTS : sans effet ensuite).
+#   - books.id / users.id : INTEGER PRIMARY KEY → c'est l'index principal de SQLite,
+#   - author_lower / email_lower : valeurs déjà normalisées par Python (lower() /
+#     normalize_email) ; email_lower est indexé pour l'unicité des emails, author_lower
+#     par trigrammes (AUTHOR_TRIGRAM_SCHEMA) : un index B-tree ne sert pas une recherche
+#     de sous-chaîne, on le supprime des bases qui l'avaient,
+#   - refresh_tokens : empreintes SHA-256 des refresh tokens (jamais le token en clair),
+#   - catalog_meta : version du catalogue, partagée par tous les processus (ETag),
+#     et drapeau 'seeded' (jeu de démo déjà inséré une fois).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    title        TEXT    NOT NULL,
+    author       TEXT    NOT NULL,
+    author_lower TEXT    NOT NULL,
+    version      INTEGER NOT NULL
+);
+DROP INDEX IF EXISTS idx_books_author_lower;
+
+CREATE TABLE IF NOT EXISTS users (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    email         TEXT NOT NULL,
+    email_lower   TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    role          TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_lower ON users (email_lower);
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_hash TEXT    PRIMARY KEY,
+    user_id    INTEGER NOT NULL,
+    expires_at REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens (user_id);
+
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('version', 0);
+"""
+
+# Index plein texte FTS5, synchronisé par triggers avec la table books.
+# "remove_diacritics 2" reproduit la normalisation de tokenize() (accents, casse).
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5 (
+    title, author,
+    content='books', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+END;
+"""
+
+# Recherche par sous-chaîne d'auteur : index FTS5 "trigram" (SQLite >= 3.34) sur author_lower,
+# l'équivalent de TrigramIndex du dépôt en mémoire. case_sensitive 1 : la casse est déjà
+# normalisée par Python, SQLite compare donc exactement ce que compare le dépôt en mémoire.
+AUTHOR_TRIGRAM_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_author_trigram USING fts5 (
+    author_lower,
+    content='books', content_rowid='id',
+    tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS books_author_trigram_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_author_trigram (rowid, author_lower) VALUES (new.id, new.author_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS books_author_trigram_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_author_trigram (books_author_trigram, rowid, author_lower)
+    VALUES ('delete', old.id, old.author_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS books_author_trigram_update AFTER UPDATE OF author_lower ON books BEGIN
+    INSERT INTO books_author_trigram (books_author_trigram, rowid, author_lower)
+    VALUES ('delete', old.id, old.author_lower);
+    INSERT INTO books_author_trigram (rowid, author_lower) VALUES (new.id, new.author_lower);
+END;
+"""
+
+
+class SQLiteDatabase:
+    """
+    Accès partagé à un fichier SQLite pour les dépôts livres / utilisateurs.
+
+    Points clés :
+      - mode WAL : les lecteurs ne bloquent pas l'écrivain (et inversement),
+        plusieurs processus peuvent lire pendant une écriture,
+      - une connexion par thread (pool "thread-local") : sqlite3 interdit
+        de partager une connexion entre threads, et on évite d'en rouvrir une
+        à chaque requête,
+      - requêtes paramétrées : sqlite3 garde en cache les requêtes préparées
+        (cached_statements), elles ne sont compilées qu'une fois par connexion,
+      - transaction() : un seul BEGIN / COMMIT pour tout un lot d'écritures.
+    """
+
+    def __init__(self, path: str, statement_cache_size: int = 256) -> None:
+        self.path = path
+        self._statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite compilé sans FTS5 : la recherche plein texte passera en mode dégradé.
+            self.has_fts = False
+
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'books_author_trigram'").fetchone()
+        try:
+            conn.executescript(AUTHOR_TRIGRAM_SCHEMA)
+            self.has_author_trigram = True
+        except sqlite3.OperationalError:
+            # Sans FTS5 ou SQLite < 3.34 : recherche par auteur en parcourant la table.
+            self.has_author_trigram = False
+        if self.has_author_trigram and exists is None:
+            # Index créé sur une base existante : on y range les livres déjà présents.
+            conn.execute("INSERT INTO books_author_trigram (books_author_trigram) VALUES ('rebuild')")
+
+    def connection(self) -> sqlite3.Connection:
+        """Connexion propre au thread courant, ouverte à la première utilisation."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,  # transactions gérées explicitement (BEGIN / COMMIT)
+                # Chaque connexion reste dans son thread ; False permet juste à close()
+                # de les fermer toutes depuis le thread principal.
+                check_same_thread=False,
+                cached_statements=self._statement_cache_size,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Transaction d'écriture.
+        BEGIN IMMEDIATE prend le verrou d'écriture dès le début :
+        deux écrivains ne peuvent pas se retrouver bloqués l'un par l'autre en cours de route.
+        En cas d'exception, tout le lot est annulé (ROLLBACK).
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """
+        Ferme les connexions ouvertes par le pool.
+        À appeler quand plus aucun thread n'utilise la base (arrêt, fin de test).
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
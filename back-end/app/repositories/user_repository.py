@@ -0,0 +1,159 @@
+# app/repositories/user_repository.py
+
+import sqlite3
+import threading
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.user_model import User, normalize_email
+from app.repositories.sqlite_database import SQLiteDatabase
+
+
+class InMemoryUserRepository:
+    """
+    Stockage des utilisateurs en mémoire (comportement historique de la démo).
+    Les données sont perdues à chaque redémarrage.
+
+    Deux index (dictionnaires) évitent de parcourir toute la liste :
+      - par email normalisé (normalize_email),
+      - par id.
+    Recherche, contrôle d'unicité et attribution de l'id sont donc en O(1),
+    quel que soit le nombre d'utilisateurs.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: Dict[int, User] = {}
+        self._by_email: Dict[str, User] = {}
+        self._ids = count(1)
+        # Verrou : contrôle d'unicité + insertion doivent être atomiques
+        # (deux inscriptions simultanées avec le même email).
+        self._lock = threading.Lock()
+
+    def all(self) -> List[User]:
+        # Les dictionnaires gardent l'ordre d'insertion : ordre des ids.
+        return list(self._by_id.values())
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        return self._by_email.get(normalize_email(email))
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        return self._by_id.get(user_id)
+
+    def add(self, email: str, password_hash: str, role: str) -> User:
+        """
+        Enregistre un utilisateur (mot de passe déjà hashé).
+        Lève ValueError si l'email est déjà utilisé.
+        """
+        key = normalize_email(email)
+        with self._lock:
+            if key in self._by_email:
+                raise ValueError("Un utilisateur avec cet email existe déjà.")
+
+            user = User(id=next(self._ids), email=email, password_hash=password_hash, role=role)
+            self._by_id[user.id] = user
+            self._by_email[key] = user
+        return user
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> List[Optional[User]]:
+        """
+        Insère un lot (email, password_hash, role) sous un seul verrou.
+        Retourne, pour chaque ligne, le User créé ou None si l'email existait déjà.
+        """
+        created: List[Optional[User]] = []
+        with self._lock:
+            for email, password_hash, role in rows:
+                key = normalize_email(email)
+                if key in self._by_email:
+                    created.append(None)
+                    continue
+                user = User(id=next(self._ids), email=email, password_hash=password_hash, role=role)
+                self._by_id[user.id] = user
+                self._by_email[key] = user
+                created.append(user)
+        return created
+
+
+class SQLiteUserRepository:
+    """
+    Stockage des utilisateurs dans SQLite.
+    L'unicité de l'email (insensible à la casse) est garantie par l'index
+    UNIQUE sur email_lower (= normalize_email(email), même clé que le dépôt
+    en mémoire) : même deux processus concurrents ne peuvent pas créer
+    deux comptes identiques.
+    """
+
+    _SELECT = "SELECT id, email, password_hash, role FROM users"
+
+    # PRAGMA user_version : 1 = email_lower calculé par normalize_email.
+    _EMAIL_KEYS_VERSION = 1
+
+    def __init__(self, db: SQLiteDatabase) -> None:
+        self.db = db
+        self._migrate_email_keys()
+
+    def _migrate_email_keys(self) -> None:
+        """
+        Les bases créées avant normalize_email ont un email_lower calculé par str.lower()
+        (sans strip ni casefold) : on le recalcule une seule fois.
+        OR IGNORE : si deux anciens comptes tombent sur la même clé, le second garde
+        l'ancienne (la base reste lisible, l'unicité n'est pas violée).
+        """
+        with self.db.transaction() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= self._EMAIL_KEYS_VERSION:
+                return
+            rows = conn.execute("SELECT id, email, email_lower FROM users").fetchall()
+            conn.executemany(
+                "UPDATE OR IGNORE users SET email_lower = ? WHERE id = ?",
+                [(normalize_email(email), user_id) for user_id, email, key in rows if normalize_email(email) != key],
+            )
+            conn.execute(f"PRAGMA user_version = {self._EMAIL_KEYS_VERSION}")
+
+    @staticmethod
+    def _user(row: tuple | None) -> Optional[User]:
+        if row is None:
+            return None
+        return User(id=row[0], email=row[1], password_hash=row[2], role=row[3])
+
+    def all(self) -> List[User]:
+        rows = self.db.connection().execute(self._SELECT + " ORDER BY id")
+        return [self._user(row) for row in rows]
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        row = self.db.connection().execute(
+            self._SELECT + " WHERE email_lower = ?", (normalize_email(email),)
+        ).fetchone()
+        return self._user(row)
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        row = self.db.connection().execute(self._SELECT + " WHERE id = ?", (user_id,)).fetchone()
+        return self._user(row)
+
+    def add(self, email: str, password_hash: str, role: str) -> User:
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (email, email_lower, password_hash, role) VALUES (?, ?, ?, ?)",
+                    (email, normalize_email(email), password_hash, role),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Un utilisateur avec cet email existe déjà.")
+        return User(id=cursor.lastrowid, email=email, password_hash=password_hash, role=role)
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> List[Optional[User]]:
+        """
+        Insère un lot (email, password_hash, role) dans UNE transaction.
+        INSERT OR IGNORE : un email déjà pris ne fait pas échouer le lot,
+        la ligne correspondante vaut None dans le résultat.
+        """
+        created: List[Optional[User]] = []
+        with self.db.transaction() as conn:
+            for email, password_hash, role in rows:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO users (email, email_lower, password_hash, role) VALUES (?, ?, ?, ?)",
+                    (email, normalize_email(email), password_hash, role),
+                )
+                created.append(
+                    User(id=cursor.lastrowid, email=email, password_hash=password_hash, role=role)
+                    if cursor.rowcount else None
+                )
+        return created
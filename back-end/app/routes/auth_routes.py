@@ -16,3 +16,21 @@ auth_bp.add_url_rule(
     view_func=auth_controller.login,
     methods=["POST"],
 )
+
+auth_bp.add_url_rule(
+    "/api/auth/refresh",
+    view_func=auth_controller.refresh,
+    methods=["POST"],
+)
+
+auth_bp.add_url_rule(
+    "/api/auth/logout",
+    view_func=auth_controller.logout,
+    methods=["POST"],
+)
+
+auth_bp.add_url_rule(
+    "/api/auth/users/import",
+    view_func=auth_controller.import_users_bulk,
+    methods=["POST"],
+)
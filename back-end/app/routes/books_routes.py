@@ -1,10 +1,20 @@
 # app/routes/books_routes.py
 
-from flask import Blueprint
+from flask import Blueprint, abort
 import app.controllers.book_controller as book_controller
 
 books_bp = Blueprint("books", __name__)
 
+
+@books_bp.url_value_preprocessor
+def reject_out_of_range_id(endpoint, values):
+    """
+    /api/books/<int:id> : un id hors de 1..MAX_BOOK_ID ne peut correspondre à aucun livre
+    → 404 avant même d'appeler le contrôleur (et le stockage, qui ne saurait pas le lire).
+    """
+    if values and "id" in values and not book_controller.is_valid_book_id(values["id"]):
+        abort(404)
+
 # Routes publiques
 books_bp.add_url_rule(
     "/api/books",
@@ -24,6 +34,12 @@ books_bp.add_url_rule(
     methods=["GET"],
 )
 
+books_bp.add_url_rule(
+    "/api/books/lookup",
+    view_func=book_controller.lookup_books,
+    methods=["POST"],
+)
+
 # Routes protégées (JWT dans les contrôleurs)
 books_bp.add_url_rule(
     "/api/books",
@@ -31,6 +47,24 @@ books_bp.add_url_rule(
     methods=["POST"],
 )
 
+books_bp.add_url_rule(
+    "/api/books/bulk",
+    view_func=book_controller.create_books_bulk,
+    methods=["POST"],
+)
+
+books_bp.add_url_rule(
+    "/api/books/bulk",
+    view_func=book_controller.update_books_bulk,
+    methods=["PATCH"],
+)
+
+books_bp.add_url_rule(
+    "/api/books/bulk",
+    view_func=book_controller.remove_books_bulk,
+    methods=["DELETE"],
+)
+
 books_bp.add_url_rule(
     "/api/books/<int:id>",
     view_func=book_controller.update_book_full,
@@ -0,0 +1,12 @@
+# app/routes/metrics_routes.py
+
+from flask import Blueprint
+import app.controllers.metrics_controller as metrics_controller
+
+metrics_bp = Blueprint("metrics", __name__)
+
+metrics_bp.add_url_rule(
+    "/metrics",
+    view_func=metrics_controller.get_metrics,
+    methods=["GET"],
+)
@@ -0,0 +1,31 @@
+# app/routes/profiling_routes.py
+
+from flask import Blueprint
+import app.controllers.profiling_controller as profiling_controller
+
+profiling_bp = Blueprint("profiling", __name__)
+
+# Routes admin (JWT + rôle admin dans les contrôleurs)
+profiling_bp.add_url_rule(
+    "/api/admin/profiling",
+    view_func=profiling_controller.get_profiling,
+    methods=["GET"],
+)
+
+profiling_bp.add_url_rule(
+    "/api/admin/profiling",
+    view_func=profiling_controller.set_profiling,
+    methods=["POST"],
+)
+
+profiling_bp.add_url_rule(
+    "/api/admin/profiles",
+    view_func=profiling_controller.list_profiles,
+    methods=["GET"],
+)
+
+profiling_bp.add_url_rule(
+    "/api/admin/profiles/<name>",
+    view_func=profiling_controller.download_profile,
+    methods=["GET"],
+)
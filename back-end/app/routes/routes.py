@@ -3,6 +3,8 @@
 from flask import Flask
 from .books_routes import books_bp
 from .auth_routes import auth_bp
+from .metrics_routes import metrics_bp
+from .profiling_routes import profiling_bp
 
 def init_routes(app: Flask) -> None:
     """
@@ -12,3 +14,5 @@ def init_routes(app: Flask) -> None:
     """
     app.register_blueprint(books_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiling_bp)
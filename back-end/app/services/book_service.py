@@ -1,12 +1,28 @@
+from typing import Iterable
+
 from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
 
 # Jeu de données en mémoire pour la démo.
 # Dans une vraie application, cette partie serait remplacée par une base SQL.
-BOOKS = [
-    Book(1, "Harry Potter", "JK Rowling"),
-    Book(2, "ça", "Stephen King"),
-    Book(3, "La Bible", "Dieu"),
+# Le dépôt indexe les livres par id (et par auteur / titre) :
+# les fonctions ci-dessous ne sont plus qu'une façade fine au-dessus de lui.
+DEMO_BOOKS = [
+    (1, "Harry Potter", "JK Rowling"),
+    (2, "ça", "Stephen King"),
+    (3, "La Bible", "Dieu"),
 ]
+_memory_repository = BookRepository(Book(*row) for row in DEMO_BOOKS)
+_repository = _memory_repository
+
+
+def use_repository(repository=None) -> None:
+    """
+    Choisit le stockage utilisé par le service (voir create_app / STORAGE_BACKEND).
+    None → retour au dépôt en mémoire par défaut.
+    """
+    global _repository
+    _repository = repository if repository is not None else _memory_repository
 
 
 def get_all() -> list[Book]:
@@ -15,31 +31,83 @@ def get_all() -> list[Book]:
     Le service ne renvoie pas du JSON, mais des objets Book.
     Le contrôleur transformera ensuite en dict pour l'API.
     """
-    return BOOKS
+    return _repository.all()
+
+
+def catalog_version() -> int:
+    """
+    Version du catalogue : augmente à chaque ajout, modification ou suppression.
+    Sert à construire les ETags des listes et recherches.
+    """
+    return _repository.version
+
+
+def get_book_version(book_id: int) -> int | None:
+    """Version d'un livre (None s'il n'existe pas) : sert à l'ETag de GET /api/books/<id>."""
+    return _repository.book_version(book_id)
+
+
+def book_to_json(book: Book) -> bytes:
+    """
+    JSON encodé d'un livre, tiré du cache de fragments du dépôt.
+    Un livre inchangé n'est donc sérialisé qu'une seule fois,
+    quel que soit le nombre de GET qui le renvoient.
+    """
+    return _repository.fragment(book)
+
+
+def books_to_json(books: Iterable[Book]) -> bytes:
+    """
+    Tableau JSON assemblé en collant les fragments déjà encodés :
+    b"[" + b",".join(fragments) + b"]".
+    """
+    return b"[" + b",".join(_repository.fragment(b) for b in books) + b"]"
+
+
+def get_books_page(after_id: int, limit: int) -> tuple[list[Book], bool]:
+    """
+    Pagination par curseur (keyset) :
+    renvoie au plus 'limit' livres dont l'id est strictement supérieur à after_id,
+    triés par id, plus un booléen indiquant s'il reste des livres ensuite.
+    Contrairement à un offset, le coût ne dépend pas du numéro de la page.
+    """
+    return _repository.page(after_id, limit)
 
 
 def get_book_by_id(book_id: int) -> Book | None:
     """
     Recherche un livre par son identifiant.
-    Utilise next() avec une expression génératrice,
-    ce qui permet de trouver le premier match puis arrêter immédiatement.
+    Lecture directe dans l'index primaire (dict) : coût constant,
+    quelle que soit la taille du catalogue.
     Retourne None si rien n'est trouvé.
     """
-    return next((b for b in BOOKS if b.id == book_id), None)
+    return _repository.get(book_id)
+
+
+def get_books_by_ids(book_ids: list[int]) -> list[Book | None]:
+    """
+    Multi-get : récupère plusieurs livres en un seul passage sur l'index des ids.
+    Renvoie une entrée par id demandé, dans le même ordre (None si l'id est inconnu).
+    """
+    return _repository.get_many(book_ids)
 
 
 def add_book(title: str, author: str) -> Book:
     """
-    Ajoute un nouveau livre dans la liste.
-    L'id est généré simplement :
-      - si la liste n'est pas vide → max(id) + 1
-      - si vide → id = 1
-    Cette logique serait gérée par l'auto-incrément de la DB dans un vrai projet.
+    Ajoute un nouveau livre dans le catalogue.
+    L'id est fourni par le compteur atomique du dépôt,
+    comme le ferait l'auto-incrément d'une base de données.
     """
-    new_id = max(b.id for b in BOOKS) + 1 if BOOKS else 1
-    new_book = Book(new_id, title, author)
-    BOOKS.append(new_book)
-    return new_book
+    return _repository.add(title, author)
+
+
+def add_books(items: list[tuple[str, str]]) -> list[Book]:
+    """
+    Ajout par lot : une liste de couples (title, author) déjà validés.
+    Le dépôt écrit tout le lot en une seule fois (un verrou / une transaction),
+    au lieu d'un aller-retour complet par livre.
+    """
+    return _repository.add_many(items)
 
 
 def update_book(book_id: int, title: str, author: str) -> Book | None:
@@ -50,12 +118,7 @@ def update_book(book_id: int, title: str, author: str) -> Book | None:
       - l'auteur
     Si le livre n'existe pas → None (le contrôleur renverra la 404).
     """
-    book = get_book_by_id(book_id)
-    if book:
-        book.title = title
-        book.author = author
-        return book
-    return None
+    return _repository.update(book_id, title=title, author=author)
 
 
 def patch_book(book_id: int, data: dict) -> Book | None:
@@ -66,16 +129,18 @@ def patch_book(book_id: int, data: dict) -> Book | None:
         {"author": "Tolkien"} → seul l'auteur change.
     Cette approche respecte l'idée du PATCH côté API REST.
     """
-    book = get_book_by_id(book_id)
-    if not book:
-        return None
+    fields = {k: data[k] for k in ("title", "author") if k in data}
+    return _repository.update(book_id, **fields)
 
-    if "title" in data:
-        book.title = data["title"]
-    if "author" in data:
-        book.author = data["author"]
 
-    return book
+def patch_books(changes: list[tuple[int, dict]]) -> list[Book | None]:
+    """
+    Mise à jour partielle par lot : une liste de couples (id, champs à modifier).
+    Renvoie, dans le même ordre, le livre modifié ou None si l'id est inconnu.
+    """
+    return _repository.update_many(
+        [(book_id, {k: data[k] for k in ("title", "author") if k in data}) for book_id, data in changes]
+    )
 
 
 def delete_book(book_id: int) -> bool:
@@ -86,12 +151,12 @@ def delete_book(book_id: int) -> bool:
       - False → id introuvable
     Le contrôleur transforme ensuite ça en réponse HTTP (204 ou 404).
     """
-    book = get_book_by_id(book_id)
-    if not book:
-        return False
+    return _repository.delete(book_id)
+
 
-    BOOKS.remove(book)
-    return True
+def delete_books(book_ids: list[int]) -> list[bool]:
+    """Suppression par lot : renvoie, dans le même ordre, True si le livre a été supprimé."""
+    return _repository.delete_many(book_ids)
 
 
 def search_book_by_author(author: str) -> list[Book]:
@@ -99,6 +164,31 @@ def search_book_by_author(author: str) -> list[Book]:
     Recherche simple par auteur :
     - insensible à la casse,
     - recherche d'une sous-chaîne (ex : "king" match "Stephen King").
+    L'index de trigrammes du dépôt restreint les candidats avant le test final,
+    sans parcourir tout le catalogue.
     Ce service renvoie des objets Book, que le contrôleur convertira ensuite en dict.
     """
-    return [b for b in BOOKS if author.lower() in b.author.lower()]
+    books, _ = _repository.search_author(author)
+    return books
+
+
+def search_book_by_author_page(author: str, after_id: int, limit: int) -> tuple[list[Book], bool]:
+    """
+    Version paginée de search_book_by_author (même ordre : par id croissant).
+    Renvoie (livres, reste_il_des_résultats).
+    """
+    return _repository.search_author(author, after_id, limit)
+
+
+def search_books(
+    query: str, limit: int, after: tuple[float, int] | None = None
+) -> tuple[list[tuple[Book, float]], bool]:
+    """
+    Recherche plein texte sur le titre ET l'auteur, classée par pertinence.
+    Les mots de la requête sont normalisés (casse, accents) comme ceux de l'index :
+    "ca king" retrouve "ça" de "Stephen King".
+    Retourne au plus 'limit' couples (Book, score), du plus pertinent au moins pertinent,
+    et un booléen indiquant s'il existe des résultats au-delà.
+    'after' = (score, id) du dernier résultat de la page précédente.
+    """
+    return _repository.search_text(query, limit, after)
@@ -0,0 +1,319 @@
+# app/services/hashing_service.py
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Délai max d'attente d'un hash avant d'abandonner (secondes).
+HASH_TIMEOUT = 30.0
+
+
+class HashingBusyError(RuntimeError):
+    """
+    Levée quand la file de hachage est pleine.
+    Le contrôleur la transforme en 503 + en-tête Retry-After.
+    """
+
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__("Service d'authentification saturé, réessayez plus tard.")
+        self.retry_after = retry_after
+
+
+# Fonctions exécutées DANS les processus du pool.
+# Elles doivent être au niveau module pour être picklables (mode "spawn").
+# time.monotonic() est une horloge système : comparable d'un processus à l'autre,
+# ce qui permet de mesurer le temps passé dans la file d'attente.
+def _hash_job(password: str) -> tuple[str, float]:
+    started = time.monotonic()
+    return generate_password_hash(password), started
+
+
+def _check_job(password_hash: str, password: str) -> tuple[bool, float]:
+    started = time.monotonic()
+    return check_password_hash(password_hash, password), started
+
+
+class PasswordHasher:
+    """
+    Exécute les hachages de mots de passe (scrypt, défaut de werkzeug 3) hors du thread de requête.
+
+    Pourquoi ?
+    ---------------------
+    generate_password_hash / check_password_hash consomment plusieurs centaines
+    de millisecondes de CPU. Faits dans le thread de requête, une rafale de logins
+    bloque tout le serveur, y compris un simple GET /api/books.
+
+    Ici :
+      - les hachages partent dans un pool de processus dédié (workers),
+      - au plus max_pending hachages sont acceptés en même temps
+        (workers en cours + file d'attente) ; au-delà → HashingBusyError (503),
+      - workers = 0 → hachage dans le thread appelant (tests, petites machines),
+        mais toujours avec la même limite de concurrence,
+      - une place n'est rendue qu'à la FIN réelle du hachage (done-callback) :
+        un appelant qui abandonne (timeout) ne libère pas un worker encore occupé,
+      - un pool cassé (processus tué) est remplacé au prochain appel ; l'appel en cours → 503,
+      - les imports HTTP passent par bulk() : un seul à la fois, jamais plus de
+        max(1, workers) de leurs hachages en même temps ; la file reste aux logins.
+
+    Le pool est créé à la première utilisation : en mode multi-processus
+    (pre-fork), chaque worker HTTP démarre ainsi son propre pool après le fork.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 16) -> None:
+        self.workers = workers
+        self.max_pending = max(1, workers) + queue_size
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._bulk_lock = threading.Lock()
+
+        # Métriques (protégées par _lock)
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    # region API publique
+    def hash(self, password: str) -> str:
+        return self._run(_hash_job, password)
+
+    def check(self, password_hash: str, password: str) -> bool:
+        return self._run(_check_job, password_hash, password)
+
+    @contextmanager
+    def bulk(self) -> Iterator[Callable[[List[str]], List[str]]]:
+        """
+        Hachage d'un import en masse sur CE pool, avec la même limite que les logins.
+        Un seul import à la fois : un second → HashingBusyError (503) tout de suite.
+        Fournit hash_many(passwords) → hashes (même ordre).
+        """
+        if not self._bulk_lock.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingBusyError(retry_after=int(HASH_TIMEOUT))
+        try:
+            yield self._hash_many
+        finally:
+            self._bulk_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Profondeur de file et latences, pour régler workers / queue_size."""
+        with self._lock:
+            done = self._completed or 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - max(1, self.workers)),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._wait_total / done,
+                "avg_latency_seconds": self._latency_total / done,
+                "max_latency_seconds": self._latency_max,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Arrête le pool. wait=True attend la sortie des processus : nécessaire juste
+        avant la fin d'un processus multiprocessing, qui ferme ses files internes
+        avant que le pool ait pu prévenir ses workers (ils resteraient orphelins).
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    # endregion
+
+    # region Interne
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" : processus neufs, sans hériter des threads / verrous
+                # du serveur (un fork d'un processus multi-thread est risqué).
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_pool(self, executor: ProcessPoolExecutor) -> None:
+        """Oublie un pool cassé : le prochain appel à _pool() en crée un neuf."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _releaser(self) -> Callable[..., None]:
+        """
+        Rend la place prise par un appel, UNE seule fois même si appelée deux fois
+        (par le done-callback du future et par l'appelant qui a eu son résultat).
+        """
+        released = False
+
+        def release(_future: Optional[Future] = None) -> None:
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                self._in_flight -= 1
+            self._slots.release()
+
+        return release
+
+    def _hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Au plus max(1, workers) hachages du lot occupent une place à la fois :
+        un login arrivé entre-temps prend une place de la file et passe entre deux
+        hachages du lot. Le lot, lui, ATTEND une place libre au lieu d'échouer.
+        """
+        width = max(1, self.workers)
+        if width == 1:
+            return [self._run(_hash_job, password, wait=True) for password in passwords]
+        with ThreadPoolExecutor(max_workers=width) as threads:
+            return list(threads.map(lambda password: self._run(_hash_job, password, wait=True), passwords))
+
+    def _run(self, job: Callable[..., tuple[Any, float]], *args: Any, wait: bool = False) -> Any:
+        # Backpressure : on refuse tout de suite plutôt que d'empiler sans fin
+        # (wait=True, imports : on attend une place, au plus HASH_TIMEOUT).
+        acquired = self._slots.acquire(timeout=HASH_TIMEOUT) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise HashingBusyError(retry_after=1)
+
+        submitted = time.monotonic()
+        with self._lock:
+            self._in_flight += 1
+        release = self._releaser()
+        if self.workers <= 0:
+            try:
+                result, started = job(*args)
+            finally:
+                release()
+        else:
+            executor = self._pool()
+            try:
+                future: Future = executor.submit(job, *args)
+            except BrokenProcessPool as exc:
+                release()
+                self._discard_pool(executor)
+                raise HashingBusyError(retry_after=1) from exc
+            except BaseException:
+                release()
+                raise
+            # La place est rendue quand le job se termine vraiment (ou est annulé),
+            # pas quand cet appelant arrête d'attendre.
+            future.add_done_callback(release)
+            try:
+                result, started = future.result(timeout=HASH_TIMEOUT)
+            except TimeoutError:
+                future.cancel()  # sans effet si le job tourne déjà : sa place reste prise
+                raise HashingBusyError(retry_after=int(HASH_TIMEOUT))
+            except BrokenProcessPool as exc:
+                self._discard_pool(executor)
+                raise HashingBusyError(retry_after=1) from exc
+            finally:
+                if future.done():
+                    release()
+
+        finished = time.monotonic()
+        with self._lock:
+            self._completed += 1
+            self._wait_total += max(0.0, started - submitted)
+            latency = finished - submitted
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+        return result
+    # endregion
+
+
+# Hacheur utilisé par défaut (avant init_hashing) : dans le thread appelant.
+_hasher = PasswordHasher(workers=0)
+
+
+def init_hashing(app: Flask) -> None:
+    """
+    Configure le pool de hachage à partir de la config Flask :
+      - PASSWORD_HASH_WORKERS : nombre de processus (0 = dans le thread de requête),
+      - PASSWORD_HASH_QUEUE : hachages en attente acceptés avant de répondre 503.
+
+    Ces réglages sont indépendants du nombre de workers HTTP : la charge
+    d'authentification ne peut pas consommer tout le CPU réservé au catalogue.
+    """
+    global _hasher
+    previous = _hasher
+    _hasher = PasswordHasher(
+        workers=int(app.config["PASSWORD_HASH_WORKERS"]),
+        queue_size=int(app.config["PASSWORD_HASH_QUEUE"]),
+    )
+    previous.shutdown()
+    app.extensions["password_hasher"] = _hasher
+
+
+@contextmanager
+def bulk_hashing(workers: Optional[int] = None) -> Iterator[Callable[[List[str]], List[str]]]:
+    """
+    Pool de hachage temporaire pour les imports en masse hors ligne (commande CLI,
+    voir user_service.import_users). Les imports HTTP passent par shared_hashing().
+
+    Contrairement au pool du login (borné, pour protéger les autres requêtes),
+    celui-ci utilise par défaut TOUS les cœurs : un import de 100 000 comptes
+    est limité par le nombre de CPU, pas par un seul thread.
+
+    Fournit une fonction hash_many(passwords) → hashes (même ordre).
+    workers = 0 → hachage dans le processus courant (tests).
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 0:
+        yield lambda passwords: [generate_password_hash(p) for p in passwords]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        def hash_many(passwords: List[str]) -> List[str]:
+            # chunksize : on envoie les mots de passe par paquets (moins d'allers-retours).
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(generate_password_hash, passwords, chunksize=chunksize))
+
+        yield hash_many
+
+
+def shared_hashing():
+    """
+    Hachage d'un import en masse sur le pool partagé du login (import HTTP) :
+    le serveur continue de servir logins et catalogue pendant l'import.
+    Voir PasswordHasher.bulk.
+    """
+    return _hasher.bulk()
+
+
+def default_workers() -> int:
+    """La moitié des CPU (au moins 1) : le reste sert les requêtes HTTP."""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def hash_password(password: str) -> str:
+    return _hasher.hash(password)
+
+
+def check_password(password_hash: str, password: str) -> bool:
+    return _hasher.check(password_hash, password)
+
+
+def hashing_stats() -> Dict[str, Any]:
+    return _hasher.stats()
+
+
+# À l'arrêt de l'interpréteur, on ne laisse pas de processus orphelins.
+atexit.register(lambda: _hasher.shutdown())
@@ -0,0 +1,63 @@
+# app/services/storage_service.py
+
+import os
+
+from flask import Flask
+
+from app.models.book_model import Book
+from app.repositories.compact_book_repository import CompactBookRepository
+from app.repositories.mmap_book_repository import MmapBookRepository
+from app.repositories.sqlite_book_repository import SQLiteBookRepository
+from app.repositories.sqlite_database import SQLiteDatabase
+from app.repositories.refresh_token_repository import SQLiteRefreshTokenRepository
+from app.repositories.user_repository import SQLiteUserRepository
+from app.services import book_service, token_service, user_service
+
+STORAGE_BACKENDS = ("memory", "compact", "sqlite", "mmap")
+
+
+def init_storage(app: Flask) -> None:
+    """
+    Branche les services livres / utilisateurs sur le stockage choisi
+    dans app.config["STORAGE_BACKEND"] :
+      - "memory" (défaut) : données en mémoire, perdues au redémarrage,
+      - "compact" : comme "memory", mais livres rangés en colonnes (CompactBookRepository) :
+        bien moins de mémoire par livre pour les très gros catalogues,
+      - "sqlite" : fichier SQLite (app.config["SQLITE_PATH"]), partagé entre
+        les workers et conservé entre deux démarrages,
+      - "mmap" : livres dans un fichier mappé en mémoire (app.config["MMAP_PATH"]),
+        partagé par tous les workers du mode multi-processus ; les utilisateurs
+        (et leurs refresh tokens) restent dans SQLite, déjà partagé entre processus.
+
+    La base ouverte est rangée dans app.extensions["sqlite_db"]
+    (et le catalogue mmap dans app.extensions["mmap_catalog"])
+    pour pouvoir les fermer proprement (tests, arrêt).
+    """
+    backend = app.config["STORAGE_BACKEND"]
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"STORAGE_BACKEND inconnu : {backend!r} (attendu : {', '.join(STORAGE_BACKENDS)})")
+
+    if backend in ("memory", "compact"):
+        if backend == "compact":
+            book_service.use_repository(CompactBookRepository(Book(*row) for row in book_service.DEMO_BOOKS))
+        else:
+            book_service.use_repository(None)
+        user_service.use_repository(None)
+        token_service.use_repository(None)
+        return
+
+    path = app.config.get("SQLITE_PATH") or os.path.join(app.instance_path, "app.db")
+    db = SQLiteDatabase(path)
+    app.extensions["sqlite_db"] = db
+    seed = [Book(*row) for row in book_service.DEMO_BOOKS]
+    user_service.use_repository(SQLiteUserRepository(db))
+    token_service.use_repository(SQLiteRefreshTokenRepository(db))
+
+    if backend == "sqlite":
+        book_service.use_repository(SQLiteBookRepository(db, seed=seed))
+        return
+
+    mmap_path = app.config.get("MMAP_PATH") or os.path.join(app.instance_path, "books.mmap")
+    catalog = MmapBookRepository(mmap_path, seed=seed)
+    app.extensions["mmap_catalog"] = catalog
+    book_service.use_repository(catalog)
@@ -0,0 +1,91 @@
+# app/services/token_service.py
+
+import hashlib
+import secrets
+import time
+from typing import Optional, Tuple
+
+from app.models.user_model import User
+from app.repositories.refresh_token_repository import InMemoryRefreshTokenRepository
+from app.services.user_service import get_user_by_id
+
+# Durée de vie d'un refresh token (30 jours).
+REFRESH_TOKEN_TTL = 30 * 24 * 3600
+
+# Nettoyage des tokens expirés tous les N tokens émis (borne la mémoire).
+PURGE_EVERY = 1000
+
+_memory_repository = InMemoryRefreshTokenRepository()
+_repository = _memory_repository
+_issued = 0
+
+
+def use_repository(repository=None) -> None:
+    """
+    Choisit le stockage des refresh tokens.
+    None → retour au stockage en mémoire par défaut.
+    """
+    global _repository
+    _repository = repository if repository is not None else _memory_repository
+
+
+def _fingerprint(token: str) -> str:
+    """
+    Empreinte stockée à la place du token.
+
+    SHA-256 suffit ici (contrairement aux mots de passe) : le token est
+    un secret aléatoire de 256 bits, impossible à retrouver par force brute.
+    Le calcul prend quelques microsecondes, contre des centaines de
+    millisecondes pour un hachage de mot de passe (scrypt).
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(user: User, now: Optional[float] = None) -> str:
+    """
+    Crée un refresh token pour l'utilisateur (au login, puis à chaque rotation).
+    Le token en clair n'est renvoyé qu'une fois, au client : seul son empreinte est gardée.
+    """
+    global _issued
+    now = time.time() if now is None else now
+    token = secrets.token_urlsafe(32)
+    _repository.add(_fingerprint(token), user.id, now + REFRESH_TOKEN_TTL)
+
+    _issued += 1
+    if _issued % PURGE_EVERY == 0:
+        _repository.purge_expired(now)
+    return token
+
+
+def rotate_refresh_token(token: str, now: Optional[float] = None) -> Optional[Tuple[User, str]]:
+    """
+    Échange un refresh token contre un nouveau (rotation).
+
+    L'ancien token est supprimé dans la même opération : il ne peut servir
+    qu'une seule fois. Retourne (utilisateur, nouveau refresh token),
+    ou None si le token est inconnu, déjà utilisé, révoqué ou expiré.
+    """
+    now = time.time() if now is None else now
+    record = _repository.pop(_fingerprint(token))
+    if record is None:
+        return None
+
+    user_id, expires_at = record
+    if expires_at <= now:
+        return None
+
+    # Relecture de l'utilisateur : un rôle modifié est pris en compte au prochain refresh.
+    user = get_user_by_id(user_id)
+    if user is None:
+        return None
+    return user, issue_refresh_token(user, now)
+
+
+def revoke_refresh_token(token: str) -> bool:
+    """Déconnexion : le token ne pourra plus être utilisé."""
+    return _repository.pop(_fingerprint(token)) is not None
+
+
+def revoke_user_tokens(user_id: int) -> int:
+    """Révoque toutes les sessions d'un utilisateur (ex : mot de passe compromis)."""
+    return _repository.revoke_user(user_id)
@@ -1,12 +1,29 @@
 # app/services/user_service.py
 
-from typing import List, Optional
-from werkzeug.security import generate_password_hash, check_password_hash
-from app.models.user_model import User
+import json
+from typing import Iterable, List, Optional, Tuple
 
-# Stockage en mémoire pour la démonstration.
-# Dans un vrai projet, ces opérations pointeraient vers une base de données.
-USERS: List[User] = []
+from app.dtos.auth_dto import RegisterDTO
+from app.models.user_model import User, normalize_email
+from app.services.hashing_service import bulk_hashing, check_password, hash_password, shared_hashing
+from app.repositories.user_repository import InMemoryUserRepository
+
+# Rôles acceptés lors d'un import en masse.
+USER_ROLES = ("user", "admin")
+
+# Stockage en mémoire par défaut pour la démonstration.
+# create_app() peut brancher un autre dépôt (ex : SQLite) via use_repository().
+_memory_repository = InMemoryUserRepository()
+_repository = _memory_repository
+
+
+def use_repository(repository=None) -> None:
+    """
+    Choisit le stockage utilisé par le service.
+    None → retour au stockage en mémoire par défaut.
+    """
+    global _repository
+    _repository = repository if repository is not None else _memory_repository
 
 
 def get_all_users() -> List[User]:
@@ -14,18 +31,19 @@ def get_all_users() -> List[User]:
     Retourne la liste complète des utilisateurs.
     Cette fonction n'est utilisée que pour du debug ou un futur tableau admin.
     """
-    return USERS
+    return _repository.all()
 
 
 def get_user_by_email(email: str) -> Optional[User]:
     """
     Recherche d'un utilisateur par email.
-    Insensible à la casse (lower()), ce qui évite des doublons absurdes.
+    Insensible à la casse, ce qui évite des doublons absurdes.
+    Recherche indexée par le dépôt (pas de parcours de tous les utilisateurs).
     Retourne :
       - User → trouvé
       - None → non trouvé
     """
-    return next((u for u in USERS if u.email.lower() == email.lower()), None)
+    return _repository.get_by_email(email)
 
 
 def get_user_by_id(user_id: int) -> Optional[User]:
@@ -33,7 +51,7 @@ def get_user_by_id(user_id: int) -> Optional[User]:
     Recherche d'un utilisateur par identifiant.
     Même principe que get_user_by_email, mais basé sur l'id.
     """
-    return next((u for u in USERS if u.id == user_id), None)
+    return _repository.get_by_id(user_id)
 
 
 def create_user(email: str, password: str, role: str = "user") -> User:
@@ -48,28 +66,20 @@ def create_user(email: str, password: str, role: str = "user") -> User:
     En cas d'email déjà utilisé :
       → on lève une exception ValueError, que le contrôleur transformera en 409.
     """
-    # Vérification de l'unicité de l'email
+    # Vérification de l'unicité de l'email AVANT le hachage :
+    # inutile de payer un hachage scrypt pour un email déjà pris.
     existing = get_user_by_email(email)
     if existing:
         raise ValueError("Un utilisateur avec cet email existe déjà.")
 
-    # Attribution d'un nouvel id (logique simplifiée pour la démo)
-    new_id = max((u.id for u in USERS), default=0) + 1
+    # Hash du mot de passe (indispensable pour ne jamais stocker de plain-text).
+    # Le calcul part dans le pool de hachage : HashingBusyError si saturé.
+    password_hash = hash_password(password)
 
-    # Hash du mot de passe (indispensable pour ne jamais stocker de plain-text)
-    password_hash = generate_password_hash(password)
-
-    # Création du User (model)
-    user = User(
-        id=new_id,
-        email=email,
-        password_hash=password_hash,
-        role=role
-    )
-
-    # Enregistrement dans la "table" en mémoire
-    USERS.append(user)
-    return user
+    # Enregistrement dans le dépôt, qui attribue l'id.
+    # Le dépôt revérifie l'unicité : deux inscriptions simultanées
+    # ne peuvent pas créer deux comptes avec le même email.
+    return _repository.add(email=email, password_hash=password_hash, role=role)
 
 
 def verify_credentials(email: str, password: str) -> Optional[User]:
@@ -79,7 +89,7 @@ def verify_credentials(email: str, password: str) -> Optional[User]:
       1. Récupération de l'utilisateur via l'email.
       2. Comparaison du mot de passe fourni avec le hash stocké.
     
-    check_password_hash() s'occupe de :
+    check_password() (pool de hachage, voir hashing_service) s'occupe de :
       - reproduire le hash du mot de passe entré,
       - le comparer au hash enregistré,
       - gérer les attaques usuelles (timing, salts internes…).
@@ -92,7 +102,92 @@ def verify_credentials(email: str, password: str) -> Optional[User]:
     if not user:
         return None
 
-    if not check_password_hash(user.password_hash, password):
+    if not check_password(user.password_hash, password):
         return None
 
     return user
+
+
+def _parse_import_line(raw: str | bytes) -> Tuple[Optional[Tuple[str, str, str]], Optional[dict]]:
+    """
+    Une ligne NDJSON → (email, password, role) validés par RegisterDTO, ou une erreur.
+    'role' est facultatif ("user" par défaut).
+    """
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None, {"error": "JSON invalide"}
+    if not isinstance(data, dict):
+        return None, {"error": "Un objet JSON est attendu"}
+
+    dto, err = RegisterDTO.from_json(data)
+    if err:
+        return None, err
+
+    role = data.get("role", "user")
+    if role not in USER_ROLES:
+        return None, {"error": f"Rôle inconnu : {role!r} (attendu : {', '.join(USER_ROLES)})"}
+    return (dto.email, dto.password, role), None
+
+
+def import_users(
+    lines: Iterable[str | bytes],
+    workers: Optional[int] = None,
+    batch_size: int = 1000,
+    shared_pool: bool = False,
+) -> Tuple[int, List[dict]]:
+    """
+    Import en masse d'utilisateurs depuis du NDJSON (un objet JSON par ligne) :
+      {"email": "...", "password": "...", "confirmPassword": "...", "role": "user"}
+
+    Par lot de batch_size lignes :
+      1. validation (RegisterDTO) et élimination des doublons (fichier + base),
+         AVANT le hachage pour ne pas payer un hachage inutile,
+      2. hachage en parallèle : sur tous les cœurs (bulk_hashing, commande CLI)
+         ou, avec shared_pool=True (requête HTTP), sur le pool borné du login
+         (shared_hashing : un import à la fois, HashingBusyError sinon),
+      3. insertion du lot en une fois dans le dépôt (add_many).
+
+    Les lignes vides sont ignorées.
+    Retour : (nombre d'utilisateurs créés, erreurs [{"line": n, ...}]).
+    """
+    imported = 0
+    errors: List[dict] = []
+    seen: set[str] = set()
+
+    hashing = shared_hashing() if shared_pool else bulk_hashing(workers)
+    with hashing as hash_many:
+        def flush(batch: List[Tuple[int, Tuple[str, str, str]]]) -> int:
+            hashes = hash_many([password for _, (_, password, _) in batch])
+            rows = [(email, password_hash, role) for (_, (email, _, role)), password_hash in zip(batch, hashes)]
+            created = 0
+            for (line_no, (email, _, _)), user in zip(batch, _repository.add_many(rows)):
+                if user is None:
+                    errors.append({"line": line_no, "error": "Un utilisateur avec cet email existe déjà."})
+                else:
+                    created += 1
+            return created
+
+        batch: List[Tuple[int, Tuple[str, str, str]]] = []
+        for line_no, raw in enumerate(lines, start=1):
+            if not raw.strip():
+                continue
+            row, err = _parse_import_line(raw)
+            if err:
+                errors.append({"line": line_no, **err})
+                continue
+
+            key = normalize_email(row[0])
+            if key in seen or get_user_by_email(row[0]):
+                errors.append({"line": line_no, "error": "Un utilisateur avec cet email existe déjà."})
+                continue
+            seen.add(key)
+
+            batch.append((line_no, row))
+            if len(batch) >= batch_size:
+                imported += flush(batch)
+                batch = []
+        if batch:
+            imported += flush(batch)
+
+    return imported, errors
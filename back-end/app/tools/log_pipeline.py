@@ -0,0 +1,134 @@
+# app/tools/log_pipeline.py
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Attributs standards d'un LogRecord : tout le reste vient de "extra=" et part dans le JSON.
+_STANDARD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par log : facile à filtrer / agréger (ELK, Loki, CloudWatch…).
+      {"ts": ..., "level": "INFO", "logger": "app", "message": "request", "method": "GET", ...}
+    Les champs passés via logger.info(..., extra={...}) sont ajoutés tels quels.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler qui ne bloque JAMAIS le thread de requête.
+
+      - file bornée : si le thread d'écriture ne suit plus, les logs en trop
+        sont jetés (et comptés) plutôt que de ralentir les requêtes ou la mémoire,
+      - prepare() ne formate rien : le formatage JSON est fait par le thread
+        d'arrière-plan (QueueListener), pas pendant la requête.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Écrit toujours sur le sys.stdout du moment (redirigé par Docker, pytest…)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+class LogPipeline:
+    """
+    Chaîne de logs non bloquante :
+      requête → DroppingQueueHandler → file bornée → QueueListener (thread) → stdout (JSON)
+
+    Une chaîne par app (app.extensions["log_pipeline"]), dimensionnée par SA config
+    (LOG_QUEUE_SIZE). Le logger "app" étant partagé par nom entre les apps d'un même
+    processus (cas des tests), brancher une nouvelle chaîne arrête la précédente (attach).
+    """
+
+    def __init__(self, max_queue: int = 10_000, output: Optional[logging.Handler] = None) -> None:
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max_queue)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.output = output or _StdoutHandler()
+        self.output.setFormatter(JsonFormatter())
+        self.listener = QueueListener(self.queue, self.output, respect_handler_level=True)
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+        self._started = True
+        self.listener.start()
+        atexit.register(self.stop)
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def count_sampled_out(self) -> None:
+        """Requête rapide et réussie non journalisée (échantillonnage)."""
+        with self._lock:
+            self.sampled_out += 1
+
+    def stop(self) -> None:
+        """Vide la file (logs encore en attente) puis arrête le thread. Sans effet la 2e fois."""
+        with self._lock:
+            started, self._started = self._started, False
+        if started:
+            self.listener.stop()
+            atexit.unregister(self.stop)
+
+
+# Chaîne branchée sur chaque logger (par nom).
+_attached: Dict[str, LogPipeline] = {}
+_attached_lock = threading.Lock()
+
+
+def attach(logger: logging.Logger, pipeline: LogPipeline) -> None:
+    """
+    Remplace les handlers du logger par la file de la chaîne.
+    (Flask attache par défaut un StreamHandler synchrone sur stderr : on le retire.)
+    Le niveau du logger n'est pas touché : il reste celui de la configuration (LOG_LEVEL).
+    La chaîne précédemment branchée sur ce logger est vidée puis arrêtée.
+    """
+    with _attached_lock:
+        previous = _attached.get(logger.name)
+        _attached[logger.name] = pipeline
+    logger.handlers = [pipeline.handler]
+    logger.propagate = False
+    if previous is not None and previous is not pipeline:
+        previous.stop()
@@ -1,10 +1,12 @@
 # app/middlewares/auth_middleware.py
 
 from functools import wraps
-from typing import Callable, Any
+from types import MappingProxyType
+from typing import Callable, Any, Mapping
 
-from flask import request, jsonify
+from flask import g, request, jsonify
 from app.tools.jwt_utils import verify_access_token
+from app.tools.token_cache import token_cache
 
 
 def _extract_token_from_header() -> tuple[str | None, dict | None]:
@@ -25,6 +27,39 @@ def _extract_token_from_header() -> tuple[str | None, dict | None]:
     return token, None
 
 
+def _authenticate() -> tuple[Mapping[str, Any] | None, dict | None]:
+    """
+    Renvoie le payload du JWT de la requête courante, ou une erreur.
+
+    Trois niveaux, du plus rapide au plus coûteux :
+      1. g.jwt_payload : déjà décodé pendant CETTE requête (ex : deux décorateurs empilés),
+      2. token_cache : même token déjà vérifié lors d'une requête précédente,
+      3. verify_access_token : vérification complète (signature HMAC + expiration).
+
+    Le payload est en lecture seule (MappingProxyType) : celui du cache est
+    partagé par toutes les requêtes qui envoient le même token.
+    """
+    payload = g.get("jwt_payload")
+    if payload is not None:
+        return payload, None
+
+    token, err = _extract_token_from_header()
+    if err:
+        return None, err
+
+    payload = token_cache.get(token)
+    if payload is None:
+        payload, verif_err = verify_access_token(token)
+        if verif_err:
+            return None, verif_err
+        payload = MappingProxyType(payload)
+        token_cache.put(token, payload)
+
+    # Le payload est gardé pour la suite de la requête (contrôleurs, autres décorateurs).
+    g.jwt_payload = payload
+    return payload, None
+
+
 def require_auth(f: Callable) -> Callable:
     """
     Middleware placé devant une route pour vérifier qu’il y a bien un utilisateur connecté.
@@ -42,20 +77,14 @@ def require_auth(f: Callable) -> Callable:
 
     @wraps(f)
     def wrapper(*args: Any, **kwargs: Any):
-        # On tente de récupérer le token envoyé par le client
-        token, err = _extract_token_from_header()
+        # Récupération + vérification du JWT (signature + expiration),
+        # avec cache des tokens déjà validés.
+        # Le payload est disponible ensuite dans g.jwt_payload
+        # (pratique pour savoir qui est connecté dans le contrôleur).
+        payload, err = _authenticate()
         if err:
             return jsonify(err), 401
 
-        # Vérification du JWT (signature + expiration)
-        payload, verif_err = verify_access_token(token)
-        if verif_err:
-            return jsonify(verif_err), 401
-
-        # Ici, on pourrait garder le payload dans request
-        # (pratique pour savoir qui est connecté dans le contrôleur)
-        # request.user = payload
-
         # L’utilisateur a passé le contrôle → la vraie route peut tourner
         return f(*args, **kwargs)
 
@@ -78,15 +107,11 @@ def require_role(required_role: str) -> Callable:
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args: Any, **kwargs: Any):
-            # Même logique d’auth que require_auth
-            token, err = _extract_token_from_header()
+            # Même logique d’auth que require_auth (et même décodage partagé via g)
+            payload, err = _authenticate()
             if err:
                 return jsonify(err), 401
 
-            payload, verif_err = verify_access_token(token)
-            if verif_err:
-                return jsonify(verif_err), 401
-
             # On regarde le rôle indiqué dans le JWT
             role = payload.get("role")
 
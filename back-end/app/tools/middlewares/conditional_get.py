@@ -0,0 +1,59 @@
+# app/tools/middlewares/conditional_get.py
+
+import hashlib
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Response, make_response, request
+
+
+def query_etag(prefix: str, version: int) -> str:
+    """
+    Construit un ETag fort pour une ressource dont le contenu dépend
+    d'un numéro de version ET des paramètres d'URL (limit, cursor, q…).
+    Deux URLs différentes donnent deux représentations différentes,
+    donc deux ETags différents.
+    La valeur est renvoyée sans guillemets (set_etag les ajoute).
+    """
+    if not request.query_string:
+        return f"{prefix}-{version}"
+    digest = hashlib.blake2b(request.query_string, digest_size=8).hexdigest()
+    return f"{prefix}-{version}-{digest}"
+
+
+def conditional_get(etag_for: Callable[..., str | None]) -> Callable:
+    """
+    Middleware de GET conditionnel (ETag / If-None-Match).
+
+    Principe :
+    ---------------------
+    etag_for(...) calcule l'ETag à partir d'un simple compteur de version,
+    AVANT d'exécuter la route. Si le client possède déjà cette version
+    (en-tête If-None-Match), on répond 304 tout de suite :
+    aucune lecture du catalogue, aucune sérialisation.
+
+    Sinon la route s'exécute normalement et on ajoute l'en-tête ETag
+    à la réponse 200 pour que le client puisse le renvoyer la prochaine fois.
+
+    etag_for reçoit les mêmes arguments que la route et peut renvoyer None
+    (ex : livre inexistant) : dans ce cas, pas de cache conditionnel.
+    """
+
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def wrapper(*args: Any, **kwargs: Any):
+            etag = etag_for(*args, **kwargs)
+
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                not_modified = Response(status=304)
+                not_modified.set_etag(etag)
+                return not_modified
+
+            response = make_response(f(*args, **kwargs))
+            if etag is not None and response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,79 @@
+# app/tools/middlewares/login_rate_limit.py
+
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Flask, current_app, jsonify, request
+
+from app.models.user_model import normalize_email
+from app.tools.rate_limiter import TokenBucketLimiter, retry_after_header
+
+
+def init_login_rate_limit(app: Flask) -> None:
+    """
+    Crée les deux limiteurs du login à partir de la config Flask :
+      - par adresse IP : LOGIN_RATE_PER_IP jetons / minute, rafale LOGIN_BURST_PER_IP,
+      - par email (normalisé) : LOGIN_RATE_PER_EMAIL / minute, rafale LOGIN_BURST_PER_EMAIL.
+
+    Chaque worker a ses propres compteurs (limiteur en mémoire du processus).
+    """
+    app.extensions["login_rate_limit"] = {
+        "ip": TokenBucketLimiter(
+            rate=float(app.config["LOGIN_RATE_PER_IP"]) / 60,
+            burst=int(app.config["LOGIN_BURST_PER_IP"]),
+        ),
+        "email": TokenBucketLimiter(
+            rate=float(app.config["LOGIN_RATE_PER_EMAIL"]) / 60,
+            burst=int(app.config["LOGIN_BURST_PER_EMAIL"]),
+        ),
+    }
+
+
+def _email_key(data: Any) -> str | None:
+    if not isinstance(data, dict):
+        return None
+    email = data.get("email")
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return normalize_email(email)
+
+
+def login_rate_limit(f: Callable) -> Callable:
+    """
+    Middleware placé devant le login.
+
+    Pourquoi ?
+    ---------------------
+    Chaque login exécute un check_password_hash (scrypt, coûteux en CPU).
+    Une rafale de tentatives (credential stuffing) suffit à saturer le serveur.
+    On refuse donc AVANT tout hachage :
+      - trop de tentatives depuis la même IP,
+      - ou trop de tentatives sur le même compte (email), quelle que soit l'IP.
+
+    Réponse : 429 + Retry-After (secondes avant la prochaine tentative possible).
+    """
+
+    @wraps(f)
+    def wrapper(*args: Any, **kwargs: Any):
+        limiters = current_app.extensions.get("login_rate_limit")
+        if limiters is None:
+            return f(*args, **kwargs)
+
+        # get_json(silent=True) : un corps invalide est laissé au contrôleur (400).
+        # Le JSON est mis en cache par Flask : il n'est pas relu par le contrôleur.
+        keys = [("ip", request.remote_addr or "unknown")]
+        email = _email_key(request.get_json(silent=True))
+        if email:
+            keys.append(("email", email))
+
+        for name, key in keys:
+            wait = limiters[name].hit(key)
+            if wait > 0:
+                response = jsonify({"error": "Trop de tentatives de connexion, réessayez plus tard."})
+                response.status_code = 429
+                response.headers["Retry-After"] = retry_after_header(wait)
+                return response
+
+        return f(*args, **kwargs)
+
+    return wrapper
@@ -1,50 +1,173 @@
 # app/middlewares/request_logging.py
 
+import logging
+import random
 import time
 from flask import Flask, request, g
 
+from app.services.hashing_service import hashing_stats
+from app.tools.log_pipeline import LogPipeline, attach
+from app.tools.metrics import MetricsRegistry
+from app.tools.token_cache import token_cache
+
+# Label "route" des requêtes qui ne correspondent à aucune route (404).
+# On n'utilise jamais le chemin brut : /api/books/1, /api/books/2… créeraient
+# une série de métriques par id (explosion de cardinalité).
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_label() -> str:
+    """Modèle de route Flask (ex : /api/books/<int:id>), pas le chemin réel."""
+    rule = request.url_rule
+    return rule.rule if rule is not None else UNMATCHED_ROUTE
+
+
+def _auth_stats():
+    """Statistiques des sous-systèmes d'authentification, lues au moment du scrape."""
+    cache = token_cache.stats()
+    yield "jwt_cache_hits_total", "counter", "Tokens JWT servis par le cache.", cache["hits"]
+    yield "jwt_cache_misses_total", "counter", "Tokens JWT vérifiés entièrement.", cache["misses"]
+    yield "jwt_cache_evictions_total", "counter", "Entrées évincées du cache JWT (LRU).", cache["evictions"]
+    yield "jwt_cache_size", "gauge", "Tokens JWT en cache.", cache["size"]
+
+    hashing = hashing_stats()
+    yield "password_hash_in_flight", "gauge", "Hachages en cours ou en attente.", hashing["in_flight"]
+    yield "password_hash_queue_depth", "gauge", "Hachages en attente d'un processus libre.", hashing["queue_depth"]
+    yield "password_hash_completed_total", "counter", "Hachages terminés.", hashing["completed"]
+    yield "password_hash_rejected_total", "counter", "Hachages refusés (file pleine, 503).", hashing["rejected"]
+    yield "password_hash_latency_seconds_avg", "gauge", "Latence moyenne d'un hachage.", hashing["avg_latency_seconds"]
+    yield "password_hash_wait_seconds_avg", "gauge", "Attente moyenne dans la file.", hashing["avg_wait_seconds"]
+
 
 def register_request_logging(app: Flask) -> None:
     """
-    Active deux hooks Flask qui tournent autour de chaque requête.
-    L’idée générale : mesurer combien de temps une requête met
-    et garder une petite trace dans les logs du serveur.
+    Active trois hooks Flask qui tournent autour de chaque requête.
+    L’idée générale : mesurer combien de temps une requête met,
+    garder une petite trace dans les logs du serveur,
+    et alimenter les métriques exposées sur /metrics (format Prometheus) :
+      - http_requests_total : nombre de requêtes par méthode / route / statut,
+      - http_request_duration_seconds : histogramme des latences par route,
+      - http_requests_in_flight : requêtes en cours de traitement.
+
+    Les métriques sont propres à l'app (app.extensions["metrics"])
+    et donc à chaque worker en mode multi-processus.
+
+    Les logs passent par une file (voir log_pipeline) : le thread de requête
+    ne fait qu'y déposer l'enregistrement, l'écriture JSON se fait en arrière-plan.
+    Échantillonnage (LOG_SAMPLE_RATE) : seule une fraction des requêtes rapides
+    et réussies est journalisée ; les erreurs (statut >= 400) et les requêtes
+    lentes (>= LOG_SLOW_MS) le sont toujours.
+    Les lignes INFO n'apparaissent que si LOG_LEVEL (ou la config de logging) le permet,
+    et rien n'est journalisé quand app.testing est actif (sortie de pytest lisible).
     """
+    pipeline = LogPipeline(max_queue=int(app.config["LOG_QUEUE_SIZE"]))
+    attach(app.logger, pipeline)
+    app.extensions["log_pipeline"] = pipeline
+    if app.config["LOG_LEVEL"]:
+        app.logger.setLevel(app.config["LOG_LEVEL"])
+    sample_rate = float(app.config["LOG_SAMPLE_RATE"])
+    slow_seconds = float(app.config["LOG_SLOW_MS"]) / 1000
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter(
+        "http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status")
+    )
+    duration = registry.histogram(
+        "http_request_duration_seconds", "Durée de traitement des requêtes HTTP.", ("method", "route")
+    )
+    in_flight = registry.gauge("http_requests_in_flight", "Requêtes HTTP en cours de traitement.")
+    in_flight.set(value=0)
+    registry.add_collector(_auth_stats)
+
+    def _login_rate_limit_stats():
+        for key, limiter in app.extensions.get("login_rate_limit", {}).items():
+            yield f"login_rate_limited_{key}_total", "counter", f"Logins refusés (429) par {key}.", limiter.stats()["rejected"]
+
+    registry.add_collector(_login_rate_limit_stats)
+
+    def _log_stats():
+        yield "log_records_dropped_total", "counter", "Logs jetés (file pleine).", pipeline.dropped
+        yield "log_records_sampled_out_total", "counter", "Requêtes non journalisées (échantillonnage).", pipeline.sampled_out
+        yield "log_queue_size", "gauge", "Logs en attente d'écriture.", pipeline.queue.qsize()
+
+    registry.add_collector(_log_stats)
+    app.extensions["metrics"] = registry
 
     @app.before_request
     def start_timer():
         """
         Fonction exécutée AVANT que la route ne démarre réellement.
-        On note juste l’heure actuelle pour pouvoir calculer la durée après.
+        On note juste l’instant actuel pour pouvoir calculer la durée après.
         On utilise 'g' parce que c’est un espace de stockage propre à une seule requête.
+
+        perf_counter() plutôt que time.time() : horloge monotone et précise,
+        insensible aux changements d'heure du système.
         """
-        g.start_time = time.time()
+        g.start_time = time.perf_counter()
+        in_flight.inc()
 
     @app.after_request
     def log_request(response):
         """
         Fonction exécutée APRÈS l’exécution de la route.
-        On récupère l’heure de départ, on calcule la différence,
-        et on envoie une ligne dans les logs.
-        
+        On récupère l’instant de départ, on calcule la différence,
+        on met à jour les métriques et on envoie une ligne dans les logs.
+
         Ce n’est pas pour le front : c’est vraiment pour le dev,
         pour voir ce qui se passe en coulisses et combien de temps les endpoints prennent.
         """
 
         # Si jamais start_time n'a pas été mis (edge case rare), on évite un crash
-        duration_ms = -1
-        if hasattr(g, "start_time"):
-            duration_ms = (time.time() - g.start_time) * 1000
+        if not hasattr(g, "start_time"):
+            return response
+        elapsed = time.perf_counter() - g.start_time
 
         method = request.method
-        path = request.path
+        route = _route_label()
         status_code = response.status_code
 
-        # Petite ligne sympa dans les logs, du genre :
-        # [REQUEST] GET /api/books -> 200 (5.32 ms)
-        app.logger.info(
-            f"[REQUEST] {method} {path} -> {status_code} ({duration_ms:.2f} ms)"
+        requests_total.inc(method, route, str(status_code))
+        duration.observe(elapsed, method, route)
+
+        if app.testing:
+            return response
+
+        # Erreurs et requêtes lentes : toujours gardées.
+        # Le reste : une requête sur 1 / LOG_SAMPLE_RATE en moyenne.
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400 or elapsed >= slow_seconds:
+            level = logging.WARNING
+        elif not app.logger.isEnabledFor(logging.INFO):
+            return response
+        elif sample_rate >= 1 or random.random() < sample_rate:
+            level = logging.INFO
+        else:
+            pipeline.count_sampled_out()
+            return response
+
+        # Log structuré (une ligne JSON), du genre :
+        # {"message": "request", "method": "GET", "path": "/api/books", "status": 200, "duration_ms": 5.32, ...}
+        app.logger.log(
+            level,
+            "request",
+            extra={
+                "method": method,
+                "route": route,
+                "path": request.path,
+                "status": status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+            },
         )
 
         # after_request doit toujours renvoyer la réponse finale
         return response
+
+    @app.teardown_request
+    def end_request(exc):
+        """
+        Exécutée dans tous les cas, même si la route a levé une exception :
+        le compteur de requêtes en cours ne peut pas rester bloqué.
+        """
+        if g.pop("start_time", None) is not None:
+            in_flight.dec()
@@ -0,0 +1,95 @@
+# app/tools/middlewares/request_profiling.py
+
+import cProfile
+import os
+from itertools import count
+
+from flask import Flask, g, request
+
+from app.tools.profiling import PROFILE_HEADER, ProfileStore, verify_profile_header
+
+
+class ProfilingSettings:
+    """
+    Réglages modifiables à chaud par un admin (POST /api/admin/profiling) :
+      - always : profiler TOUTES les requêtes (à ne laisser actif que quelques minutes),
+      - sample_every : profiler une requête sur N (0 = jamais).
+    """
+
+    def __init__(self, store: ProfileStore, secret: str | None, sample_every: int) -> None:
+        self.store = store
+        self.secret = secret
+        self.always = False
+        self.sample_every = sample_every
+        self._counter = count(1)
+
+    def to_dict(self) -> dict:
+        return {
+            "always": self.always,
+            "sample_every": self.sample_every,
+            "signed_header": self.secret is not None,
+            "max_files": self.store.max_files,
+        }
+
+    def should_profile(self) -> bool:
+        """Du moins coûteux au plus coûteux : drapeau admin, échantillonnage, en-tête signé."""
+        if self.always:
+            return True
+        if self.sample_every and next(self._counter) % self.sample_every == 0:
+            return True
+        header = request.headers.get(PROFILE_HEADER)
+        return bool(header and self.secret and verify_profile_header(self.secret, header))
+
+
+def register_request_profiling(app: Flask) -> None:
+    """
+    Profilage cProfile d'une requête, à la demande, pour voir où passe le temps
+    (contrôleur, DTO, service, dépôt…) sur un endpoint qui a ralenti.
+
+    Activé seulement si app.config["PROFILING_ENABLED"] est vrai : sinon
+    aucun hook n'est enregistré, donc aucun coût sur les requêtes.
+
+    Une fois activé, une requête est profilée si :
+      - l'en-tête X-Profile porte une signature HMAC valide (PROFILING_SECRET),
+      - ou un admin a activé le profilage de toutes les requêtes,
+      - ou elle tombe dans l'échantillonnage 1 sur N (PROFILING_SAMPLE_EVERY).
+
+    Les profils (.pstats) sont écrits dans PROFILING_DIR, limités à
+    PROFILING_MAX_FILES fichiers (anneau), et téléchargeables par un admin.
+    """
+    if not app.config.get("PROFILING_ENABLED"):
+        app.extensions["profiling"] = None
+        return
+
+    directory = app.config.get("PROFILING_DIR") or os.path.join(app.instance_path, "profiles")
+    settings = ProfilingSettings(
+        store=ProfileStore(directory, max_files=int(app.config["PROFILING_MAX_FILES"])),
+        secret=app.config.get("PROFILING_SECRET"),
+        sample_every=int(app.config["PROFILING_SAMPLE_EVERY"]),
+    )
+    app.extensions["profiling"] = settings
+
+    @app.before_request
+    def start_profiler():
+        if not settings.should_profile():
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Un seul profileur actif à la fois (Python >= 3.12) :
+            # une autre requête est déjà profilée, on ne profile pas celle-ci.
+            return
+        g.profiler = profiler
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        """teardown : le profileur est arrêté même si la route a levé une exception."""
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        rule = request.url_rule
+        path = settings.store.path_for(request.method, rule.rule if rule is not None else request.path)
+        profiler.dump_stats(path)
+        settings.store.added()
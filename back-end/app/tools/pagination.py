@@ -0,0 +1,29 @@
+# app/tools/pagination.py
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """
+    Transforme une position de pagination (ex : {"after": 42}) en curseur opaque.
+    Le front n'a pas à comprendre son contenu : il le renvoie tel quel
+    dans ?cursor= pour obtenir la page suivante.
+    """
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """
+    Opération inverse d'encode_cursor.
+    Retourne None si le curseur est illisible (modifié à la main, tronqué…).
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    return position if isinstance(position, dict) else None
@@ -0,0 +1,100 @@
+# app/tools/profiling.py
+
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from itertools import count
+from typing import Dict, List, Optional
+
+# En-tête qui déclenche le profilage d'une requête : "X-Profile: <expiration>:<signature>"
+PROFILE_HEADER = "X-Profile"
+
+# Noms de fichiers acceptés au téléchargement (aucun chemin, aucun "..").
+_PROFILE_NAME = re.compile(r"^[0-9]+-[A-Z]+-[A-Za-z0-9_]*\.pstats$")
+
+
+def sign_profile_header(secret: str, ttl: int = 300, now: Optional[float] = None) -> str:
+    """
+    Construit la valeur de l'en-tête X-Profile, valable ttl secondes.
+    Utilisé par l'équipe (script, curl) pour profiler une requête précise en production :
+      curl -H "X-Profile: $(python -c '...sign_profile_header(secret)')" https://.../api/books
+    """
+    expires = int((time.time() if now is None else now) + ttl)
+    signature = hmac.new(secret.encode("utf-8"), str(expires).encode("ascii"), hashlib.sha256).hexdigest()
+    return f"{expires}:{signature}"
+
+
+def verify_profile_header(secret: str, value: str, now: Optional[float] = None) -> bool:
+    """Signature HMAC valide et non expirée (comparaison à temps constant)."""
+    expires, _, signature = value.partition(":")
+    # isascii() d'abord : isdigit() accepte aussi "²" ou "١٢٣", que int() / encode("ascii") refusent.
+    if not (expires.isascii() and expires.isdigit()) or int(expires) < (time.time() if now is None else now):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), expires.encode("ascii"), hashlib.sha256).hexdigest()
+    return signature.isascii() and hmac.compare_digest(expected, signature)
+
+
+class ProfileStore:
+    """
+    Anneau de profils sur disque : au plus max_files fichiers .pstats,
+    les plus anciens sont supprimés quand on en ajoute un nouveau.
+
+    Un fichier .pstats s'ouvre avec :
+      python -m pstats fichier.pstats
+      snakeviz fichier.pstats (visualisation)
+    """
+
+    def __init__(self, directory: str, max_files: int = 50) -> None:
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._seq = count()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, method: str, route: str) -> str:
+        """
+        Nom du prochain profil : <horodatage ns>-<méthode>-<route simplifiée>.pstats
+        (ex : 1718000000000000000-GET-_api_books_int_id.pstats)
+        """
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route)[:60]
+        stamp = time.time_ns() + next(self._seq)  # unique même pour deux profils simultanés
+        return os.path.join(self.directory, f"{stamp}-{method.upper()}-{slug}.pstats")
+
+    def added(self) -> None:
+        """À appeler après l'écriture d'un profil : applique la limite de l'anneau."""
+        with self._lock:
+            names = self._names()
+            for name in names[: max(0, len(names) - self.max_files)]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict[str, object]]:
+        """Profils disponibles, du plus récent au plus ancien."""
+        profiles = []
+        for name in reversed(self._names()):
+            try:
+                size = os.path.getsize(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # supprimé entre-temps par l'anneau
+            stamp, method, route = name[: -len(".pstats")].split("-", 2)
+            profiles.append(
+                {"name": name, "created": int(stamp) / 1e9, "method": method, "route": route, "size": size}
+            )
+        return profiles
+
+    def path(self, name: str) -> Optional[str]:
+        """Chemin d'un profil existant, ou None (nom invalide ou inconnu)."""
+        if not _PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def _names(self) -> List[str]:
+        # L'horodatage en tête du nom : tri numérique = ordre chronologique.
+        names = [n for n in os.listdir(self.directory) if _PROFILE_NAME.match(n)]
+        return sorted(names, key=lambda n: int(n.split("-", 1)[0]))
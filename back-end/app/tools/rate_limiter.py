@@ -0,0 +1,80 @@
+# app/tools/rate_limiter.py
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class TokenBucketLimiter:
+    """
+    Limiteur "seau à jetons" (token bucket), une clé = un seau.
+
+    Principe :
+      - chaque seau contient au plus 'burst' jetons,
+      - il se remplit de 'rate' jetons par seconde,
+      - chaque requête consomme un jeton ; seau vide → requête refusée.
+
+    Mémoire bornée :
+      - au plus 'max_keys' seaux (les moins récemment utilisés sont évincés),
+      - un seau inactif assez longtemps pour être de nouveau plein
+        ne sert plus à rien : il est supprimé (éviction des inactifs).
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate doit être > 0 et burst >= 1.")
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # Temps pour qu'un seau vide redevienne plein : au-delà, il est "inactif".
+        self.idle_after = burst / rate
+        # clé → (jetons restants, date de dernière mise à jour)
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Consomme un jeton pour 'key'.
+        Retour :
+          - 0 → requête autorisée,
+          - > 0 → requête refusée, nombre de secondes avant le prochain jeton.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._evict_idle(now)
+
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+            if tokens >= 1:
+                retry_after = 0.0
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+                self.rejected += 1
+
+            # Réinsertion en fin : l'OrderedDict reste trié du plus ancien au plus récent.
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def _evict_idle(self, now: float) -> None:
+        # Les plus anciens sont en tête : on s'arrête au premier seau encore actif.
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.idle_after:
+                break
+            del self._buckets[key]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"keys": len(self._buckets), "max_keys": self.max_keys, "rejected": self.rejected}
+
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After attend un nombre entier de secondes (arrondi au-dessus)."""
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,70 @@
+# app/tools/server.py
+
+import os
+import signal
+import socket
+
+from werkzeug.serving import make_server
+
+
+def serve_multiprocess(host: str, port: int, workers: int, config: dict | None = None) -> None:
+    """
+    Lance 'workers' processus qui servent l'API sur le même port (modèle "pre-fork").
+
+    Déroulé :
+      1. le processus parent ouvre la socket d'écoute une seule fois,
+      2. il se duplique (fork) : chaque enfant hérite de la socket,
+      3. chaque enfant crée SA propre app (create_app) APRÈS le fork,
+         avec le stockage "mmap" pour les livres : tous partagent le même catalogue,
+      4. le noyau répartit les connexions entrantes entre les enfants.
+
+    Le parent se contente d'attendre ; Ctrl+C / SIGTERM arrête tous les workers.
+    Disponible uniquement sur les systèmes POSIX (os.fork).
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Le mode multi-processus nécessite os.fork (Linux, macOS, Docker).")
+
+    # Import local : app/__init__.py n'a pas à connaître ce module.
+    from app import create_app
+
+    listener = socket.create_server((host, port), backlog=1024)
+    listener.set_inheritable(True)
+    worker_config = {"STORAGE_BACKEND": "mmap", **(config or {})}
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Processus enfant : il ne sort jamais de ce bloc.
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                app = create_app(worker_config)
+                server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                code = 1
+                raise
+            finally:
+                os._exit(code)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for child in children:
+            os.waitpid(child, 0)
+    except KeyboardInterrupt:
+        stop(signal.SIGINT, None)
+        for child in children:
+            os.waitpid(child, 0)
+    finally:
+        listener.close()
@@ -0,0 +1,89 @@
+# app/tools/token_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+
+class TokenCache:
+    """
+    Cache LRU borné : token JWT → payload déjà vérifié.
+
+    Pourquoi ?
+    ---------------------
+    Le front renvoie le même token des milliers de fois par heure.
+    Vérifier la signature (HMAC) et décoder le JSON à chaque requête est inutile :
+    une fois un token validé, son contenu ne change plus.
+
+    Règles :
+      - seuls les tokens VALIDES sont mis en cache (un token invalide ne coûte rien en mémoire),
+      - une entrée n'est jamais servie après l'expiration ('exp') du token,
+      - au-delà de max_size entrées, on évince la moins récemment utilisée,
+      - un payload en cache est partagé par toutes les requêtes du même token :
+        il est donc stocké en lecture seule (MappingProxyType). Un contrôleur qui
+        modifierait g.jwt_payload lève TypeError au lieu de changer ce que voient
+        les requêtes suivantes.
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[Mapping[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Mapping[str, Any]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= now:
+                # Le token a expiré depuis sa mise en cache : on l'oublie,
+                # la vérification complète renverra "Token expiré."
+                del self._entries[token]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: Mapping[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return  # pas d'expiration connue → on ne prend pas le risque de le garder
+        if not isinstance(payload, MappingProxyType):
+            payload = MappingProxyType(dict(payload))  # copie : l'appelant garde son dict
+        with self._lock:
+            self._entries[token] = (payload, float(expires_at))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs utiles pour régler max_size (taux de succès, évictions…)."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Instance partagée par les middlewares d'authentification.
+token_cache = TokenCache()
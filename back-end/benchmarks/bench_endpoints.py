@@ -0,0 +1,472 @@
+# benchmarks/bench_endpoints.py
+# Benchmark de toutes les routes de l'API via app.test_client(), sur des catalogues
+# synthétiques de taille croissante (1k, 100k, 1M livres par défaut).
+#
+# Usage (depuis back-end/) :
+#   python -m benchmarks.bench_endpoints --sizes 1000,100000 --out bench.json
+#   python -m benchmarks.bench_endpoints --baseline bench.json --max-latency-regression 0.25
+#
+# Code de sortie 1 si une régression dépasse les seuils par rapport à la référence (--baseline).
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app import create_app
+from app.controllers.book_controller import LOOKUP_MAX_IDS
+from app.repositories.book_repository import BookRepository
+from app.repositories.compact_book_repository import CompactBookRepository
+from app.repositories.user_repository import InMemoryUserRepository, SQLiteUserRepository
+from app.services import book_service, user_service
+from app.tools.jwt_utils import create_access_token
+from app.tools.pagination import encode_cursor
+from app.tools.profiling import PROFILE_HEADER, sign_profile_header
+from benchmarks.catalog import BENCH_PASSWORD, generate_books, generate_users, search_terms, users_for
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# Réglages de l'app pendant le benchmark : on mesure l'API, pas les garde-fous.
+#   - hachage dans le thread de requête (pas de file → pas de 503),
+#   - limiteur de login désactivé en pratique,
+#   - logs de requêtes non échantillonnés (pas d'écriture sur stdout),
+#   - profilage activé (routes admin mesurées), déclenché seulement par l'en-tête signé.
+BENCH_CONFIG = {
+    "PASSWORD_HASH_WORKERS": 0,
+    "PASSWORD_HASH_QUEUE": 1_000,
+    "LOGIN_RATE_PER_IP": 1e9,
+    "LOGIN_BURST_PER_IP": 10**9,
+    "LOGIN_RATE_PER_EMAIL": 1e9,
+    "LOGIN_BURST_PER_EMAIL": 10**9,
+    "LOG_SAMPLE_RATE": 0,
+    "LOG_SLOW_MS": 1e9,
+    "PROFILING_ENABLED": True,
+    "PROFILING_SECRET": "bench-profiling-secret",
+}
+
+BULK_SIZE = 100
+LOOKUP_SIZE = 50
+IMPORT_SIZE = 10
+
+
+# region Contexte
+@dataclass
+class BenchContext:
+    """État partagé par les scénarios d'une taille de catalogue."""
+
+    size: int
+    book_ids: List[int]
+    user_count: int
+    words: List[str]
+    authors: List[str]
+    admin_headers: Dict[str, str]
+    rng: random.Random = field(default_factory=lambda: random.Random(1))
+    created: List[int] = field(default_factory=list)
+    bulk_created: List[int] = field(default_factory=list)
+    refresh_tokens: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    registered: int = 0
+    imported: int = 0
+    profile: Optional[str] = None
+
+    def book_id(self) -> int:
+        return self.rng.choice(self.book_ids)
+
+    def user_email(self) -> str:
+        return f"bench{self.rng.randrange(self.user_count)}@example.com"
+# endregion
+
+
+# region Scénarios
+@dataclass
+class Scenario:
+    """
+    Une route à mesurer.
+      - heavy : requête coûteuse (liste complète, lookup de LOOKUP_MAX_IDS ids,
+        import avec hachage…) → moins d'itérations,
+      - expect : statuts considérés comme un succès.
+    """
+
+    name: str
+    run: Callable[[FlaskClient, BenchContext], Any]
+    heavy: bool = False
+    expect: Sequence[int] = (200,)
+
+
+def _get_all(client: FlaskClient, ctx: BenchContext):
+    res = client.get("/api/books")
+    ctx.etag = res.headers.get("ETag")
+    return res
+
+
+def _stream(client: FlaskClient, ctx: BenchContext):
+    res = client.get("/api/books?stream=1")
+    res.get_data()  # on consomme tout le flux
+    return res
+
+
+def _post_book(client: FlaskClient, ctx: BenchContext):
+    res = client.post("/api/books", json={"title": "Bench", "author": "Bench Author"}, headers=ctx.admin_headers)
+    ctx.created.append(res.get_json()["id"])
+    return res
+
+
+def _delete_book(client: FlaskClient, ctx: BenchContext):
+    return client.delete(f"/api/books/{ctx.created.pop()}", headers=ctx.admin_headers)
+
+
+def _bulk_create(client: FlaskClient, ctx: BenchContext):
+    items = [{"title": f"Bulk {i}", "author": "Bulk Author"} for i in range(BULK_SIZE)]
+    res = client.post("/api/books/bulk", json=items, headers=ctx.admin_headers)
+    ctx.bulk_created.extend(book["id"] for book in res.get_json()["created"])
+    return res
+
+
+def _bulk_delete(client: FlaskClient, ctx: BenchContext):
+    ids, ctx.bulk_created = ctx.bulk_created[:BULK_SIZE], ctx.bulk_created[BULK_SIZE:]
+    return client.delete("/api/books/bulk", json={"ids": ids}, headers=ctx.admin_headers)
+
+
+def _register(client: FlaskClient, ctx: BenchContext):
+    ctx.registered += 1
+    email = f"new{ctx.size}-{ctx.registered}@example.com"
+    return client.post("/api/auth/register", json={"email": email, "password": "pw", "confirmPassword": "pw"})
+
+
+def _login(client: FlaskClient, ctx: BenchContext):
+    res = client.post("/api/auth/login", json={"email": ctx.user_email(), "password": BENCH_PASSWORD})
+    ctx.refresh_tokens.append(res.get_json()["refresh_token"])
+    return res
+
+
+def _refresh(client: FlaskClient, ctx: BenchContext):
+    res = client.post("/api/auth/refresh", json={"refresh_token": ctx.refresh_tokens.pop()})
+    ctx.refresh_tokens.append(res.get_json()["refresh_token"])
+    return res
+
+
+def _logout(client: FlaskClient, ctx: BenchContext):
+    return client.post("/api/auth/logout", json={"refresh_token": ctx.refresh_tokens.pop()})
+
+
+def _import_users(client: FlaskClient, ctx: BenchContext):
+    lines = []
+    for _ in range(IMPORT_SIZE):
+        ctx.imported += 1
+        email = f"import{ctx.size}-{ctx.imported}@example.com"
+        lines.append(json.dumps({"email": email, "password": "pw", "confirmPassword": "pw"}))
+    return client.post(
+        "/api/auth/users/import",
+        data="\n".join(lines),
+        content_type="application/x-ndjson",
+        headers=ctx.admin_headers,
+    )
+
+
+def _profiled_get(client: FlaskClient, ctx: BenchContext):
+    header = sign_profile_header(BENCH_CONFIG["PROFILING_SECRET"])
+    return client.get(f"/api/books/{ctx.book_id()}", headers={PROFILE_HEADER: header})
+
+
+def _list_profiles(client: FlaskClient, ctx: BenchContext):
+    res = client.get("/api/admin/profiles", headers=ctx.admin_headers)
+    ctx.profile = res.get_json()[0]["name"]
+    return res
+
+
+# L'ordre compte : DELETE consomme les livres créés par POST, refresh et logout les tokens
+# du login, la liste des profils suit une requête profilée (X-Profile), etc.
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /api/books", _get_all, heavy=True),
+    Scenario("GET /api/books (If-None-Match)", lambda c, ctx: c.get("/api/books", headers={"If-None-Match": ctx.etag}), expect=(304,)),
+    Scenario("GET /api/books?stream=1", _stream, heavy=True),
+    Scenario("GET /api/books?limit=50", lambda c, ctx: c.get("/api/books?limit=50")),
+    Scenario(
+        "GET /api/books?limit=50&cursor",
+        lambda c, ctx: c.get(f"/api/books?limit=50&cursor={encode_cursor({'after': ctx.book_id()})}"),
+    ),
+    Scenario("GET /api/books/<id>", lambda c, ctx: c.get(f"/api/books/{ctx.book_id()}")),
+    Scenario(
+        "GET /api/books?ids=",
+        lambda c, ctx: c.get("/api/books?ids=" + ",".join(str(ctx.book_id()) for _ in range(LOOKUP_SIZE))),
+    ),
+    Scenario(
+        "POST /api/books/lookup",
+        lambda c, ctx: c.post("/api/books/lookup", json={"ids": [ctx.book_id() for _ in range(LOOKUP_SIZE)]}),
+    ),
+    Scenario(
+        "POST /api/books/lookup (bulk)",
+        lambda c, ctx: c.post("/api/books/lookup", json={"ids": [ctx.book_id() for _ in range(LOOKUP_MAX_IDS)]}),
+        heavy=True,
+    ),
+    Scenario("GET /api/books/search?author=", lambda c, ctx: c.get(f"/api/books/search?author={ctx.rng.choice(ctx.authors)}")),
+    Scenario("GET /api/books/search?q=", lambda c, ctx: c.get(f"/api/books/search?q={ctx.rng.choice(ctx.words)}")),
+    Scenario("POST /api/books", _post_book, expect=(201,)),
+    Scenario(
+        "PUT /api/books/<id>",
+        lambda c, ctx: c.put(f"/api/books/{ctx.book_id()}", json={"title": "Put", "author": "Put Author"}, headers=ctx.admin_headers),
+    ),
+    Scenario(
+        "PATCH /api/books/<id>",
+        lambda c, ctx: c.patch(f"/api/books/{ctx.book_id()}", json={"title": "Patch"}, headers=ctx.admin_headers),
+    ),
+    Scenario("DELETE /api/books/<id>", _delete_book, expect=(204,)),
+    Scenario("POST /api/books/bulk", _bulk_create, expect=(201,)),
+    Scenario(
+        "PATCH /api/books/bulk",
+        lambda c, ctx: c.patch(
+            "/api/books/bulk",
+            json=[{"id": ctx.book_id(), "title": "Bulk patch"} for _ in range(BULK_SIZE)],
+            headers=ctx.admin_headers,
+        ),
+    ),
+    Scenario("DELETE /api/books/bulk", _bulk_delete),
+    Scenario("POST /api/auth/register", _register, expect=(201,)),
+    Scenario("POST /api/auth/login", _login),
+    Scenario("POST /api/auth/refresh", _refresh),
+    Scenario("POST /api/auth/logout", _logout, expect=(204,)),
+    # Hachage des mots de passe : ~IMPORT_SIZE logins par requête → peu d'itérations.
+    Scenario("POST /api/auth/users/import", _import_users, heavy=True, expect=(201,)),
+    Scenario("GET /metrics", lambda c, ctx: c.get("/metrics")),
+    Scenario("GET /api/books/<id> (X-Profile)", _profiled_get),
+    Scenario("GET /api/admin/profiling", lambda c, ctx: c.get("/api/admin/profiling", headers=ctx.admin_headers)),
+    Scenario(
+        "POST /api/admin/profiling",
+        lambda c, ctx: c.post("/api/admin/profiling", json={"sample_every": 0}, headers=ctx.admin_headers),
+    ),
+    Scenario("GET /api/admin/profiles", _list_profiles),
+    Scenario(
+        "GET /api/admin/profiles/<name>",
+        lambda c, ctx: c.get(f"/api/admin/profiles/{ctx.profile}", headers=ctx.admin_headers),
+    ),
+]
+# endregion
+
+
+# region Mesure
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Percentile "nearest rank" sur une liste déjà triée."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(durations: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """Débit (requêtes/s) et latences (ms) d'une série de requêtes."""
+    ordered = sorted(durations)
+    return {
+        "requests": len(durations),
+        "errors": errors,
+        "rps": round(len(durations) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+def run_scenario(client: FlaskClient, ctx: BenchContext, scenario: Scenario, requests: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        scenario.run(client, ctx)
+
+    durations: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        res = scenario.run(client, ctx)
+        durations.append(time.perf_counter() - t0)
+        if res.status_code not in scenario.expect:
+            errors += 1
+    return summarize(durations, errors, time.perf_counter() - started)
+# endregion
+
+
+# region Catalogue
+def build_app(size: int, backend: str, workdir: str) -> tuple[Flask, BenchContext]:
+    """
+    App de benchmark avec un catalogue de 'size' livres et users_for(size) utilisateurs.
+    Le catalogue est inséré directement par le service (add_books), pas via HTTP.
+    """
+    config = dict(BENCH_CONFIG, PROFILING_DIR=os.path.join(workdir, f"profiles-{size}"))
+    if backend == "sqlite":
+        path = os.path.join(workdir, f"bench-{size}.db")
+        if os.path.exists(path):
+            os.remove(path)
+        config.update({"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": path})
+
+    app = create_app(config)
+    app.logger.setLevel(logging.ERROR)
+
+    if backend in ("memory", "compact"):
+        users_repo = InMemoryUserRepository()
+        book_service.use_repository(BookRepository() if backend == "memory" else CompactBookRepository())
+        user_service.use_repository(users_repo)
+    else:
+        users_repo = SQLiteUserRepository(app.extensions["sqlite_db"])
+
+    books = generate_books(size)
+    for start in range(0, len(books), 10_000):
+        book_service.add_books(books[start:start + 10_000])
+    users = users_repo.add_many(generate_users(users_for(size)))
+
+    words, authors = search_terms(books)
+    ctx = BenchContext(
+        size=size,
+        book_ids=[book.id for book in book_service.get_all()],
+        user_count=len(users),
+        words=words,
+        authors=authors,
+        admin_headers={"Authorization": "Bearer " + create_access_token(users[0].id, users[0].email, users[0].role)},
+    )
+    return app, ctx
+
+
+def release_app(app: Flask) -> None:
+    """Remet les services sur le stockage par défaut et ferme la base éventuelle."""
+    db = app.extensions.get("sqlite_db")
+    if db is not None:
+        db.close()
+    book_service.use_repository(None)
+    user_service.use_repository(None)
+# endregion
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    requests: int = 200,
+    heavy_requests: int = 5,
+    warmup: int = 2,
+    backend: str = "memory",
+    only: Optional[str] = None,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Lance tous les scénarios pour chaque taille de catalogue.
+    Retour : {"meta": {...}, "results": {"<taille>": {"<route>": {rps, p50_ms, ...}}}}
+    """
+    report: Dict[str, Any] = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "requests": requests,
+            "heavy_requests": heavy_requests,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            t0 = time.perf_counter()
+            app, ctx = build_app(size, backend, workdir)
+            log(f"\n== {size} livres, {ctx.user_count} utilisateurs (préparation : {time.perf_counter() - t0:.1f} s)")
+            client = app.test_client()
+            results = {}
+            try:
+                for scenario in SCENARIOS:
+                    if only and only not in scenario.name:
+                        continue
+                    count = heavy_requests if scenario.heavy else requests
+                    stats = run_scenario(client, ctx, scenario, count, min(warmup, count))
+                    results[scenario.name] = stats
+                    log(
+                        f"{scenario.name:<38} {stats['rps']:>10.1f} req/s  p50 {stats['p50_ms']:>9.3f} ms"
+                        f"  p95 {stats['p95_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms"
+                        + (f"  ERREURS {stats['errors']}" if stats["errors"] else "")
+                    )
+            finally:
+                release_app(app)
+            report["results"][str(size)] = results
+    return report
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_latency_regression: float = 0.25,
+    max_throughput_regression: float = 0.25,
+    min_latency_ms: float = 0.5,
+) -> List[str]:
+    """
+    Compare deux rapports et renvoie la liste des régressions :
+      - p95 plus lent de plus de max_latency_regression (0.25 = +25 %),
+      - débit plus faible de plus de max_throughput_regression,
+      - nouvelles erreurs.
+    Les écarts de latence sous min_latency_ms sont ignorés (bruit de mesure).
+    Seules les routes présentes dans les deux rapports sont comparées.
+    """
+    regressions = []
+    for size, routes in current["results"].items():
+        base_routes = baseline.get("results", {}).get(size, {})
+        for route, stats in routes.items():
+            base = base_routes.get(route)
+            if base is None:
+                continue
+            label = f"[{size}] {route}"
+            if stats["errors"] > base.get("errors", 0):
+                regressions.append(f"{label} : {stats['errors']} erreur(s) (référence : {base.get('errors', 0)})")
+            p95, base_p95 = stats["p95_ms"], base["p95_ms"]
+            if p95 - base_p95 > min_latency_ms and p95 > base_p95 * (1 + max_latency_regression):
+                regressions.append(f"{label} : p95 {base_p95:.3f} → {p95:.3f} ms")
+            if base["rps"] and stats["rps"] < base["rps"] * (1 - max_throughput_regression):
+                regressions.append(f"{label} : débit {base['rps']:.1f} → {stats['rps']:.1f} req/s")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark des routes de l'API (test_client).")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Tailles de catalogue, séparées par des virgules.")
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes mesurées par route.")
+    parser.add_argument("--heavy-requests", type=int, default=5, help="Requêtes pour les routes qui renvoient tout le catalogue.")
+    parser.add_argument("--warmup", type=int, default=2, help="Requêtes de chauffe (non mesurées) par route.")
+    parser.add_argument("--backend", choices=("memory", "compact", "sqlite"), default="memory")
+    parser.add_argument("--only", help="Ne mesurer que les routes dont le nom contient ce texte.")
+    parser.add_argument("--out", help="Fichier JSON où enregistrer les résultats.")
+    parser.add_argument("--baseline", help="Rapport JSON de référence à comparer.")
+    parser.add_argument("--max-latency-regression", type=float, default=0.25, help="Hausse tolérée du p95 (0.25 = 25 %%).")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.25, help="Baisse tolérée du débit.")
+    parser.add_argument("--min-latency-ms", type=float, default=0.5, help="Écart de p95 ignoré (bruit).")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        requests=args.requests,
+        heavy_requests=args.heavy_requests,
+        warmup=args.warmup,
+        backend=args.backend,
+        only=args.only,
+    )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nRésultats enregistrés dans {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(
+            report, baseline, args.max_latency_regression, args.max_throughput_regression, args.min_latency_ms
+        )
+        if regressions:
+            print("\nRégressions par rapport à la référence :")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nAucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# benchmarks/bench_memory.py
+# Mémoire occupée par livre selon la façon de stocker le catalogue (tracemalloc).
+#
+# Usage (depuis back-end/) :
+#   python -m benchmarks.bench_memory --sizes 100000,1000000 --out memory.json
+#
+# Les textes sont décodés depuis des octets DANS la zone mesurée : chaque livre possède
+# ses propres chaînes, comme après le parsing JSON d'une vraie requête.
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
+from app.repositories.compact_book_repository import BookColumns, CompactBookRepository
+from benchmarks.catalog import generate_books
+
+DEFAULT_SIZES = (100_000,)
+
+_Rows = List[Tuple[bytes, bytes]]
+
+
+class _DictBook:
+    """Le modèle Book d'origine (avec __dict__), pour mesurer le gain des __slots__."""
+
+    def __init__(self, id: int, title: str, author: str) -> None:
+        self.id = id
+        self.title = title
+        self.author = author
+
+
+def _dict_books(rows: _Rows) -> Any:
+    return [_DictBook(i, t.decode(), a.decode()) for i, (t, a) in enumerate(rows, 1)]
+
+
+def _slotted_books(rows: _Rows) -> Any:
+    return [Book(i, t.decode(), a.decode()) for i, (t, a) in enumerate(rows, 1)]
+
+
+def _columns(rows: _Rows) -> Any:
+    columns = BookColumns()
+    for i, (t, a) in enumerate(rows, 1):
+        columns.append(i, t.decode(), a.decode(), 0)
+    return columns
+
+
+def _repository(rows: _Rows) -> Any:
+    repo = BookRepository()
+    repo.add_many((t.decode(), a.decode()) for t, a in rows)
+    return repo
+
+
+def _repository_serialized(rows: _Rows) -> Any:
+    """Après un GET /api/books : un fragment JSON en cache par livre."""
+    repo = _repository(rows)
+    for book in repo.all():
+        repo.fragment(book)
+    return repo
+
+
+def _compact_repository(rows: _Rows) -> Any:
+    repo = CompactBookRepository()
+    repo.add_many((t.decode(), a.decode()) for t, a in rows)
+    return repo
+
+
+# (nom, construction) : chaque variante est mesurée seule, les autres étant libérées.
+VARIANTS: List[Tuple[str, Callable[[_Rows], Any]]] = [
+    ("Book avec __dict__ (liste)", _dict_books),
+    ("Book avec __slots__ (liste)", _slotted_books),
+    ("BookColumns (colonnes seules)", _columns),
+    ("BookRepository (index compris)", _repository),
+    ("BookRepository + fragments JSON", _repository_serialized),
+    ("CompactBookRepository (index compris)", _compact_repository),
+]
+
+
+def measure(build: Callable[[_Rows], Any], rows: _Rows) -> int:
+    """Octets encore alloués après construction (objet gardé en vie pendant la mesure)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build(rows)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return used
+
+
+def run_memory_benchmark(sizes: Sequence[int], log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """{"<taille>": {"<variante>": {"bytes": ..., "bytes_per_book": ...}}}"""
+    report: Dict[str, Any] = {}
+    for size in sizes:
+        rows = [(t.encode("utf-8"), a.encode("utf-8")) for t, a in generate_books(size)]
+        text = sum(len(t) + len(a) for t, a in rows)
+        log(f"\n{size} livres (textes UTF-8 : {text / size:.1f} octets / livre en moyenne)")
+        log(f"{'variante':<40} {'total':>12} {'octets / livre':>15}")
+        results = {}
+        for name, build in VARIANTS:
+            used = measure(build, rows)
+            results[name] = {"bytes": used, "bytes_per_book": round(used / size, 1)}
+            log(f"{name:<40} {used / 2**20:>9.1f} Mo {used / size:>15.1f}")
+        report[str(size)] = results
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mémoire par livre des différents stockages.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Tailles de catalogue.")
+    parser.add_argument("--out", help="Fichier JSON où enregistrer les résultats.")
+    args = parser.parse_args(argv)
+
+    report = run_memory_benchmark([int(s) for s in args.sizes.split(",") if s])
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nRésultats enregistrés dans {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
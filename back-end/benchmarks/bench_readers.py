@@ -0,0 +1,88 @@
+# benchmarks/bench_readers.py
+# Débit de lecture du dépôt en mémoire selon le nombre de threads lecteurs,
+# avec ou sans écrivains en parallèle (sans HTTP : le dépôt seul).
+#
+# Usage (depuis back-end/) :
+#   python -m benchmarks.bench_readers --readers 1,2,4,8 --duration 2 --out readers.json
+#   python -m benchmarks.bench_readers --books 100000 --writers 1   (lectures pendant des écritures)
+#
+# Avec le GIL de CPython, le débit total plafonne au lieu de croître linéairement :
+# l'important est qu'il ne s'effondre pas quand on ajoute des lecteurs ou un écrivain.
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
+
+
+def _reader(repo: BookRepository, stop: threading.Event, reads: list, slot: int) -> None:
+    """Une "lecture" = une page de 50 livres + une recherche par auteur."""
+    while not stop.is_set():
+        repo.page(0, 50)
+        repo.search_author("auteur 7")
+        reads[slot] += 1
+
+
+def _writer(repo: BookRepository, stop: threading.Event, writes: list, slot: int) -> None:
+    while not stop.is_set():
+        book = repo.add("Écriture", "Auteur écrivain")
+        repo.update(book.id, title="Écriture (revue)")
+        repo.delete(book.id)
+        writes[slot] += 3
+
+
+def measure(repo: BookRepository, readers: int, writers: int, duration: float) -> Dict[str, float]:
+    stop = threading.Event()
+    reads, writes = [0] * readers, [0] * writers
+    threads = [threading.Thread(target=_reader, args=(repo, stop, reads, i)) for i in range(readers)]
+    threads += [threading.Thread(target=_writer, args=(repo, stop, writes, i)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {"reads_per_s": round(sum(reads) / duration), "writes_per_s": round(sum(writes) / duration)}
+
+
+def run_reader_benchmark(
+    books: int = 5000,
+    readers: Sequence[int] = (1, 2, 4, 8),
+    writers: int = 0,
+    duration: float = 1.0,
+    log: Callable[[str], None] = print,
+) -> Dict[int, Dict[str, float]]:
+    repo = BookRepository(Book(i, f"Livre {i}", f"Auteur {i % 50}") for i in range(1, books + 1))
+    log(f"{books} livres, {writers} écrivain(s)")
+    log(f"{'lecteurs':>9} {'lectures/s':>12} {'écritures/s':>12}")
+    results = {}
+    for count in readers:
+        results[count] = measure(repo, count, writers, duration)
+        log(f"{count:>9} {results[count]['reads_per_s']:>12} {results[count]['writes_per_s']:>12}")
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Débit de lecture du dépôt en mémoire par nombre de lecteurs.")
+    parser.add_argument("--books", type=int, default=5000, help="Taille du catalogue.")
+    parser.add_argument("--readers", default="1,2,4,8", help="Nombres de lecteurs, séparés par des virgules.")
+    parser.add_argument("--writers", type=int, default=0, help="Écrivains actifs pendant la mesure.")
+    parser.add_argument("--duration", type=float, default=2.0, help="Durée de chaque mesure (secondes).")
+    parser.add_argument("--out", help="Fichier JSON où enregistrer les résultats.")
+    args = parser.parse_args(argv)
+
+    report = run_reader_benchmark(args.books, [int(n) for n in args.readers.split(",") if n], args.writers, args.duration)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({str(k): v for k, v in report.items()}, f, indent=2)
+        print(f"\nRésultats enregistrés dans {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
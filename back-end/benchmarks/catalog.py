@@ -0,0 +1,66 @@
+# benchmarks/catalog.py
+# Génération de données synthétiques (livres, utilisateurs) pour les benchmarks.
+# Tout est dérivé d'une graine : deux exécutions produisent exactement les mêmes données.
+
+import random
+from typing import List, Tuple
+
+from werkzeug.security import generate_password_hash
+
+# Hash volontairement "bon marché" (1 itération PBKDF2) pour les comptes synthétiques :
+# créer 10 000 comptes avec le réglage par défaut prendrait des heures.
+# Les mesures du login portent donc sur le code de l'API, pas sur PBKDF2.
+CHEAP_HASH_METHOD = "pbkdf2:sha256:1"
+BENCH_PASSWORD = "bench-password"
+
+_WORDS = (
+    "ombre lumière voyage secret jardin mer nuit étoile château forêt mémoire "
+    "silence tempête rivière empire royaume dragon miroir horloge cendre "
+    "hiver printemps orage désert montagne île chemin porte cœur feu"
+).split()
+
+_FIRST_NAMES = "Alice Bruno Chloé David Émile Fanny Gaston Hélène Inès Jules Karim Léa Marc Nora Oscar Paula".split()
+_LAST_NAMES = "Martin Bernard Dubois Thomas Robert Richard Petit Durand Leroy Moreau Simon Laurent Lefèvre Michel".split()
+
+
+def users_for(book_count: int) -> int:
+    """Nombre d'utilisateurs proportionnel au catalogue (1 pour 100 livres, 10 au minimum)."""
+    return max(10, book_count // 100)
+
+
+def generate_books(count: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    count couples (title, author).
+    Environ un auteur pour 10 livres : les recherches par auteur renvoient
+    des résultats réalistes (ni vides, ni tout le catalogue).
+    """
+    rng = random.Random(seed)
+    authors = [
+        f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} {i}"
+        for i in range(max(1, count // 10))
+    ]
+    return [
+        (" ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 5))).capitalize(), rng.choice(authors))
+        for _ in range(count)
+    ]
+
+
+def generate_users(count: int) -> List[Tuple[str, str, str]]:
+    """
+    count triplets (email, password_hash, role), tous avec le mot de passe BENCH_PASSWORD.
+    Le premier utilisateur est admin.
+    """
+    password_hash = generate_password_hash(BENCH_PASSWORD, method=CHEAP_HASH_METHOD)
+    return [
+        (f"bench{i}@example.com", password_hash, "admin" if i == 0 else "user")
+        for i in range(count)
+    ]
+
+
+def search_terms(books: List[Tuple[str, str]], seed: int = 7, count: int = 50) -> Tuple[List[str], List[str]]:
+    """Échantillon de (mots de titre, fragments d'auteur) réellement présents dans le catalogue."""
+    rng = random.Random(seed)
+    sample = rng.sample(books, min(count, len(books)))
+    words = [rng.choice(title.split()).lower() for title, _ in sample]
+    authors = [author.split()[1][:5] for _, author in sample]
+    return words, authors
@@ -0,0 +1,390 @@
+# benchmarks/load_test.py
+# Générateur de charge HTTP (bibliothèque standard uniquement) contre un vrai serveur :
+# sockets, threads du serveur, sérialisation… tout ce que test_client ne mesure pas.
+#
+# Usage (depuis back-end/) :
+#   python -m benchmarks.load_test --books 100000 --concurrency 1,4,16,64 --duration 10
+#   python -m benchmarks.load_test --workers 4 --client-processes 4 --concurrency 8,32,128
+#   python -m benchmarks.load_test --url http://127.0.0.1:5000 --books 0   (serveur déjà lancé)
+#   python -m benchmarks.load_test --mix login=100 --hash-workers 0   (login sans pool, pour comparer)
+#
+# Pour chaque niveau de concurrence : requêtes/s, p50 / p95 / p99, taux d'erreurs.
+# La suite des niveaux forme la courbe de saturation (le débit plafonne, la latence grimpe).
+
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+
+from app.tools.jwt_utils import create_access_token
+from app.tools.pagination import encode_cursor
+from benchmarks.bench_endpoints import percentile
+from benchmarks.catalog import generate_books, search_terms
+
+DEFAULT_MIX = "list=35,full=5,get=20,search=20,write=15,login=5"
+LOGIN_USERS = 20
+LOGIN_PASSWORD = "load-password"
+SEED_CHUNK = 10_000
+
+# Serveur lancé par l'outil : limiteur de login relevé (sinon 429 en rafale depuis 127.0.0.1)
+# et logs de requêtes réduits aux erreurs. Le pool de hachage garde sa taille de production
+# (PASSWORD_HASH_WORKERS par défaut) : le login mesuré passe par le vrai pool de processus.
+# --hash-workers N la change (0 = hachage dans le thread de requête, pour comparer).
+SERVER_CONFIG = {
+    "LOGIN_RATE_PER_IP": 1e9,
+    "LOGIN_BURST_PER_IP": 10**9,
+    "LOGIN_RATE_PER_EMAIL": 1e9,
+    "LOGIN_BURST_PER_EMAIL": 10**9,
+    "LOG_SAMPLE_RATE": 0,
+    "LOG_SLOW_MS": 60_000,
+}
+
+
+# region Serveur local
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port: int, workers: int, workdir: str, hash_workers: Optional[int] = None) -> None:
+    """Processus serveur : le vrai serveur WSGI de werkzeug (threadé), ou le mode pre-fork."""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # pas une ligne par requête sur stderr
+    # SIGTERM → sortie normale (blocs finally du serveur exécutés).
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    config = dict(SERVER_CONFIG)
+    if hash_workers is not None:
+        config["PASSWORD_HASH_WORKERS"] = hash_workers
+    if workers > 1:
+        from app.tools.server import serve_multiprocess
+
+        config.update({"SQLITE_PATH": os.path.join(workdir, "app.db"), "MMAP_PATH": os.path.join(workdir, "books.mmap")})
+        serve_multiprocess("127.0.0.1", port, workers, config)
+    else:
+        from werkzeug.serving import make_server
+
+        from app import create_app
+
+        app = create_app(config)
+        server = make_server("127.0.0.1", port, app, threaded=True)
+        try:
+            server.serve_forever()
+        finally:
+            # Un processus multiprocessing n'exécute pas les atexit (arrêt du pool) :
+            # on arrête le pool ici, en attendant ses workers.
+            server.server_close()
+            app.extensions["password_hasher"].shutdown(wait=True)
+
+
+def start_server(
+    workers: int, workdir: str, timeout: float = 30.0, hash_workers: Optional[int] = None
+) -> Tuple[multiprocessing.Process, str]:
+    """Lance le serveur dans un processus séparé et attend qu'il réponde."""
+    port = _free_port()
+    # Pas de daemon=True : le serveur a lui-même des processus enfants (pool de hachage, workers).
+    process = multiprocessing.Process(target=_serve, args=(port, workers, workdir, hash_workers))
+    process.start()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/books?limit=1")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError("Le serveur n'a pas démarré à temps.")
+
+
+def stop_server(process: multiprocessing.Process, timeout: float = 10.0) -> None:
+    """SIGTERM, puis SIGKILL si le serveur ne s'est pas arrêté à temps."""
+    process.terminate()
+    process.join(timeout)
+    if process.is_alive():
+        process.kill()
+        process.join()
+# endregion
+
+
+# region Préparation des données
+def _call(base_url: str, method: str, path: str, body: Any = None, headers: Optional[dict] = None) -> Tuple[int, Any]:
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=300)
+    payload = json.dumps(body).encode("utf-8") if body is not None else None
+    conn.request(method, path, body=payload, headers={"Content-Type": "application/json", **(headers or {})})
+    res = conn.getresponse()
+    data = res.read()
+    conn.close()
+    return res.status, (json.loads(data) if data else None)
+
+
+def prepare(base_url: str, books: int) -> Dict[str, Any]:
+    """
+    Remplit le catalogue (POST /api/books/bulk par paquets), crée les comptes du login,
+    et renvoie ce dont les threads de charge ont besoin (ids, termes de recherche, token admin).
+    Le token admin est signé avec la clé de la démo (jwt_utils.JWT_SECRET).
+    """
+    admin = {"Authorization": "Bearer " + create_access_token(1, "load@example.com", "admin")}
+    generated = generate_books(books)
+    for start in range(0, len(generated), SEED_CHUNK):
+        items = [{"title": t, "author": a} for t, a in generated[start:start + SEED_CHUNK]]
+        status, _ = _call(base_url, "POST", "/api/books/bulk", items, admin)
+        if status != 201:
+            raise RuntimeError(f"Remplissage du catalogue impossible (statut {status}).")
+
+    emails = [f"load{i}-{os.getpid()}@example.com" for i in range(LOGIN_USERS)]
+    for email in emails:
+        _call(base_url, "POST", "/api/auth/register", {"email": email, "password": LOGIN_PASSWORD, "confirmPassword": LOGIN_PASSWORD})
+
+    _, catalog = _call(base_url, "GET", "/api/books")
+    words, authors = search_terms([(b["title"], b["author"]) for b in catalog] or [("livre", "Auteur Inconnu")])
+    return {
+        "ids": [b["id"] for b in catalog] or [1],
+        "words": words,
+        "authors": authors,
+        "emails": emails,
+        "admin": admin,
+    }
+# endregion
+
+
+# region Charge
+def parse_mix(spec: str) -> Dict[str, int]:
+    """"list=35,get=20,..." → {"list": 35, "get": 20, ...}"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Opération inconnue : {name!r} (attendu : {', '.join(OPERATIONS)})")
+        mix[name] = int(weight)
+    return mix
+
+
+def _op_list(rng, data):
+    return "GET", f"/api/books?limit=50&cursor={encode_cursor({'after': rng.choice(data['ids'])})}", None, {}
+
+
+def _op_full(rng, data):
+    return "GET", "/api/books", None, {}
+
+
+def _op_get(rng, data):
+    return "GET", f"/api/books/{rng.choice(data['ids'])}", None, {}
+
+
+def _op_search(rng, data):
+    if rng.random() < 0.5:
+        return "GET", f"/api/books/search?q={quote(rng.choice(data['words']))}", None, {}
+    return "GET", f"/api/books/search?author={quote(rng.choice(data['authors']))}", None, {}
+
+
+def _op_write(rng, data):
+    if rng.random() < 0.5:
+        return "POST", "/api/books", {"title": "Charge", "author": "Load Tester"}, data["admin"]
+    return "PATCH", f"/api/books/{rng.choice(data['ids'])}", {"title": "Charge"}, data["admin"]
+
+
+def _op_login(rng, data):
+    return "POST", "/api/auth/login", {"email": rng.choice(data["emails"]), "password": LOGIN_PASSWORD}, {}
+
+
+OPERATIONS = {
+    "list": _op_list,      # GET /api/books paginé
+    "full": _op_full,      # GET /api/books complet
+    "get": _op_get,        # GET /api/books/<id>
+    "search": _op_search,  # recherche plein texte / auteur
+    "write": _op_write,    # POST / PATCH authentifiés
+    "login": _op_login,    # POST /api/auth/login (hachage scrypt côté serveur, défaut de werkzeug 3)
+}
+
+
+def _client_thread(base_url: str, data: dict, mix: Dict[str, int], deadline: float, seed: int, samples: list) -> None:
+    """
+    Un client : connexion HTTP/1.1 persistante (keep-alive), requêtes enchaînées
+    sans pause jusqu'à deadline. Chaque échantillon = (opération, statut, latence).
+    Statut 0 = erreur réseau (connexion refusée, coupée, timeout).
+    """
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    local = []
+    while time.perf_counter() < deadline:
+        op = rng.choices(names, weights)[0]
+        method, path, body, headers = OPERATIONS[op](rng, data)
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers={"Content-Type": "application/json", **headers})
+            res = conn.getresponse()
+            res.read()
+            status = res.status
+            if res.will_close:
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+        local.append((op, status, time.perf_counter() - t0))
+    conn.close()
+    samples.extend(local)  # list.extend est atomique : pas de verrou nécessaire
+
+
+def _client_process(base_url: str, data: dict, mix: Dict[str, int], threads: int, duration: float, seed: int) -> list:
+    """Processus client : 'threads' clients en parallèle (contourne le GIL côté générateur)."""
+    samples: list = []
+    deadline = time.perf_counter() + duration
+    workers = [
+        threading.Thread(target=_client_thread, args=(base_url, data, mix, deadline, seed * 1000 + i, samples))
+        for i in range(threads)
+    ]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return samples
+
+
+def run_level(
+    base_url: str, data: dict, mix: Dict[str, int], concurrency: int, duration: float, processes: int = 1
+) -> Dict[str, Any]:
+    """Charge avec 'concurrency' clients simultanés pendant 'duration' secondes."""
+    processes = max(1, min(processes, concurrency))
+    split = [concurrency // processes + (1 if i < concurrency % processes else 0) for i in range(processes)]
+
+    started = time.perf_counter()
+    if processes == 1:
+        samples = _client_process(base_url, data, mix, concurrency, duration, seed=1)
+    else:
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            chunks = pool.starmap(
+                _client_process, [(base_url, data, mix, n, duration, i + 1) for i, n in enumerate(split)]
+            )
+        samples = [s for chunk in chunks for s in chunk]
+    elapsed = max(duration, time.perf_counter() - started) if processes == 1 else duration
+    return summarize_level(concurrency, samples, elapsed)
+
+
+def summarize_level(concurrency: int, samples: List[tuple], elapsed: float) -> Dict[str, Any]:
+    """Débit, percentiles et erreurs, au global et par opération."""
+    def stats(rows: List[tuple]) -> Dict[str, Any]:
+        latencies = sorted(r[2] for r in rows)
+        errors = sum(1 for r in rows if r[1] == 0 or r[1] >= 400)
+        return {
+            "requests": len(rows),
+            "rps": round(len(rows) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+        }
+
+    by_op = defaultdict(list)
+    for row in samples:
+        by_op[row[0]].append(row)
+    return {
+        "concurrency": concurrency,
+        **stats(samples),
+        "statuses": dict(Counter(str(r[1]) for r in samples)),
+        "operations": {op: stats(rows) for op, rows in sorted(by_op.items())},
+    }
+
+
+def saturation_point(levels: List[Dict[str, Any]], min_gain: float = 0.10) -> Optional[int]:
+    """
+    Premier niveau de concurrence à partir duquel ajouter des clients
+    n'augmente plus le débit d'au moins min_gain (10 %) : le serveur est saturé,
+    la latence ne fait plus que grimper (file d'attente).
+    """
+    for previous, current in zip(levels, levels[1:]):
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 + min_gain):
+            return previous["concurrency"]
+    return None
+# endregion
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Test de charge HTTP de l'API.")
+    parser.add_argument("--url", help="Serveur déjà lancé (sinon l'outil en démarre un sur un port libre).")
+    parser.add_argument("--workers", type=int, default=1, help="Processus serveur (> 1 : mode pre-fork + mmap).")
+    parser.add_argument(
+        "--hash-workers", type=int, default=None,
+        help="Processus de hachage du serveur lancé (défaut : réglage de production ; 0 = sans pool).",
+    )
+    parser.add_argument("--books", type=int, default=10_000, help="Livres ajoutés avant le test (0 = aucun).")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Niveaux de concurrence (clients simultanés).")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de chaque niveau (secondes).")
+    parser.add_argument("--client-processes", type=int, default=1, help="Processus générateurs de charge.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Poids des opérations (défaut : {DEFAULT_MIX}).")
+    parser.add_argument("--out", help="Fichier JSON où enregistrer les résultats.")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    levels_spec = [int(c) for c in args.concurrency.split(",") if c]
+
+    process = None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            base_url = args.url
+            if base_url is None:
+                process, base_url = start_server(args.workers, workdir, hash_workers=args.hash_workers)
+                hashing = "défaut" if args.hash_workers is None else args.hash_workers
+                print(f"Serveur démarré sur {base_url} ({args.workers} worker(s), pool de hachage : {hashing})")
+
+            t0 = time.perf_counter()
+            data = prepare(base_url, args.books)
+            print(f"Préparation : {len(data['ids'])} livres, {LOGIN_USERS} comptes ({time.perf_counter() - t0:.1f} s)\n")
+
+            print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erreurs':>8}")
+            levels = []
+            for concurrency in levels_spec:
+                level = run_level(base_url, data, mix, concurrency, args.duration, args.client_processes)
+                levels.append(level)
+                print(
+                    f"{concurrency:>8} {level['rps']:>10.1f} {level['p50_ms']:>9.2f} {level['p95_ms']:>9.2f}"
+                    f" {level['p99_ms']:>9.2f} {level['error_rate'] * 100:>7.2f}%"
+                )
+        finally:
+            if process is not None:
+                stop_server(process)
+
+    saturated = saturation_point(levels)
+    if saturated is not None:
+        print(f"\nSaturation vers {saturated} clients simultanés (le débit ne progresse plus).")
+
+    if args.out:
+        report = {
+            "config": {
+                "url": args.url,
+                "workers": args.workers,
+                "hash_workers": args.hash_workers,
+                "books": args.books,
+                "duration": args.duration,
+                "client_processes": args.client_processes,
+                "mix": mix,
+            },
+            "levels": levels,
+            "saturation_concurrency": saturated,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Résultats enregistrés dans {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
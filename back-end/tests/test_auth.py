@@ -0,0 +1,335 @@
+# tests/test_auth.py
+
+import os
+import runpy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import create_app
+from app.repositories.refresh_token_repository import InMemoryRefreshTokenRepository
+from app.repositories.user_repository import InMemoryUserRepository
+from app.services import hashing_service
+from app.services.hashing_service import HashingBusyError, PasswordHasher
+from app.tools import jwt_utils
+from app.tools.middlewares import auth_middlware
+from app.tools.rate_limiter import TokenBucketLimiter
+from app.tools.token_cache import TokenCache, token_cache
+
+
+#region CACHE JWT
+def test_token_verified_once_then_cached(client, auth_headers, monkeypatch):
+    """
+    Le même token envoyé plusieurs fois n'est vérifié (signature HMAC) qu'une seule fois.
+    """
+    token_cache.clear()
+    calls = []
+
+    def counting_verify(token):
+        calls.append(token)
+        return jwt_utils.verify_access_token(token)
+
+    monkeypatch.setattr(auth_middlware, "verify_access_token", counting_verify)
+
+    for _ in range(3):
+        res = client.patch("/api/books/999999", json={"title": "Cache"}, headers=auth_headers)
+        assert res.status_code == 404  # auth OK, livre inexistant → aucune mutation du catalogue
+
+    assert len(calls) == 1
+
+
+def test_invalid_token_not_cached(client):
+    token_cache.clear()
+    res = client.patch("/api/books/1", json={"title": "x"}, headers={"Authorization": "Bearer abc"})
+    assert res.status_code == 401
+    assert token_cache.stats()["size"] == 0
+
+
+def test_jwt_payload_is_read_only(client, auth_headers):
+    """
+    Le payload en cache est partagé par toutes les requêtes du même token :
+    une route qui tenterait de le modifier échoue, sans rien changer pour les suivantes.
+    """
+    token_cache.clear()
+    app = client.application
+    payloads = []
+    for _ in range(2):  # 1re requête : vérification complète ; 2e : cache
+        with app.test_request_context(headers=auth_headers):
+            payload, err = auth_middlware._authenticate()
+            assert err is None
+            with pytest.raises(TypeError):
+                payload["role"] = "user"
+            payloads.append(payload)
+
+    assert payloads[0] is payloads[1]
+    assert payloads[1]["role"] == "admin"
+
+    cache = TokenCache()
+    original = {"exp": 1000, "role": "user"}
+    cache.put("t", original)
+    original["role"] = "admin"                      # le dict de l'appelant n'est pas partagé
+    assert cache.get("t", now=0)["role"] == "user"
+
+
+def test_token_cache_expiry_and_lru():
+    """
+    - une entrée expirée n'est jamais resservie,
+    - au-delà de max_size, la moins récemment utilisée est évincée.
+    """
+    cache = TokenCache(max_size=2)
+    cache.put("a", {"exp": 100})
+    cache.put("b", {"exp": 1000})
+    assert cache.get("a", now=50) == {"exp": 100}
+    assert cache.get("a", now=150) is None          # expiré → oublié
+
+    cache.put("c", {"exp": 1000})
+    cache.put("d", {"exp": 1000})                   # évince "b"
+    assert cache.get("b", now=0) is None
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+# endregion
+
+
+#region HACHAGE DES MOTS DE PASSE
+def test_password_hasher_process_pool():
+    """Le hash calculé dans un processus du pool est vérifiable, et mesuré."""
+    hasher = PasswordHasher(workers=1, queue_size=2)
+    try:
+        password_hash = hasher.hash("secret")
+        assert hasher.check(password_hash, "secret")
+        assert not hasher.check(password_hash, "autre")
+        stats = hasher.stats()
+        assert stats["completed"] == 3
+        assert stats["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_register_returns_503_when_hashing_saturated():
+    """
+    File de hachage pleine → 503 + Retry-After immédiat,
+    sans bloquer le thread de requête.
+    """
+    app = create_app({"PASSWORD_HASH_WORKERS": 0, "PASSWORD_HASH_QUEUE": 0})
+    hasher = app.extensions["password_hasher"]
+    hasher._slots.acquire()  # on occupe l'unique place disponible
+    try:
+        res = app.test_client().post(
+            "/api/auth/register",
+            json={"email": "busy@example.com", "password": "secret", "confirmPassword": "secret"},
+        )
+    finally:
+        hasher._slots.release()
+
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "1"
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_timed_out_hash_keeps_its_slot(monkeypatch):
+    """Après un timeout, la place reste prise tant que le job tourne encore dans le pool."""
+    monkeypatch.setattr(hashing_service, "HASH_TIMEOUT", 0.05)
+    hasher = PasswordHasher(workers=1, queue_size=0)          # une seule place
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(hasher, "_pool", lambda: pool)
+    finish = threading.Event()
+
+    def slow_job():
+        finish.wait(5)
+        return "fini", time.monotonic()
+
+    try:
+        with pytest.raises(HashingBusyError):
+            hasher._run(slow_job)
+        with pytest.raises(HashingBusyError):
+            hasher._run(slow_job)                              # refusé : le job 1 tourne encore
+        assert hasher.stats()["in_flight"] == 1
+        assert hasher.stats()["rejected"] == 1
+
+        finish.set()
+        pool.shutdown(wait=True)
+        assert hasher.stats()["in_flight"] == 0
+        assert hasher._slots.acquire(blocking=False)
+    finally:
+        finish.set()
+        pool.shutdown()
+
+
+def test_broken_hashing_pool_gives_busy_then_recovers():
+    """Un processus du pool qui meurt → HashingBusyError (503), puis un pool neuf est créé."""
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    try:
+        with pytest.raises(HashingBusyError):
+            hasher._run(os._exit, 1)
+        assert hasher._executor is None
+        assert hasher.check(hasher.hash("secret"), "secret")
+        assert hasher.stats()["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_entry_script_builds_nothing_when_reimported():
+    """Un processus "spawn" réimporte app.py sous le nom __mp_main__ : aucune app ne doit être créée."""
+    namespace = runpy.run_path(os.path.join(os.path.dirname(__file__), "..", "app.py"), run_name="__mp_main__")
+
+    assert "app" not in namespace
+    assert callable(namespace["create_app"])
+# endregion
+
+
+#region LIMITATION DU LOGIN
+def test_login_rate_limited_per_email():
+    """
+    Au-delà de la rafale autorisée sur un même compte → 429 + Retry-After,
+    sans passer par le hachage du mot de passe.
+    """
+    app = create_app({"LOGIN_BURST_PER_EMAIL": 2, "LOGIN_RATE_PER_EMAIL": 1})
+    client = app.test_client()
+    body = {"email": "Victim@Example.com ", "password": "wrong"}
+
+    assert client.post("/api/auth/login", json=body).status_code == 401
+    assert client.post("/api/auth/login", json={**body, "email": "victim@example.com"}).status_code == 401
+
+    res = client.post("/api/auth/login", json=body)
+    assert res.status_code == 429
+    assert int(res.headers["Retry-After"]) >= 1
+
+
+def test_token_bucket_refill_and_idle_eviction():
+    limiter = TokenBucketLimiter(rate=1, burst=2, max_keys=2)
+    assert limiter.hit("a", now=0) == 0
+    assert limiter.hit("a", now=0) == 0
+    assert limiter.hit("a", now=0) == 1      # seau vide : 1 s avant le prochain jeton
+    assert limiter.hit("a", now=1) == 0      # un jeton est revenu
+
+    limiter.hit("b", now=1)
+    limiter.hit("c", now=1)                  # max_keys = 2 → "a" évincé
+    assert limiter.stats()["keys"] == 2
+    limiter.hit("d", now=10)                 # "b" et "c" inactifs depuis longtemps → supprimés
+    assert limiter.stats()["keys"] == 1
+# endregion
+
+
+#region UTILISATEURS
+def test_user_repository_indexes():
+    repo = InMemoryUserRepository()
+    alice = repo.add("Alice@Example.com", "h", "user")
+    bob = repo.add("bob@example.com", "h", "admin")
+
+    assert (alice.id, bob.id) == (1, 2)
+    assert repo.get_by_email(" ALICE@example.COM") is alice
+    assert repo.get_by_id(2) is bob
+    assert repo.all() == [alice, bob]
+
+
+def test_register_duplicate_email(client):
+    body = {"email": "dup@example.com", "password": "secret", "confirmPassword": "secret"}
+    assert client.post("/api/auth/register", json=body).status_code == 201
+
+    res = client.post("/api/auth/register", json={**body, "email": "DUP@example.com"})
+    assert res.status_code == 409
+# endregion
+
+
+#region IMPORT EN MASSE
+def test_import_users_ndjson(auth_headers):
+    """
+    Import NDJSON : les lignes valides sont créées, les autres
+    sont signalées avec leur numéro de ligne (207 = import partiel).
+    """
+    app = create_app({"PASSWORD_HASH_WORKERS": 0})
+    client = app.test_client()
+    body = "\n".join([
+        '{"email": "imp1@example.com", "password": "pw", "confirmPassword": "pw"}',
+        '{"email": "imp2@example.com", "password": "pw", "confirmPassword": "pw", "role": "admin"}',
+        "pas du json",
+        '{"email": "IMP1@example.com", "password": "pw", "confirmPassword": "pw"}',
+        "",
+        '{"email": "imp3@example.com", "password": "pw", "confirmPassword": "autre"}',
+        '{"email": 5, "password": ["pw"], "confirmPassword": "pw"}',
+        '{"email": "imp4@example.com", "password": "pw", "confirmPassword": "pw"}',
+    ])
+
+    res = client.post("/api/auth/users/import", data=body, headers=auth_headers)
+    assert res.status_code == 207
+    data = res.get_json()
+    assert data["imported"] == 3                        # la ligne 7 n'interrompt pas l'import
+    assert [e["line"] for e in data["errors"]] == [3, 4, 6, 7]
+    assert data["errors"][3]["errors"]["email"] == "L'email doit être une chaîne de caractères."
+
+    login = client.post("/api/auth/login", json={"email": "imp2@example.com", "password": "pw"})
+    assert login.get_json()["user"]["role"] == "admin"
+
+
+def test_http_import_shares_the_login_hasher():
+    """Un seul import à la fois sur le pool partagé ; il hache dans l'ordre, puis rend toutes ses places."""
+    hasher = PasswordHasher(workers=0, queue_size=1)
+    with hasher.bulk() as hash_many:
+        with pytest.raises(HashingBusyError):
+            with hasher.bulk():
+                pass
+        hashes = hash_many(["a", "b"])
+
+    assert [hasher.check(h, p) for h, p in zip(hashes, "ab")] == [True, True]
+    assert hasher.stats()["in_flight"] == 0
+    with hasher.bulk():                                 # le verrou d'import est rendu
+        pass
+
+
+def test_import_users_requires_admin(client):
+    assert client.post("/api/auth/users/import", data="{}").status_code == 401
+
+
+def test_import_users_cli_process_pool(tmp_path):
+    """La commande CLI hache sur un pool de processus et insère par lots."""
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join(
+        f'{{"email": "cli{i}@example.com", "password": "pw{i}", "confirmPassword": "pw{i}"}}'
+        for i in range(5)
+    ))
+    app = create_app()
+    result = app.test_cli_runner().invoke(
+        args=["import-users", str(path), "--workers", "2", "--batch-size", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "5 utilisateur(s) importé(s)" in result.output
+# endregion
+
+
+#region REFRESH TOKENS
+def test_refresh_token_rotation_and_logout(client):
+    body = {"email": "refresh@example.com", "password": "secret", "confirmPassword": "secret"}
+    client.post("/api/auth/register", json=body)
+    login = client.post("/api/auth/login", json=body).get_json()
+
+    first = login["refresh_token"]
+    res = client.post("/api/auth/refresh", json={"refresh_token": first})
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["access_token"] and data["refresh_token"] != first
+    assert data["user"]["email"] == "refresh@example.com"
+
+    # Rotation : l'ancien token ne sert qu'une fois.
+    assert client.post("/api/auth/refresh", json={"refresh_token": first}).status_code == 401
+
+    # Déconnexion : le nouveau token est révoqué.
+    assert client.post("/api/auth/logout", json={"refresh_token": data["refresh_token"]}).status_code == 204
+    assert client.post("/api/auth/refresh", json={"refresh_token": data["refresh_token"]}).status_code == 401
+
+
+def test_refresh_token_repository_revocation_and_purge():
+    repo = InMemoryRefreshTokenRepository()
+    repo.add("a", user_id=1, expires_at=100)
+    repo.add("b", user_id=1, expires_at=1000)
+    repo.add("c", user_id=2, expires_at=1000)
+
+    assert repo.purge_expired(now=500) == 1
+    assert repo.revoke_user(1) == 1
+    assert repo.pop("b") is None
+    assert repo.pop("c") == (2, 1000)
+    assert len(repo) == 0
+# endregion
@@ -0,0 +1,70 @@
+# tests/test_benchmarks.py
+# Vérifie que la suite de benchmarks tourne (petit catalogue, peu de requêtes)
+# et que la comparaison avec une référence détecte bien les régressions,
+# ainsi que les calculs du test de charge (débit, erreurs, point de saturation)
+# et la mesure de mémoire par livre.
+
+import re
+
+from app import create_app
+from benchmarks.bench_endpoints import BENCH_CONFIG, SCENARIOS, compare, run_benchmarks
+from benchmarks.bench_memory import run_memory_benchmark
+from benchmarks.load_test import parse_mix, saturation_point, summarize_level
+
+
+def test_benchmark_suite_runs_every_route():
+    report = run_benchmarks(sizes=[200], requests=3, heavy_requests=1, warmup=1, log=lambda _: None)
+    results = report["results"]["200"]
+
+    assert set(results) == {scenario.name for scenario in SCENARIOS}
+    for name, stats in results.items():
+        assert stats["errors"] == 0, name
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_scenarios_cover_every_route(tmp_path):
+    """Chaque couple (méthode, route) de l'app a au moins un scénario."""
+    app = create_app(dict(BENCH_CONFIG, PROFILING_DIR=str(tmp_path)))
+    routes = {
+        (method, re.sub(r"<(?:[^:>]+:)?([^>]+)>", r"<\1>", rule.rule))
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint != "static"
+        for method in rule.methods - {"HEAD", "OPTIONS"}
+    }
+    covered = {(name.split()[0], name.split()[1].split("?")[0]) for name in (s.name for s in SCENARIOS)}
+
+    assert routes - covered == set()
+
+
+def test_compare_detects_regressions():
+    baseline = {"results": {"1000": {"GET /api/books": {"rps": 1000, "p95_ms": 2.0, "errors": 0}}}}
+    slower = {"results": {"1000": {"GET /api/books": {"rps": 500, "p95_ms": 4.0, "errors": 0}}}}
+    noise = {"results": {"1000": {"GET /api/books": {"rps": 950, "p95_ms": 2.3, "errors": 0}}}}
+
+    assert len(compare(slower, baseline)) == 2          # p95 + débit
+    assert compare(noise, baseline) == []               # sous les seuils
+
+
+def test_load_test_summary_and_saturation():
+    samples = [("list", 200, 0.010)] * 90 + [("get", 404, 0.020)] * 5 + [("write", 0, 0.5)] * 5
+    level = summarize_level(concurrency=4, samples=samples, elapsed=2.0)
+
+    assert level["rps"] == 50.0
+    assert level["error_rate"] == 0.1                   # 404 et erreurs réseau (statut 0)
+    assert level["statuses"] == {"200": 90, "404": 5, "0": 5}
+    assert level["operations"]["list"]["error_rate"] == 0.0
+
+    curve = [{"concurrency": c, "rps": r} for c, r in [(1, 100), (4, 380), (16, 400), (64, 390)]]
+    assert saturation_point(curve) == 4                 # 380 → 400 : moins de 10 % de gain
+    assert saturation_point(curve[:2]) is None
+    assert parse_mix("list=3,login=1") == {"list": 3, "login": 1}
+
+
+def test_memory_benchmark_reports_bytes_per_book():
+    """Le stockage en colonnes coûte moins par livre que des objets Book."""
+    results = run_memory_benchmark([2000], log=lambda _: None)["2000"]
+
+    per_book = {name: stats["bytes_per_book"] for name, stats in results.items()}
+    assert per_book["BookColumns (colonnes seules)"] < per_book["Book avec __slots__ (liste)"]
+    assert per_book["Book avec __slots__ (liste)"] < per_book["Book avec __dict__ (liste)"]
+    assert per_book["CompactBookRepository (index compris)"] < per_book["BookRepository (index compris)"]
@@ -235,4 +235,210 @@ def test_delete_book_not_found(client, auth_headers):
     response = client.delete("/api/books/999", headers=auth_headers)
     assert response.status_code == 404
 
-# endregion
\ No newline at end of file
+# endregion
+
+#region SEARCH (plein texte)
+def test_search_books_full_text(client):
+    """
+    GET /api/books/search?q=...
+    La recherche plein texte porte sur le titre ET l'auteur,
+    ignore casse et accents, et classe les résultats par score décroissant.
+    """
+    response = client.get("/api/books/search?q=CA%20king")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data[0]["id"] == 2  # "ça" de "Stephen King" correspond aux deux mots
+    scores = [b["score"] for b in data]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_books_invalid_limit(client):
+    """Un 'limit' hors bornes est refusé avec une 400."""
+    response = client.get("/api/books/search?q=bible&limit=0")
+    assert response.status_code == 400
+
+# endregion
+
+
+#region PAGINATION
+def test_get_books_paginated(client, auth_headers):
+    """
+    GET /api/books?limit=2 puis ?cursor=...
+    On parcourt tout le catalogue page par page et on doit retrouver
+    exactement la liste complète, dans l'ordre des ids, sans doublon.
+    """
+    client.post("/api/books", json={"title": "Page", "author": "Pagination"}, headers=auth_headers)
+    expected = [b["id"] for b in client.get("/api/books").get_json()]
+
+    seen = []
+    response = client.get("/api/books?limit=2")
+    while True:
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page["items"]) <= 2
+        seen += [b["id"] for b in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        response = client.get(f"/api/books?limit=2&cursor={page['next_cursor']}")
+
+    assert seen == expected
+
+
+def test_get_books_invalid_cursor(client):
+    """Un curseur altéré est refusé avec une 400."""
+    response = client.get("/api/books?cursor=pas-un-curseur")
+    assert response.status_code == 400
+
+
+def test_search_books_paginated(client):
+    """La recherche plein texte se pagine aussi, sans doublon entre les pages."""
+    first = client.get("/api/books/search?q=harry%20bible%20ca&limit=1").get_json()
+    assert len(first["items"]) == 1
+    second = client.get(f"/api/books/search?q=harry%20bible%20ca&limit=1&cursor={first['next_cursor']}").get_json()
+    assert second["items"][0]["id"] != first["items"][0]["id"]
+
+# endregion
+
+
+#region STREAMING
+def test_get_books_stream(client):
+    """
+    GET /api/books?stream=1
+    La réponse est produite par un générateur, mais le JSON final
+    doit être identique à la liste classique.
+    """
+    response = client.get("/api/books?stream=1")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.get_json() == client.get("/api/books").get_json()
+
+
+def test_get_books_stream_has_no_etag(client):
+    """
+    Le flux est lu page par page pendant que les écritures continuent :
+    pas d'ETag (il ne correspondrait à aucune version précise), donc jamais de 304.
+    """
+    etag = client.get("/api/books").headers["ETag"]
+
+    response = client.get("/api/books?stream=1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+# endregion
+
+
+#region ETAG
+def test_get_books_not_modified(client, auth_headers):
+    """
+    GET /api/books avec If-None-Match
+    Tant que le catalogue ne change pas → 304 sans corps.
+    Après une création → nouvel ETag et réponse 200 complète.
+    """
+    first = client.get("/api/books")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/books", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    client.post("/api/books", json={"title": "Cache", "author": "Etag"}, headers=auth_headers)
+    fresh = client.get("/api/books", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+
+def test_get_book_etag_per_book(client, auth_headers):
+    """Modifier le livre 2 ne change pas l'ETag du livre 3."""
+    etag_3 = client.get("/api/books/3").headers["ETag"]
+    client.patch("/api/books/2", json={"title": "Nouveau titre"}, headers=auth_headers)
+
+    assert client.get("/api/books/3", headers={"If-None-Match": etag_3}).status_code == 304
+
+# endregion
+
+
+#region BULK
+def test_bulk_create_reports_item_errors(client, auth_headers):
+    """
+    POST /api/books/bulk
+    Les éléments valides sont créés, les invalides sont signalés avec leur index
+    → statut 207 (résultat mixte).
+    """
+    payload = [
+        {"title": "Lot 1", "author": "Auteur lot"},
+        {"title": "", "author": "Auteur lot"},
+        {"title": "Lot 3", "author": "Auteur lot"},
+    ]
+    response = client.post("/api/books/bulk", json=payload, headers=auth_headers)
+
+    assert response.status_code == 207
+    data = response.get_json()
+    assert [b["title"] for b in data["created"]] == ["Lot 1", "Lot 3"]
+    assert [e["index"] for e in data["errors"]] == [1]
+
+
+def test_bulk_patch_and_delete(client, auth_headers):
+    """PATCH puis DELETE /api/books/bulk sur des livres créés en lot."""
+    created = client.post(
+        "/api/books/bulk",
+        json={"items": [{"title": f"Lot {i}", "author": "Auteur lot"} for i in range(3)]},
+        headers=auth_headers,
+    ).get_json()["created"]
+    ids = [b["id"] for b in created]
+
+    patched = client.patch(
+        "/api/books/bulk",
+        json=[{"id": ids[0], "title": "Modifié"}, {"id": 999999, "title": "Inconnu"}],
+        headers=auth_headers,
+    )
+    assert patched.status_code == 207
+    assert patched.get_json()["updated"][0]["title"] == "Modifié"
+    assert patched.get_json()["errors"][0]["id"] == 999999
+
+    deleted = client.delete("/api/books/bulk", json={"ids": ids}, headers=auth_headers)
+    assert deleted.status_code == 200
+    assert deleted.get_json()["deleted"] == ids
+    assert client.get(f"/api/books/{ids[0]}").status_code == 404
+
+
+def test_bulk_requires_auth(client):
+    """Sans JWT, les routes bulk sont refusées comme les routes unitaires."""
+    assert client.post("/api/books/bulk", json=[{"title": "a", "author": "abc"}]).status_code == 401
+
+# endregion
+
+
+#region MULTI-GET
+def test_get_books_by_ids(client):
+    """
+    GET /api/books?ids=3,999,1
+    L'ordre demandé est respecté et les ids inconnus sont listés dans "missing".
+    """
+    response = client.get("/api/books?ids=3,999,1")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [b["id"] for b in data["items"]] == [3, 1]
+    assert data["missing"] == [999]
+
+
+def test_lookup_books_post(client):
+    """POST /api/books/lookup : même résultat, ids dans le corps JSON."""
+    response = client.post("/api/books/lookup", json={"ids": [1, 3]})
+    assert [b["id"] for b in response.get_json()["items"]] == [1, 3]
+
+    assert client.post("/api/books/lookup", json={"ids": ["a"]}).status_code == 400
+
+
+def test_get_books_by_ids_rejects_non_ascii_digits(client):
+    """Seuls les chiffres ASCII sont acceptés : pas de "١٢", ni d'espaces autour des ids."""
+    for ids in ("\u0661\u0662", "1, 3", " 1", "1,+3", "1,-3", "1,x"):
+        response = client.get("/api/books", query_string={"ids": ids})
+        assert response.status_code == 400, ids
+
+    assert client.get("/api/books?ids=1,3").status_code == 200
+
+# endregion
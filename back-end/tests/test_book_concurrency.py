@@ -0,0 +1,82 @@
+# tests/test_book_concurrency.py
+# Test de charge du dépôt en mémoire avec de nombreux threads simultanés :
+# des écrivains ajoutent / modifient / suppriment pendant que des lecteurs
+# parcourent le catalogue. Aucun id ne doit être dupliqué et aucun lecteur
+# ne doit voir un état incohérent (ou planter).
+
+import threading
+import time
+
+from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
+
+WRITERS = 8
+READERS = 8
+BOOKS_PER_WRITER = 300
+
+
+def _run_readers(repo: BookRepository, count: int, stop: threading.Event, errors: list):
+    """Lance 'count' lecteurs qui tournent jusqu'à stop (débit : benchmarks/bench_readers.py)."""
+
+    def reader() -> None:
+        try:
+            while not stop.is_set():
+                snap = repo.snapshot()
+                # Une photo est toujours triée et cohérente avec elle-même (liste, dict, index).
+                ids = [b.id for b in snap.ordered]
+                assert ids == sorted(ids) and len(ids) == len(snap.books)
+                assert snap.by_author.search("auteur") <= set(snap.books)
+                books, _ = repo.page(0, 50)
+                assert [b.id for b in books] == sorted(b.id for b in books)
+                repo.search_author("auteur")
+                # Comme une vraie requête (réseau, sérialisation), le lecteur rend la main :
+                # sans verrou, 8 boucles serrées garderaient le GIL et affameraient les écrivains.
+                time.sleep(0)
+        except Exception as exc:  # remonté dans le thread principal
+            errors.append(exc)
+
+    threads = [threading.Thread(target=reader) for _ in range(count)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_concurrent_writers_and_readers():
+    """
+    8 écrivains + 8 lecteurs en parallèle.
+    À la fin : ids uniques, compte exact, index cohérents, aucune exception.
+    """
+    repo = BookRepository([Book(1, "Départ", "Auteur initial")])
+    errors: list = []
+    stop = threading.Event()
+    created: list[list[int]] = [[] for _ in range(WRITERS)]
+
+    def writer(slot: int) -> None:
+        try:
+            for i in range(BOOKS_PER_WRITER):
+                book = repo.add(f"Livre {slot}-{i}", f"Auteur {slot}")
+                created[slot].append(book.id)
+                if i % 3 == 0:
+                    repo.update(book.id, title=f"Livre {slot}-{i} (revu)")
+                if i % 5 == 0:
+                    repo.delete(book.id)
+                    created[slot].pop()
+        except Exception as exc:
+            errors.append(exc)
+
+    readers = _run_readers(repo, READERS, stop, errors)
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert errors == []
+    all_ids = [book_id for ids in created for book_id in ids]
+    assert len(all_ids) == len(set(all_ids))  # aucun id distribué deux fois
+    assert len(repo) == len(all_ids) + 1
+    assert sorted(repo.by_author.search("auteur")) == sorted(all_ids + [1])
+
@@ -0,0 +1,126 @@
+# tests/test_book_repository.py
+# Tests unitaires du dépôt en mémoire (sans passer par HTTP).
+# On vérifie surtout que les index restent cohérents après chaque mutation.
+
+import json
+
+from app.models.book_model import Book
+from app.repositories.book_repository import BookRepository
+
+
+def _repo() -> BookRepository:
+    return BookRepository([
+        Book(1, "Harry Potter", "JK Rowling"),
+        Book(2, "ça", "Stephen King"),
+    ])
+
+
+def test_add_uses_counter_after_seed():
+    """Le compteur d'id démarre après le plus grand id du jeu de départ."""
+    repo = _repo()
+    book = repo.add("Shining", "Stephen King")
+
+    assert book.id == 3
+    assert repo.get(3) is book
+    assert repo.by_author.get("stephen king") == {2, 3}
+
+
+def test_update_reindexes_book():
+    """Une mise à jour retire l'ancienne valeur des index et ajoute la nouvelle."""
+    repo = _repo()
+    repo.update(2, author="Laboon")
+
+    assert repo.by_author.get("Stephen King") == set()
+    assert repo.by_author.get("laboon") == {2}
+    assert "stephen king" not in repo.by_author.keys()
+
+
+def test_delete_removes_from_all_indexes():
+    """Après suppression, le livre n'est plus trouvable, ni par id ni par auteur."""
+    repo = _repo()
+
+    assert repo.delete(1) is True
+    assert repo.delete(1) is False
+    assert repo.get(1) is None
+    assert repo.by_author.get("jk rowling") == set()
+    assert len(repo) == 1
+
+
+def test_search_author_matches_linear_scan():
+    """L'index de trigrammes renvoie exactement ce que renverrait un scan complet."""
+    repo = _repo()
+    repo.add("Shining", "Stephen King")
+    repo.add("Misery", "KINGSLEY Amis")
+    repo.update(1, author="J.K. Rowling")
+
+    for needle in ["king", "KiNg", "ro", "j.k", "Stephen King", "xyz", "k"]:
+        expected = [b.id for b in repo if needle.lower() in b.author.lower()]
+        books, _ = repo.search_author(needle)
+        assert [b.id for b in books] == expected
+
+
+def test_search_text_follows_mutations():
+    """L'index plein texte suit les mises à jour et suppressions, et respecte 'limit'."""
+    repo = _repo()
+    repo.add("Shining", "Stephen King")
+    repo.update(2, title="Carrie")
+
+    def ids(query: str, limit: int) -> list[int]:
+        results, _ = repo.search_text(query, limit)
+        return [b.id for b, _ in results]
+
+    assert ids("king", 10) == [2, 3]
+    assert ids("king", 1) == [2]
+    assert ids("ça", 10) == []
+
+    repo.delete(3)
+    assert ids("shining king", 10) == [2]
+
+
+def test_fragment_cache_invalidated_on_update():
+    """Le fragment JSON est réutilisé tant que le livre ne change pas, puis recalculé."""
+    repo = _repo()
+    book = repo.get(1)
+    first = repo.fragment(book)
+
+    assert repo.fragment(book) is first
+    repo.update(1, title="Harry Potter 2")
+    assert json.loads(repo.fragment(repo.get(1))) == {"id": 1, "title": "Harry Potter 2", "author": "JK Rowling"}
+
+
+def test_page_follows_mutations_and_old_snapshots_stay_intact():
+    """Chaque écriture publie une nouvelle photo ; une photo déjà prise ne change jamais."""
+    repo = _repo()
+    repo.add_many([("Shining", "Stephen King"), ("Dune", "Frank Herbert")])
+    snap = repo.snapshot()
+
+    repo.delete(2)
+    repo.update(3, title="Carrie")
+    books, more = repo.page(1, 2)
+
+    assert [(b.id, b.title) for b in books] == [(3, "Carrie"), (4, "Dune")]
+    assert more is False
+    assert repo.page(0, 1) == ([repo.get(1)], True)
+    assert [b.id for b in repo.all()] == [1, 3, 4]
+
+    # L'ancienne photo : livres, ordre et index d'avant les écritures.
+    assert [(b.id, b.title) for b in snap.ordered] == [(1, "Harry Potter"), (2, "ça"), (3, "Shining"), (4, "Dune")]
+    assert snap.books.get(2).title == "ça"
+    assert snap.by_author.search("king") == {2, 3}
+    assert [book_id for _, book_id in snap.fulltext.search("shining", 5)] == [3]
+    assert repo.snapshot().fulltext.search("shining", 5) == []
+
+
+def test_page_spans_many_chunks():
+    """Pagination et suppressions sur un catalogue découpé en plusieurs tranches."""
+    repo = BookRepository()
+    repo.add_many((f"Livre {i}", f"Auteur {i % 7}") for i in range(3000))
+    repo.delete_many(range(500, 2600))
+
+    seen, cursor, more = [], 0, True
+    while more:
+        books, more = repo.page(cursor, 97)
+        seen += [b.id for b in books]
+        cursor = books[-1].id if books else cursor
+    assert seen == [*range(1, 500), *range(2600, 3001)]
+    assert repo.page(3000, 10) == ([], False)
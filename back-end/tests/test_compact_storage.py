@@ -0,0 +1,87 @@
+# tests/test_compact_storage.py
+# Stockage "compact" (colonnes) : mêmes résultats que le dépôt en mémoire classique,
+# au niveau du dépôt puis via les routes avec STORAGE_BACKEND = "compact".
+
+import pytest
+
+from app import create_app
+from app.models.book_model import Book
+from app.repositories import compact_book_repository
+from app.repositories.book_repository import BookRepository
+from app.repositories.compact_book_repository import CompactBookRepository
+
+SEED = [Book(1, "Harry Potter", "JK Rowling"), Book(2, "ça", "Stephen King")]
+
+
+def test_compact_repository_matches_memory_repository():
+    """Même séquence d'opérations sur les deux dépôts → mêmes livres, versions et recherches."""
+    repos = [BookRepository(SEED), CompactBookRepository(SEED)]
+    for repo in repos:
+        repo.add_many([("Shining", "Stephen King"), ("Dune", "Frank Herbert")])
+        repo.update(1, title="Harry Potter 2")
+        repo.update_many([(3, {"author": "S. King"}), (99, {"title": "Absent"})])
+        repo.delete(4)
+
+    memory, compact = repos
+    dump = lambda books: [b.to_dict() for b in books]
+    assert dump(compact.all()) == dump(memory.all())
+    assert compact.version == memory.version
+    assert [compact.book_version(i) for i in (1, 2, 3, 4)] == [memory.book_version(i) for i in (1, 2, 3, 4)]
+    assert dump(compact.page(1, 1)[0]) == dump(memory.page(1, 1)[0])
+    assert compact.page(1, 1)[1] is True
+    assert dump(compact.search_author("king")[0]) == dump(memory.search_author("king")[0])
+    assert [(b.id, s) for b, s in compact.search_text("potter", 5)[0]] == [(b.id, s) for b, s in memory.search_text("potter", 5)[0]]
+    assert compact.get_many([3, 4, 1])[1] is None
+    assert compact.fragment(compact.get(2)) == memory.fragment(memory.get(2))
+
+
+def test_compaction_drops_dead_rows(monkeypatch):
+    """Suppressions et mises à jour laissent des lignes / octets morts, récupérés au compactage."""
+    monkeypatch.setattr(compact_book_repository, "COMPACT_MIN_ROWS", 4)
+    repo = CompactBookRepository()
+    books = repo.add_many([(f"Livre {i}", f"Auteur {i % 3}") for i in range(10)])
+
+    repo.delete_many([b.id for b in books[:6]])
+
+    columns = repo._columns
+    assert len(columns.ids) == 4                        # compacté : plus de lignes mortes
+    assert [b.id for b in repo.all()] == [b.id for b in books[6:]]
+    assert repo.get(books[0].id) is None
+    assert repo.get(books[9].id).author == "Auteur 0"
+    assert repo.add("Suite", "Auteur 1").id == books[-1].id + 1
+
+
+def test_compact_rows_are_views():
+    """Chaque lecture renvoie une vue neuve : le dépôt ne garde aucun objet Book."""
+    repo = CompactBookRepository(SEED)
+
+    assert repo.get(1) is not repo.get(1)
+    assert repo.get(1).to_dict() == {"id": 1, "title": "Harry Potter", "author": "JK Rowling"}
+    with pytest.raises(ValueError):
+        repo._columns.append(1, "Doublon", "Ordre", 0)   # ids strictement croissants
+
+
+@pytest.fixture
+def compact_app():
+    app = create_app({"STORAGE_BACKEND": "compact"})
+    app.testing = True
+    yield app
+    create_app()  # retour au stockage par défaut pour les autres fichiers de tests
+
+
+def test_compact_backend_routes(compact_app, auth_headers):
+    client = compact_app.test_client()
+
+    assert len(client.get("/api/books").get_json()) == 3
+    created = client.post("/api/books", json={"title": "Shining", "author": "Stephen King"}, headers=auth_headers)
+    assert created.get_json()["id"] == 4
+
+    assert [b["id"] for b in client.get("/api/books/search?author=KING").get_json()] == [2, 4]
+    assert client.patch("/api/books/4", json={"title": "Carrie"}, headers=auth_headers).get_json()["title"] == "Carrie"
+    assert client.get("/api/books/search?q=carrie").get_json()[0]["id"] == 4
+
+    first = client.get("/api/books?limit=2").get_json()
+    assert [b["id"] for b in client.get("/api/books?limit=2&cursor=" + first["next_cursor"]).get_json()["items"]] == [3, 4]
+
+    assert client.delete("/api/books/4", headers=auth_headers).status_code == 204
+    assert client.get("/api/books/4").status_code == 404
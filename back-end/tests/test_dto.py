@@ -0,0 +1,93 @@
+# tests/test_dto.py
+# Tests unitaires des DTO et du moteur de schéma (app/dtos/schema.py), sans passer par HTTP.
+
+import pytest
+
+from app.dtos.auth_dto import LoginDTO, RegisterDTO
+from app.dtos.book_dto import BookCreateDTO, BookPatchDTO, BookUpdateDTO
+from app.dtos.schema import COLLECT, FAIL_FAST, Field, Schema, SchemaDTO
+
+
+def test_book_dtos_keep_their_messages():
+    """Les messages d'erreur renvoyés au front sont inchangés."""
+    assert BookCreateDTO.from_json({}) == (None, {"error": "Aucune donnée fournie"})
+    assert BookUpdateDTO.from_json(None) == (None, {"error": "Données manquantes pour la mise à jour complète"})
+    assert BookCreateDTO.from_json({"title": "  ", "author": 5})[1] == {
+        "error": "Les champs title et author doivent être des chaînes de caractères"
+    }
+    assert BookCreateDTO.from_json({"title": "  ", "author": "Tolkien"})[1] == {"error": "Le titre ne peut pas être vide."}
+    assert BookPatchDTO.from_json({"isbn": "123"})[1] == {"error": "Aucun champ valide à mettre à jour"}
+    assert BookPatchDTO.from_json({"author": "ab"})[1] == {"error": "L'auteur doit contenir au moins 3 caractères"}
+    # PATCH : chaque champ est validé en entier (type puis contenu) avant le suivant.
+    assert BookPatchDTO.from_json({"title": "x" * 101, "author": 5})[1] == {
+        "error": "Le titre ne peut pas dépasser 100 caractères"
+    }
+    assert BookPatchDTO.from_json({"title": 5, "author": "ab"})[1] == {"error": "Le titre doit être une chaîne de caractères"}
+
+
+def test_valid_dtos_are_stripped_and_slotted():
+    dto, err = BookCreateDTO.from_json({"title": "  Dune ", "author": " Frank Herbert "})
+
+    assert err is None
+    assert (dto.title, dto.author) == ("Dune", "Frank Herbert")
+    assert not hasattr(dto, "__dict__")                 # dataclass à __slots__
+    assert BookPatchDTO.from_json({"title": " Dune "})[0].changes() == {"title": "Dune"}
+
+
+def test_collect_mode_reports_every_field():
+    """COLLECT : toutes les erreurs d'un coup ; FAIL_FAST (défaut des livres) : la première."""
+    data = {"title": "x" * 101, "author": "ab"}
+
+    assert BookCreateDTO.from_json(data)[1] == {"error": "Le titre ne peut pas dépasser 100 caractères."}
+    assert BookCreateDTO.from_json(data, mode=COLLECT)[1] == {
+        "error": "Le titre ne peut pas dépasser 100 caractères.",
+        "errors": {
+            "title": "Le titre ne peut pas dépasser 100 caractères.",
+            "author": "Le nom de l'auteur doit contenir au moins 3 caractères",
+        },
+    }
+
+
+def test_auth_dtos_collect_errors_by_field():
+    assert LoginDTO.from_json({}) == (
+        None,
+        {"errors": {"email": "L'email est requis.", "password": "Le mot de passe est requis."}},
+    )
+    # Alias snake_case + règle multi-champs (password == confirmPassword).
+    assert RegisterDTO.from_json({"password": "a", "confirm_password": "b"})[1] == {
+        "errors": {"email": "L'email est requis.", "passwordMatch": "Les mots de passe ne correspondent pas."}
+    }
+    dto, err = RegisterDTO.from_json({"email": "a@b.c", "password": "a", "confirmPassword": "a"})
+    assert err is None and dto.confirm_password == "a"
+
+
+def test_validate_many_keeps_order():
+    results = BookCreateDTO.validate_many([{"title": "Dune", "author": "Herbert"}, "pas un objet", {"title": "Ça"}])
+
+    assert results[0][0].title == "Dune"
+    assert results[1] == (None, {"error": "Aucune donnée fournie"})
+    assert results[2][1] == {"error": "Les champs title et author doivent être des chaînes de caractères"}
+
+
+def test_fail_fast_errors_are_fresh_dicts():
+    """Chaque appel renvoie son propre dict d'erreur : le modifier n'altère pas les appels suivants."""
+    first = BookCreateDTO.from_json({})[1]
+    first["error"] = "modifié"
+    nested = LoginDTO.from_json({"email": 5, "password": "x"}, mode=FAIL_FAST)[1]
+    nested["errors"].clear()
+
+    assert BookCreateDTO.from_json({}) == (None, {"error": "Aucune donnée fournie"})
+    assert BookPatchDTO.from_json({})[1] is not BookPatchDTO.from_json({})[1]
+    assert LoginDTO.from_json({"email": 5, "password": "x"}, mode=FAIL_FAST)[1] == {
+        "errors": {"email": "L'email doit être une chaîne de caractères."}
+    }
+
+
+def test_schema_must_follow_dataclass_fields():
+    """Le schéma passe ses valeurs au constructeur dans son ordre : il doit suivre celui de la classe."""
+    with pytest.raises(TypeError):
+        class _Broken(SchemaDTO):
+            author: str
+            title: str
+
+            schema = Schema(Field("title"), Field("author"))
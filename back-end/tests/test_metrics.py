@@ -0,0 +1,94 @@
+# tests/test_metrics.py
+
+import json
+import logging
+import queue
+
+from app import create_app
+from app.tools.log_pipeline import DroppingQueueHandler
+from app.tools.metrics import Histogram
+
+
+#region /metrics
+def test_metrics_per_route_template(client):
+    """
+    Les latences sont regroupées par modèle de route (/api/books/<int:id>),
+    pas par chemin réel : un id différent ne crée pas une nouvelle série.
+    """
+    client.get("/api/books/1")
+    client.get("/api/books/2")
+    client.get("/api/books/999999")
+    client.get("/nulle-part")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.content_type.startswith("text/plain")
+    text = res.get_data(as_text=True)
+
+    assert 'http_requests_total{method="GET",route="/api/books/<int:id>",status="200"} 2' in text
+    assert 'http_requests_total{method="GET",route="/api/books/<int:id>",status="404"} 1' in text
+    assert 'route="<unmatched>"' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/books/<int:id>"} 3' in text
+    assert "/api/books/1" not in text
+    # Seule la requête /metrics elle-même est en cours au moment du rendu.
+    assert "http_requests_in_flight 1" in text
+    assert "jwt_cache_hits_total" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    lines = histogram.render()
+    assert 'latency_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_count{route="/a"} 4' in lines
+# endregion
+
+
+#region LOGS
+def test_request_logs_sampled_json(capsys):
+    """
+    Taux d'échantillonnage 0 : les requêtes rapides et réussies ne sont pas
+    journalisées, les erreurs le sont toujours, en JSON.
+    """
+    app = create_app({"LOG_SAMPLE_RATE": 0, "LOG_LEVEL": "INFO", "LOG_QUEUE_SIZE": 50})
+    client = app.test_client()
+    pipeline = app.extensions["log_pipeline"]
+    before = pipeline.sampled_out
+
+    client.get("/api/books/1")
+    client.get("/api/books/999999")
+    pipeline.queue.join()  # attend que le thread d'écriture ait tout traité
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    requests = [line for line in lines if line["message"] == "request"]
+    assert [(r["route"], r["status"], r["level"]) for r in requests] == [("/api/books/<int:id>", 404, "WARNING")]
+    assert pipeline.sampled_out == before + 1
+    assert pipeline.queue.maxsize == 50                # taille propre à CETTE app
+
+
+def test_request_logs_silent_in_testing_and_below_level(capsys):
+    """Niveau WARNING : pas de ligne INFO ; app.testing : rien du tout, même les erreurs."""
+    app = create_app({"LOG_LEVEL": "WARNING"})
+    client = app.test_client()
+    client.get("/api/books/1")
+    app.testing = True
+    client.get("/api/books/999999")
+    app.extensions["log_pipeline"].queue.join()
+
+    assert '"message": "request"' not in capsys.readouterr().out
+
+
+def test_queue_handler_drops_when_full():
+    """File pleine : le log est jeté et compté, l'appelant n'est jamais bloqué."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.getLogger("test_drop")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.warning("un")
+    logger.warning("deux")
+    assert handler.dropped == 1
+# endregion
@@ -0,0 +1,68 @@
+# tests/test_mmap_storage.py
+# Catalogue partagé via fichier mmap : chaque instance de MmapBookRepository
+# joue le rôle d'un worker. Ils doivent tous voir les mêmes données.
+
+import multiprocessing
+
+import pytest
+
+from app.models.book_model import Book
+
+mmap_repo = pytest.importorskip("app.repositories.mmap_book_repository")
+if mmap_repo.fcntl is None:
+    pytest.skip("stockage mmap indisponible sans fcntl", allow_module_level=True)
+
+SEED = [Book(1, "Harry Potter", "JK Rowling"), Book(2, "ça", "Stephen King")]
+
+
+def test_workers_share_catalog(tmp_path):
+    """Une écriture faite par un "worker" est visible par l'autre, index compris."""
+    path = str(tmp_path / "books.mmap")
+    worker_a = mmap_repo.MmapBookRepository(path, SEED)
+    worker_b = mmap_repo.MmapBookRepository(path, [Book(1, "Ignoré", "Déjà initialisé")])
+
+    assert [b.title for b in worker_b.all()] == ["Harry Potter", "ça"]
+
+    created = worker_a.add("Shining", "Stephen King")
+    worker_b.update(1, title="Harry Potter 2")
+    worker_a.delete(2)
+
+    assert worker_b.get(created.id).title == "Shining"
+    assert worker_a.get(1).title == "Harry Potter 2"
+    assert [b.id for b in worker_b.search_author("king")[0]] == [created.id]
+    assert worker_a.version == worker_b.version
+
+
+def test_long_texts_fit_the_record(tmp_path):
+    """Un auteur de 80 000 octets d'UTF-8 (accepté par les DTO) s'écrit et se relit."""
+    path = str(tmp_path / "books.mmap")
+    worker_a = mmap_repo.MmapBookRepository(path, SEED)
+    worker_b = mmap_repo.MmapBookRepository(path)
+
+    created = worker_a.add("Long", "é" * 40_000)
+
+    assert worker_b.get(created.id).author == "é" * 40_000
+
+
+def _add_books(path: str, count: int) -> None:
+    repo = mmap_repo.MmapBookRepository(path)
+    for i in range(count):
+        repo.add(f"Livre {i}", "Processus")
+
+
+def test_concurrent_processes_get_unique_ids(tmp_path):
+    """4 processus écrivent en même temps : aucun id dupliqué, aucun livre perdu."""
+    path = str(tmp_path / "books.mmap")
+    repo = mmap_repo.MmapBookRepository(path, SEED)
+
+    ctx = multiprocessing.get_context("fork")
+    processes = [ctx.Process(target=_add_books, args=(path, 100)) for _ in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    ids = [b.id for b in repo.all()]
+    assert len(ids) == 2 + 4 * 100
+    assert ids == list(range(1, 403))
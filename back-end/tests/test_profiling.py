@@ -0,0 +1,77 @@
+# tests/test_profiling.py
+
+import pstats
+
+from app import create_app
+from app.tools.profiling import ProfileStore, sign_profile_header, verify_profile_header
+
+
+def _app(tmp_path, **config):
+    return create_app({
+        "PROFILING_ENABLED": True,
+        "PROFILING_DIR": str(tmp_path),
+        "PROFILING_SECRET": "s3cret",
+        **config,
+    })
+
+
+#region DÉCLENCHEURS
+def test_profiling_disabled_registers_nothing(client, auth_headers):
+    """Par défaut : aucun hook, endpoints admin en 404."""
+    assert client.application.extensions["profiling"] is None
+    assert client.get("/api/admin/profiles", headers=auth_headers).status_code == 404
+
+
+def test_signed_header_profiles_request(tmp_path, auth_headers):
+    client = _app(tmp_path).test_client()
+
+    client.get("/api/books")                                         # pas d'en-tête → pas de profil
+    client.get("/api/books", headers={"X-Profile": "123:faux"})      # signature invalide
+    client.get("/api/books", headers={"X-Profile": sign_profile_header("s3cret")})
+
+    profiles = client.get("/api/admin/profiles", headers=auth_headers).get_json()
+    assert [(p["method"], p["route"]) for p in profiles] == [("GET", "_api_books")]
+
+    res = client.get(f"/api/admin/profiles/{profiles[0]['name']}", headers=auth_headers)
+    assert res.status_code == 200
+    path = tmp_path / "downloaded.pstats"
+    path.write_bytes(res.data)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_admin_toggle_and_sampling(tmp_path, auth_headers):
+    client = _app(tmp_path).test_client()
+
+    res = client.post("/api/admin/profiling", json={"sample_every": 2}, headers=auth_headers)
+    assert res.get_json()["sample_every"] == 2
+    for _ in range(4):
+        client.get("/api/books/1")
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+    assert client.post("/api/admin/profiling", json={"always": "oui"}, headers=auth_headers).status_code == 400
+    assert client.get("/api/admin/profiles/../secret", headers=auth_headers).status_code == 404
+# endregion
+
+
+#region ANNEAU
+def test_profile_store_ring_and_signature(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    for _ in range(3):
+        open(store.path_for("GET", "/api/books"), "wb").close()
+        store.added()
+    assert len(store.list()) == 2
+
+    header = sign_profile_header("k", ttl=10, now=1000)
+    assert verify_profile_header("k", header, now=1005)
+    assert not verify_profile_header("k", header, now=1011)   # expiré
+    assert not verify_profile_header("autre", header, now=1005)
+
+
+def test_malformed_profile_header_is_rejected(tmp_path):
+    """Chiffres non ASCII ("²", "١٢٣") ou signature non ASCII : refus, jamais d'exception."""
+    for value in ("²:abc", "١٢٣:abc", "99999999999:é", ":", ""):
+        assert not verify_profile_header("k", value)
+
+    client = _app(tmp_path).test_client()
+    assert client.get("/api/books", headers={"X-Profile": "²:abc"}).status_code == 200
+# endregion
@@ -0,0 +1,161 @@
+# tests/test_sqlite_storage.py
+# Mêmes routes que test_book.py, mais avec STORAGE_BACKEND = "sqlite".
+# Chaque test utilise son propre fichier de base (dossier temporaire pytest).
+
+import pytest
+
+from app import create_app
+from app.models.book_model import Book
+from app.repositories.sqlite_book_repository import _SELECT_AUTHOR, SQLiteBookRepository
+from app.repositories.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def sqlite_app(tmp_path):
+    """
+    Application branchée sur une base SQLite temporaire.
+    En fin de test, on ferme la base et on recrée une app "memory"
+    pour que les autres fichiers de tests retrouvent le stockage par défaut.
+    """
+    app = create_app({"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "test.db")})
+    app.testing = True
+    yield app
+    app.extensions["sqlite_db"].close()
+    create_app()
+
+
+def test_sqlite_crud_and_search(sqlite_app, auth_headers):
+    """Cycle complet : jeu de démo, création, recherche auteur / plein texte, pagination."""
+    client = sqlite_app.test_client()
+
+    assert len(client.get("/api/books").get_json()) == 3
+
+    created = client.post("/api/books", json={"title": "Shining", "author": "Stephen King"}, headers=auth_headers)
+    assert created.status_code == 201
+    assert created.get_json()["id"] == 4
+
+    by_author = client.get("/api/books/search?author=KING").get_json()
+    assert [b["id"] for b in by_author] == [2, 4]
+
+    ranked = client.get("/api/books/search?q=shining%20king").get_json()
+    assert ranked[0]["id"] == 4
+
+    page = client.get("/api/books?limit=2&cursor=" + client.get("/api/books?limit=2").get_json()["next_cursor"])
+    assert [b["id"] for b in page.get_json()["items"]] == [3, 4]
+
+    lookup = client.get("/api/books?ids=4,99,1").get_json()
+    assert [b["id"] for b in lookup["items"]] == [4, 1]
+    assert lookup["missing"] == [99]
+
+    assert client.delete("/api/books/4", headers=auth_headers).status_code == 204
+    assert client.get("/api/books/4").status_code == 404
+
+
+def test_sqlite_data_survives_restart(tmp_path, auth_headers):
+    """Deux apps successives sur le même fichier voient les mêmes données."""
+    config = {"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "persist.db")}
+
+    first = create_app(config)
+    first.test_client().patch("/api/books/1", json={"title": "Persistant"}, headers=auth_headers)
+    first.test_client().post(
+        "/api/auth/register",
+        json={"email": "Alice@example.com", "password": "secret", "confirmPassword": "secret"},
+    )
+    first.extensions["sqlite_db"].close()
+
+    second = create_app(config)
+    client = second.test_client()
+    assert client.get("/api/books/1").get_json()["title"] == "Persistant"
+    login = client.post("/api/auth/login", json={"email": "alice@example.com", "password": "secret"})
+    assert login.status_code == 200
+    second.extensions["sqlite_db"].close()
+
+    # Refresh token émis par une app, consommé par une autre (autre worker).
+    third = create_app(config)
+    refreshed = third.test_client().post("/api/auth/refresh", json={"refresh_token": login.get_json()["refresh_token"]})
+    assert refreshed.status_code == 200
+    third.extensions["sqlite_db"].close()
+    create_app()
+
+
+def test_sqlite_rejects_out_of_range_ids(sqlite_app, auth_headers):
+    """Un id au-delà d'un INTEGER SQLite (2**63 - 1) donne 404 / 400, jamais 500."""
+    from app.tools.pagination import encode_cursor
+
+    client = sqlite_app.test_client()
+    huge = 10**30
+
+    assert client.get(f"/api/books/{huge}").status_code == 404
+    assert client.patch(f"/api/books/{huge}", json={"title": "x"}, headers=auth_headers).status_code == 404
+    assert client.get(f"/api/books?ids=1,{huge}").status_code == 400
+    assert client.get("/api/books?limit=2&cursor=" + encode_cursor({"after": huge})).status_code == 400
+
+    res = client.open("/api/books/bulk", method="DELETE", json={"ids": [huge, 1]}, headers=auth_headers)
+    assert res.status_code == 207
+    assert res.get_json()["deleted"] == [1]
+
+
+def test_email_normalization_matches_memory_backend(tmp_path):
+    """Même clé d'email (strip + casefold) en mémoire et dans SQLite, bases anciennes comprises."""
+    import sqlite3
+
+    from app.models.user_model import normalize_email
+    from app.repositories.sqlite_database import SQLiteDatabase
+    from app.repositories.user_repository import InMemoryUserRepository, SQLiteUserRepository
+
+    # Base "d'avant" : email_lower calculé par str.lower(), sans strip.
+    path = str(tmp_path / "legacy.db")
+    SQLiteDatabase(path).close()
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO users (email, email_lower, password_hash, role) VALUES (?, ?, 'h', 'user')",
+            (" Straße@Example.com", " straße@example.com"),
+        )
+
+    db = SQLiteDatabase(path)
+    repos = [InMemoryUserRepository(), SQLiteUserRepository(db)]
+    repos[0].add(" Straße@Example.com", "h", "user")
+    for repo in repos:
+        assert repo.get_by_email("STRASSE@example.com").id == 1
+        with pytest.raises(ValueError):
+            repo.add("strasse@EXAMPLE.com ", "h", "user")
+        assert repo.add_many([("straße@example.com", "h", "user")]) == [None]
+    assert normalize_email(" Straße@Example.com") == "strasse@example.com"
+    db.close()
+
+
+def test_sqlite_emptied_catalog_is_not_reseeded(tmp_path, auth_headers):
+    """Le jeu de démo n'est inséré qu'à la création : un catalogue vidé reste vide au redémarrage."""
+    config = {"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "empty.db")}
+
+    first = create_app(config)
+    client = first.test_client()
+    assert client.delete("/api/books/bulk", json={"ids": [1, 2, 3]}, headers=auth_headers).status_code == 200
+    assert client.get("/api/books").get_json() == []
+    first.extensions["sqlite_db"].close()
+
+    second = create_app(config)
+    assert second.test_client().get("/api/books").get_json() == []
+    second.extensions["sqlite_db"].close()
+    create_app()
+
+
+def test_sqlite_author_search_uses_trigram_index(tmp_path):
+    """Sous-chaîne d'auteur via l'index de trigrammes (pas de parcours de table) ; une
+    mise à jour qui ne touche aucune ligne ne change pas la version (ETag inchangés)."""
+    db = SQLiteDatabase(str(tmp_path / "authors.db"))
+    repo = SQLiteBookRepository(db, [Book(1, "Ça", "Stephen King"), Book(2, "Dune", "Frank Herbert")])
+
+    assert [b.id for b in repo.search_author("KIN")[0]] == [1]
+    assert [b.id for b in repo.search_author("e")[0]] == [1, 2]      # < 3 caractères : parcours
+    assert repo.search_author('n "k')[0] == []
+    plan = " ".join(row[3] for row in db.connection().execute("EXPLAIN QUERY PLAN " + _SELECT_AUTHOR, ('"kin"', 0, 10)))
+    assert "VIRTUAL TABLE" in plan and "SCAN b" not in plan
+
+    repo.update(1, author="Richard Bachman")
+    assert [b.id for b in repo.search_author("bach")[0]] == [1] and repo.search_author("king")[0] == []
+
+    version = repo.version
+    assert repo.update_many([(99, {"title": "Absent"})]) == [None]
+    assert repo.version == version
+    db.close()